@@ -39,7 +39,7 @@ async def get_user_wallet(user_id: str):
         WalletResponse containing wallet details
     """
     try:
-        wallet = GreenCreditsService.get_wallet(user_id)
+        wallet = await GreenCreditsService.get_wallet(user_id)
         return WalletResponse(success=True, wallet=wallet)
     except Exception as e:
         logger.error(f"Error fetching wallet for user {user_id}: {str(e)}")
@@ -67,7 +67,7 @@ async def earn_green_credits(request: EarnCreditsRequest):
         EarnCreditsResponse with credits earned and new balance
     """
     try:
-        response = GreenCreditsService.earn_credits(request)
+        response = await GreenCreditsService.earn_credits(request)
         logger.info(
             f"User {request.user_id} earned {response.credits_earned} credits. "
             f"New balance: {response.new_balance}"
@@ -96,7 +96,7 @@ async def get_transaction_history(user_id: str, limit: int = 10):
         List of recent transactions
     """
     try:
-        transactions = GreenCreditsService.get_transaction_history(user_id, limit)
+        transactions = await GreenCreditsService.get_transaction_history(user_id, limit)
         return {
             "success": True,
             "user_id": user_id,
@@ -132,7 +132,7 @@ async def redeem_credits(user_id: str, amount: float):
                 detail="Redemption amount must be greater than 0"
             )
         
-        result = GreenCreditsService.redeem_credits(user_id, amount)
+        result = await GreenCreditsService.redeem_credits(user_id, amount)
         
         if not result["success"]:
             raise HTTPException(
@@ -36,6 +36,7 @@ class Settings(BaseSettings):
     redis_url: str = Field("redis://localhost:6379/0", env="REDIS_URL")
     cache_ttl_seconds: int = Field(3600, env="CACHE_TTL_SECONDS")
     cache_prefix: str = Field("gmaps_backend", env="CACHE_PREFIX")
+    green_credits_use_redis: bool = Field(False, env="GREEN_CREDITS_USE_REDIS")
     
     # Rate Limiting Configuration
     rate_limit_per_minute: int = Field(100, env="RATE_LIMIT_PER_MINUTE")
@@ -70,6 +71,9 @@ class Settings(BaseSettings):
     
     # Distance Matrix Settings
     max_matrix_elements: int = Field(100, env="MAX_MATRIX_ELEMENTS")
+    max_total_matrix_elements: int = Field(2500, env="MAX_TOTAL_MATRIX_ELEMENTS")
+    matrix_max_concurrency: int = Field(4, env="MATRIX_MAX_CONCURRENCY")
+    matrix_chunk_target_ms: int = Field(2000, env="MATRIX_CHUNK_TARGET_MS")
     matrix_units: str = Field("metric", env="MATRIX_UNITS")
     avoid_tolls: bool = Field(False, env="AVOID_TOLLS")
     avoid_highways: bool = Field(False, env="AVOID_HIGHWAYS")
@@ -96,6 +100,9 @@ class Settings(BaseSettings):
     routes_timeout: int = Field(15, env="ROUTES_TIMEOUT")
     distance_matrix_timeout: int = Field(20, env="DISTANCE_MATRIX_TIMEOUT")
     
+    # Worker threads for blocking Google Maps client calls
+    io_threads: int = Field(10, env="IO_THREADS")
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -7,9 +7,11 @@ from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import time
 import uuid
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
@@ -17,6 +19,7 @@ from .config import get_settings, app_info
 from .api.routes import router as routes_router
 from .api.green_credits_routes import router as green_credits_router
 from .services.google_maps import get_google_maps_service
+from .services.green_credits_service import GreenCreditsService
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +40,11 @@ async def lifespan(app: FastAPI):
     logger.info(f"🌍 API prefix: {settings.api_prefix}")
     logger.info(f"📍 Maps region: {settings.maps_region}")
     
+    # Size the shared executor used by asyncio.to_thread for Google Maps calls
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.io_threads)
+    )
+    
     # Initialize services
     gmaps_service = get_google_maps_service()
     health_check = await gmaps_service.health_check()
@@ -46,6 +54,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 Shutting down Google Maps Backend API")
+    gmaps_service.close()
+    await GreenCreditsService.close()
 
 
 # Create FastAPI application
@@ -228,6 +228,7 @@ class Route(BaseModel):
     total_duration: Dict[str, Union[str, int]] = Field(..., description="Total route duration")
     total_duration_in_traffic: Optional[Dict[str, Union[str, int]]] = Field(None, description="Total duration with traffic")
     green_credits_earned: float = Field(default=0.0, ge=0, description="Green credits user will earn for this route")
+    strategy_info: Optional[Dict[str, Any]] = Field(None, description="Route strategy type and optimization metadata")
     
     class Config:
         json_schema_extra = {
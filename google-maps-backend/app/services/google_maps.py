@@ -4,12 +4,15 @@ Core service for interacting with Google Maps APIs
 """
 
 import googlemaps
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 import asyncio
 import time
 from typing import Dict, List, Optional, Any, Union, Tuple
 from datetime import datetime, timedelta
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
 import json
 
 from ..config import get_settings
@@ -21,14 +24,135 @@ from ..models.route_models import (
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Smoothing factor for the observed distance matrix latency
+MATRIX_LATENCY_EMA_ALPHA = 0.2
+
+# Distance Matrix API limit on origins and on destinations per request
+MATRIX_MAX_DIMENSION = 25
+
+@lru_cache(maxsize=64)
+def _build_param_template(
+    mode: str,
+    alternatives: bool,
+    avoid: Tuple[str, ...],
+    language: Optional[str],
+    region: Optional[str],
+    units: str,
+    traffic_model: Optional[str]
+) -> Dict[str, Any]:
+    """Build the shared Directions API parameters for one request shape.
+
+    Values are immutable (avoid stays a tuple) so the shallow copy callers
+    must make before adding per-request values shares nothing mutable.
+    """
+    params = {
+        'mode': mode,
+        'alternatives': alternatives,
+        'avoid': avoid,
+        'language': language,
+        'region': region,
+        'units': units
+    }
+    if traffic_model is not None:
+        params['traffic_model'] = traffic_model
+    return params
+
+
+@lru_cache(maxsize=4096)
+def _emissions_for_distance(
+    total_distance: int, travel_mode: TravelMode
+) -> Tuple[float, Optional[float], Optional[float], float]:
+    """
+    Compute rounded (co2_kg, fuel_liters, energy_kwh, eco_score) for a route
+    
+    Emissions depend only on distance and travel mode, so alternatives and
+    repeated corridors that share a distance reuse the cached figures.
+    """
+    distance_km = total_distance / 1000
+    
+    # Calculate based on travel mode
+    if travel_mode == TravelMode.DRIVING:
+        fuel_liters = distance_km / settings.fuel_efficiency_km_per_liter
+        co2_kg = fuel_liters * settings.co2_per_liter_petrol
+        energy_kwh = None
+    elif travel_mode == TravelMode.BICYCLING or travel_mode == TravelMode.WALKING:
+        fuel_liters = None
+        co2_kg = 0.0  # Zero emissions
+        energy_kwh = None
+    elif travel_mode == TravelMode.TRANSIT:
+        # Assume average public transport emissions
+        co2_kg = distance_km * 0.05  # 50g CO2 per km
+        fuel_liters = None
+        energy_kwh = None
+    else:
+        fuel_liters = None
+        co2_kg = distance_km * 0.1  # Default estimate
+        energy_kwh = None
+    
+    # Calculate eco score (0-10, higher is better)
+    if co2_kg == 0:
+        eco_score = 10.0
+    elif co2_kg < 1:
+        eco_score = 9.0
+    elif co2_kg < 3:
+        eco_score = 7.0
+    elif co2_kg < 5:
+        eco_score = 5.0
+    elif co2_kg < 10:
+        eco_score = 3.0
+    else:
+        eco_score = 1.0
+    
+    return (
+        round(co2_kg, 2),
+        round(fuel_liters, 2) if fuel_liters else None,
+        round(energy_kwh, 2) if energy_kwh else None,
+        eco_score
+    )
+
+
+class OrjsonGoogleMapsClient(googlemaps.Client):
+    """googlemaps client that decodes response bodies with orjson
+    
+    Overrides the private Client._get_body and raises the private _OverQueryLimit
+    so the client's retry loop still applies; re-check both against the library
+    source before bumping the googlemaps pin in requirements.txt.
+    """
+    
+    def _get_body(self, response):
+        if response.status_code != 200:
+            raise googlemaps.exceptions.HTTPError(response.status_code)
+        
+        body = orjson.loads(response.content)
+        
+        api_status = body["status"]
+        if api_status == "OK" or api_status == "ZERO_RESULTS":
+            return body
+        
+        if api_status == "OVER_QUERY_LIMIT":
+            raise googlemaps.exceptions._OverQueryLimit(
+                api_status, body.get("error_message")
+            )
+        
+        raise googlemaps.exceptions.ApiError(api_status, body.get("error_message"))
+
 
 class GoogleMapsService:
     """Core Google Maps Platform service"""
     
     def __init__(self):
         """Initialize Google Maps client"""
-        self.client = googlemaps.Client(key=settings.google_maps_api_key)
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        # One keep-alive pool shared by every call; sized so concurrent worker
+        # threads reuse connections instead of opening and discarding extras
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=settings.io_threads)
+        )
+        self.client = OrjsonGoogleMapsClient(
+            key=settings.google_maps_api_key,
+            requests_session=self.session
+        )
         
         # Request tracking for rate limiting
         self.request_count = 0
@@ -36,14 +160,17 @@ class GoogleMapsService:
         self.last_request_time = time.time()
         self.request_times = []
         
+        # Observed distance matrix latency (EMA, ms per element) for adaptive chunking
+        self.matrix_ms_per_element: Optional[float] = None
+        
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self.session.close()
+    
     async def _execute_sync_operation(self, func, *args, **kwargs) -> Any:
         """Execute synchronous Google Maps operation asynchronously"""
-        loop = asyncio.get_event_loop()
         try:
-            result = await loop.run_in_executor(
-                self.executor, 
-                lambda: func(*args, **kwargs)
-            )
+            result = await asyncio.to_thread(func, *args, **kwargs)
             self._track_request()
             return result
         except Exception as e:
@@ -68,16 +195,19 @@ class GoogleMapsService:
         if self.daily_requests > settings.daily_quota_limit:
             logger.error(f"Daily quota exceeded: {self.daily_requests} requests")
     
-    def _resolve_location_input(self, location: LocationInput) -> Union[str, Tuple[float, float], str]:
+    def resolve_location_input(self, location: LocationInput) -> Union[str, Tuple[float, float], str]:
         """Resolve location input to format expected by Google Maps API"""
-        if location.coordinates:
-            return (location.coordinates.lat, location.coordinates.lng)
-        elif location.place_id:
-            return f"place_id:{location.place_id}"
-        elif location.address:
-            return location.address
-        else:
-            raise ValueError("Invalid location input: no address, coordinates, or place_id provided")
+        # Read each attribute once; coordinates are the common case
+        coordinates = location.coordinates
+        if coordinates is not None:
+            return (coordinates.lat, coordinates.lng)
+        place_id = location.place_id
+        if place_id:
+            return f"place_id:{place_id}"
+        address = location.address
+        if address:
+            return address
+        raise ValueError("Invalid location input: no address, coordinates, or place_id provided")
     
     async def geocode_address(self, address: str, region: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -140,62 +270,92 @@ class GoogleMapsService:
         """
         try:
             # Resolve locations
-            origin = self._resolve_location_input(request.origin)
-            destination = self._resolve_location_input(request.destination)
+            origin = self.resolve_location_input(request.origin)
+            destination = self.resolve_location_input(request.destination)
             
             # Prepare waypoints
             waypoints = []
             if request.waypoints:
-                for waypoint in request.waypoints:
-                    wp_location = self._resolve_location_input(waypoint.location)
-                    waypoints.append(wp_location)
-            
-            # Prepare request parameters
-            params = {
-                'origin': origin,
-                'destination': destination,
-                'mode': request.travel_mode.value,
-                'alternatives': request.alternatives,
-                'avoid': self._build_avoid_list(request),
-                'language': request.language,
-                'region': request.region,
-                'units': request.units.value
-            }
+                resolve = self.resolve_location_input
+                waypoints = [resolve(waypoint.location) for waypoint in request.waypoints]
+            
+            # Copy the cached parameter template for this request shape
+            is_driving = request.travel_mode == TravelMode.DRIVING
+            params = _build_param_template(
+                request.travel_mode.value,
+                request.alternatives,
+                self._build_avoid_list(request),
+                request.language,
+                request.region,
+                request.units.value,
+                request.traffic_model.value if is_driving and settings.enable_traffic_model else None
+            ).copy()
+            params['origin'] = origin
+            params['destination'] = destination
             
             # Add waypoints if present
             if waypoints:
                 params['waypoints'] = waypoints
-                params['optimize_waypoints'] = request.optimization_mode in [
+                params['optimize_waypoints'] = request.optimization_mode in (
                     OptimizationMode.FASTEST, OptimizationMode.SHORTEST
-                ]
+                )
             
-            # Add traffic model for driving mode
-            if request.travel_mode == TravelMode.DRIVING:
+            # Add departure/arrival time for driving mode
+            if is_driving:
                 if request.departure_time:
                     params['departure_time'] = request.departure_time
                 elif request.arrival_time:
                     params['arrival_time'] = request.arrival_time
                 else:
                     params['departure_time'] = datetime.now()
-                
-                if settings.enable_traffic_model:
-                    params['traffic_model'] = request.traffic_model.value
             
-            # Execute directions request
-            result = await self._execute_sync_operation(
-                self.client.directions,
-                **params
-            )
-            
-            logger.info(f"Calculated directions: {len(result)} route(s) found")
-            return result
+            return await self.calculate_directions_params(params)
             
         except Exception as e:
             logger.error(f"Directions calculation failed: {str(e)}")
             raise
     
-    def _build_avoid_list(self, request: RouteRequest) -> List[str]:
-        """Build avoid list for directions API"""
+    async def calculate_directions_params(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Calculate directions from prepared Directions API parameters
+        
+        Skips RouteRequest validation for trusted internal callers; locations
+        must already be resolved (see resolve_location_input).
+        
+        Args:
+            params: Keyword arguments for the googlemaps directions call
+            
+        Returns:
+            Directions API routes
+        """
+        result = await self._execute_sync_operation(
+            self.client.directions,
+            **params
+        )
+        
+        logger.info(f"Calculated directions: {len(result)} route(s) found")
+        return result
+    
+    async def calculate_directions_batch(self, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Calculate directions for several prepared parameter sets as one batch
+        
+        The Directions API has no batch endpoint, so the requests are issued
+        together over the shared keep-alive connection pool.
+        
+        Args:
+            params_list: Directions API parameters, one dict per request
+            
+        Returns:
+            Directions results (or the raised exception) in request order
+        """
+        return await asyncio.gather(
+            *(self.calculate_directions_params(params) for params in params_list),
+            return_exceptions=True
+        )
+    
+    def _build_avoid_list(self, request: RouteRequest) -> Tuple[str, ...]:
+        """Build avoid list for directions API (hashable, for the param template cache)"""
         avoid = []
         if request.avoid_highways:
             avoid.append('highways')
@@ -203,7 +363,7 @@ class GoogleMapsService:
             avoid.append('tolls')
         if request.avoid_ferries:
             avoid.append('ferries')
-        return avoid
+        return tuple(avoid)
     
     async def calculate_distance_matrix(
         self,
@@ -228,17 +388,20 @@ class GoogleMapsService:
         """
         try:
             # Resolve locations
-            origin_locations = [self._resolve_location_input(loc) for loc in origins]
-            dest_locations = [self._resolve_location_input(loc) for loc in destinations]
+            resolve = self.resolve_location_input
+            origin_locations = list(map(resolve, origins))
+            dest_locations = list(map(resolve, destinations))
             
             # Check matrix size limits
-            if len(origin_locations) * len(dest_locations) > settings.max_matrix_elements:
-                raise ValueError(f"Matrix too large: maximum {settings.max_matrix_elements} elements allowed")
+            if not origin_locations or not dest_locations:
+                raise ValueError("Distance matrix requires at least one origin and one destination")
+            if len(origin_locations) * len(dest_locations) > settings.max_total_matrix_elements:
+                raise ValueError(
+                    f"Matrix too large: maximum {settings.max_total_matrix_elements} elements allowed"
+                )
             
             # Prepare parameters
             params = {
-                'origins': origin_locations,
-                'destinations': dest_locations,
                 'mode': mode.value,
                 'units': settings.matrix_units,
                 'language': settings.maps_language,
@@ -264,11 +427,24 @@ class GoogleMapsService:
                 if avoid:
                     params['avoid'] = avoid
             
-            # Execute distance matrix request
-            result = await self._execute_sync_operation(
-                self.client.distance_matrix,
-                **params
-            )
+            # Split into sub-matrices sized from observed latency and run a bounded number at once
+            chunk_elements = self._matrix_chunk_elements()
+            dest_step = max(1, min(len(dest_locations), chunk_elements, MATRIX_MAX_DIMENSION))
+            origin_step = max(1, min(chunk_elements // dest_step, MATRIX_MAX_DIMENSION))
+            dest_chunks = [
+                dest_locations[d:d + dest_step] for d in range(0, len(dest_locations), dest_step)
+            ]
+            semaphore = asyncio.Semaphore(settings.matrix_max_concurrency)
+            chunk_results = await asyncio.gather(*[
+                self._distance_matrix_chunk(origin_locations[o:o + origin_step], dest_chunk, params, semaphore)
+                for o in range(0, len(origin_locations), origin_step)
+                for dest_chunk in dest_chunks
+            ])
+            
+            if len(chunk_results) == 1:
+                result = chunk_results[0]
+            else:
+                result = _merge_distance_matrix_chunks(chunk_results, len(dest_chunks))
             
             logger.info(f"Calculated distance matrix: {len(origins)} origins × {len(destinations)} destinations")
             return result
@@ -277,6 +453,38 @@ class GoogleMapsService:
             logger.error(f"Distance matrix calculation failed: {str(e)}")
             raise
     
+    def _matrix_chunk_elements(self) -> int:
+        """Elements per distance matrix sub-request, sized to the latency target"""
+        if not self.matrix_ms_per_element:
+            return settings.max_matrix_elements
+        target = int(settings.matrix_chunk_target_ms / self.matrix_ms_per_element)
+        return max(1, min(settings.max_matrix_elements, target))
+    
+    async def _distance_matrix_chunk(
+        self,
+        origins: List[Any],
+        destinations: List[Any],
+        params: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """Execute one distance matrix sub-request and record its per-element latency"""
+        async with semaphore:
+            start_time = time.perf_counter()
+            result = await self._execute_sync_operation(
+                self.client.distance_matrix,
+                origins=origins,
+                destinations=destinations,
+                **params
+            )
+        
+        ms_per_element = (time.perf_counter() - start_time) * 1000 / (len(origins) * len(destinations))
+        if self.matrix_ms_per_element is None:
+            self.matrix_ms_per_element = ms_per_element
+        else:
+            self.matrix_ms_per_element += MATRIX_LATENCY_EMA_ALPHA * (ms_per_element - self.matrix_ms_per_element)
+        
+        return result
+    
     async def get_place_details(self, place_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get detailed information about a place
@@ -370,45 +578,14 @@ class GoogleMapsService:
             for leg in route_data.get('legs', []):
                 total_distance += leg['distance']['value']
             
-            distance_km = total_distance / 1000
-            
-            # Calculate based on travel mode
-            if travel_mode == TravelMode.DRIVING:
-                fuel_liters = distance_km / settings.fuel_efficiency_km_per_liter
-                co2_kg = fuel_liters * settings.co2_per_liter_petrol
-                energy_kwh = None
-            elif travel_mode == TravelMode.BICYCLING or travel_mode == TravelMode.WALKING:
-                fuel_liters = None
-                co2_kg = 0.0  # Zero emissions
-                energy_kwh = None
-            elif travel_mode == TravelMode.TRANSIT:
-                # Assume average public transport emissions
-                co2_kg = distance_km * 0.05  # 50g CO2 per km
-                fuel_liters = None
-                energy_kwh = None
-            else:
-                fuel_liters = None
-                co2_kg = distance_km * 0.1  # Default estimate
-                energy_kwh = None
-            
-            # Calculate eco score (0-10, higher is better)
-            if co2_kg == 0:
-                eco_score = 10.0
-            elif co2_kg < 1:
-                eco_score = 9.0
-            elif co2_kg < 3:
-                eco_score = 7.0
-            elif co2_kg < 5:
-                eco_score = 5.0
-            elif co2_kg < 10:
-                eco_score = 3.0
-            else:
-                eco_score = 1.0
+            co2_kg, fuel_liters, energy_kwh, eco_score = _emissions_for_distance(
+                total_distance, travel_mode
+            )
             
             return EmissionsData(
-                co2_emissions_kg=round(co2_kg, 2),
-                fuel_consumption_liters=round(fuel_liters, 2) if fuel_liters else None,
-                energy_consumption_kwh=round(energy_kwh, 2) if energy_kwh else None,
+                co2_emissions_kg=co2_kg,
+                fuel_consumption_liters=fuel_liters,
+                energy_consumption_kwh=energy_kwh,
                 eco_score=eco_score,
                 comparison_savings={}
             )
@@ -457,13 +634,34 @@ class GoogleMapsService:
             }
 
 
-# Global service instance
-_google_maps_service: Optional[GoogleMapsService] = None
+def _merge_distance_matrix_chunks(chunks: List[Dict[str, Any]], dest_chunk_count: int) -> Dict[str, Any]:
+    """Stitch row-major distance matrix sub-responses back into a single response"""
+    merged = {
+        "origin_addresses": [],
+        "destination_addresses": [
+            address for chunk in chunks[:dest_chunk_count]
+            for address in chunk.get("destination_addresses", [])
+        ],
+        "rows": [],
+        "status": "OK"
+    }
+    
+    for i in range(0, len(chunks), dest_chunk_count):
+        row_block = chunks[i:i + dest_chunk_count]
+        merged["origin_addresses"].extend(row_block[0].get("origin_addresses", []))
+        
+        rows = [{"elements": []} for _ in row_block[0].get("rows", [])]
+        for chunk in row_block:
+            if chunk.get("status", "OK") != "OK":
+                merged["status"] = chunk["status"]
+            for row, chunk_row in zip(rows, chunk.get("rows", [])):
+                row["elements"].extend(chunk_row["elements"])
+        merged["rows"].extend(rows)
+    
+    return merged
 
 
+@cache
 def get_google_maps_service() -> GoogleMapsService:
-    """Get or create Google Maps service instance"""
-    global _google_maps_service
-    if _google_maps_service is None:
-        _google_maps_service = GoogleMapsService()
-    return _google_maps_service
\ No newline at end of file
+    """Get or create the shared Google Maps service instance"""
+    return GoogleMapsService()
\ No newline at end of file
@@ -4,7 +4,8 @@ Service layer for managing green credits system
 
 from typing import Dict, Optional
 from datetime import datetime
-import uuid
+import secrets
+from app.config import get_settings
 from app.models.green_credits_models import (
     UserWallet,
     GreenCreditTransaction,
@@ -14,19 +15,51 @@ from app.models.green_credits_models import (
 )
 
 
+settings = get_settings()
+
+
 class GreenCreditsService:
     """Service for managing user green credits and rewards"""
     
-    # In-memory storage for demonstration (use database in production)
+    # In-memory storage, used when GREEN_CREDITS_USE_REDIS is disabled
     _wallets: Dict[str, UserWallet] = {}
     _transactions: Dict[str, list] = {}
     
+    # Redis storage (wallet hash + transaction sorted set per user)
+    _redis = None
+    MAX_TRANSACTIONS_PER_USER = 10000
+    
     # Credits calculation constants
     CREDITS_PER_KM = 0.5  # Base credits per kilometer of eco route
     CREDITS_PER_KG_CO2 = 5.0  # Bonus credits per kg of CO2 saved
     
     @classmethod
-    def get_wallet(cls, user_id: str) -> UserWallet:
+    def _get_redis(cls):
+        """Get the shared asyncio Redis client, or None when Redis storage is disabled"""
+        if not settings.green_credits_use_redis:
+            return None
+        if cls._redis is None:
+            import redis.asyncio
+            cls._redis = redis.asyncio.Redis.from_url(settings.redis_url, decode_responses=True)
+        return cls._redis
+    
+    @classmethod
+    async def close(cls) -> None:
+        """Close the Redis connection pool, if one was opened"""
+        if cls._redis is not None:
+            await cls._redis.aclose()
+            cls._redis = None
+    
+    @staticmethod
+    def _wallet_key(user_id: str) -> str:
+        return f"{settings.cache_prefix}:green_credits:wallet:{user_id}"
+    
+    @staticmethod
+    def _transactions_key(user_id: str) -> str:
+        return f"{settings.cache_prefix}:green_credits:transactions:{user_id}"
+    
+    @classmethod
+    async def get_wallet(cls, user_id: str) -> UserWallet:
         """
         Get user's wallet, creating one if it doesn't exist
         
@@ -36,6 +69,20 @@ class GreenCreditsService:
         Returns:
             UserWallet object
         """
+        redis_client = cls._get_redis()
+        if redis_client is not None:
+            key = cls._wallet_key(user_id)
+            data = await redis_client.hgetall(key)
+            if not data:
+                wallet = UserWallet(user_id=user_id)
+                # HSETNX keeps concurrent first writers from clobbering each other
+                pipe = redis_client.pipeline()
+                for field, value in wallet.model_dump(mode="json").items():
+                    pipe.hsetnx(key, field, value)
+                pipe.hgetall(key)
+                data = (await pipe.execute())[-1]
+            return UserWallet(**data)
+        
         if user_id not in cls._wallets:
             cls._wallets[user_id] = UserWallet(user_id=user_id)
             cls._transactions[user_id] = []
@@ -117,7 +164,7 @@ class GreenCreditsService:
         return round(credits, 2)
     
     @classmethod
-    def earn_credits(cls, request: EarnCreditsRequest) -> EarnCreditsResponse:
+    async def earn_credits(cls, request: EarnCreditsRequest) -> EarnCreditsResponse:
         """
         Award green credits to user for taking eco route
         
@@ -127,8 +174,7 @@ class GreenCreditsService:
         Returns:
             EarnCreditsResponse with transaction details
         """
-        # Get or create user wallet
-        wallet = cls.get_wallet(request.user_id)
+        now = datetime.utcnow()
         
         # Calculate credits earned
         credits_earned = cls.calculate_credits(
@@ -138,22 +184,51 @@ class GreenCreditsService:
         
         # Create transaction record
         transaction = GreenCreditTransaction(
-            transaction_id=f"txn_{uuid.uuid4().hex[:12]}",
+            transaction_id=f"txn_{secrets.token_hex(6)}",
             user_id=request.user_id,
             credits_earned=credits_earned,
             route_distance_km=request.route_distance_km,
             co2_saved_kg=request.co2_saved_kg,
             route_type=request.route_type,
-            timestamp=datetime.utcnow()
+            timestamp=now
         )
         
+        redis_client = cls._get_redis()
+        if redis_client is not None:
+            wallet_key = cls._wallet_key(request.user_id)
+            transactions_key = cls._transactions_key(request.user_id)
+            
+            # Apply every wallet and history mutation in a single round trip
+            pipe = redis_client.pipeline()
+            pipe.hincrbyfloat(wallet_key, "total_credits", credits_earned)
+            pipe.hincrbyfloat(wallet_key, "credits_earned_all_time", credits_earned)
+            pipe.hincrby(wallet_key, "eco_routes_count", 1)
+            pipe.hincrbyfloat(wallet_key, "total_co2_saved_kg", request.co2_saved_kg or 0.0)
+            pipe.hsetnx(wallet_key, "user_id", request.user_id)
+            pipe.hsetnx(wallet_key, "credits_redeemed", 0.0)
+            pipe.hset(wallet_key, "last_updated", now.isoformat())
+            pipe.zadd(transactions_key, {transaction.model_dump_json(): now.timestamp()})
+            pipe.zremrangebyrank(transactions_key, 0, -(cls.MAX_TRANSACTIONS_PER_USER + 1))
+            new_balance = float((await pipe.execute())[0])
+            
+            return EarnCreditsResponse(
+                success=True,
+                credits_earned=credits_earned,
+                new_balance=new_balance,
+                transaction_id=transaction.transaction_id,
+                message=f"Successfully earned {credits_earned} green credits!"
+            )
+        
+        # Get or create user wallet
+        wallet = await cls.get_wallet(request.user_id)
+        
         # Update wallet
         wallet.total_credits += credits_earned
         wallet.credits_earned_all_time += credits_earned
         wallet.eco_routes_count += 1
         if request.co2_saved_kg:
             wallet.total_co2_saved_kg += request.co2_saved_kg
-        wallet.last_updated = datetime.utcnow()
+        wallet.last_updated = now
         
         # Store transaction
         if request.user_id not in cls._transactions:
@@ -170,7 +245,7 @@ class GreenCreditsService:
         )
     
     @classmethod
-    def get_transaction_history(cls, user_id: str, limit: int = 10) -> list:
+    async def get_transaction_history(cls, user_id: str, limit: int = 10) -> list:
         """
         Get user's recent transaction history
         
@@ -181,6 +256,14 @@ class GreenCreditsService:
         Returns:
             List of recent transactions
         """
+        redis_client = cls._get_redis()
+        if redis_client is not None:
+            if limit <= 0:
+                return []
+            # Sorted set is scored by timestamp, so newest-first is a reverse range
+            members = await redis_client.zrevrange(cls._transactions_key(user_id), 0, limit - 1)
+            return [GreenCreditTransaction.model_validate_json(member) for member in members]
+        
         if user_id not in cls._transactions:
             return []
         
@@ -189,7 +272,7 @@ class GreenCreditsService:
         return sorted(transactions, key=lambda x: x.timestamp, reverse=True)[:limit]
     
     @classmethod
-    def redeem_credits(cls, user_id: str, amount: float) -> Dict:
+    async def redeem_credits(cls, user_id: str, amount: float) -> Dict:
         """
         Redeem green credits (for future use - rewards system)
         
@@ -200,7 +283,11 @@ class GreenCreditsService:
         Returns:
             Dictionary with redemption status
         """
-        wallet = cls.get_wallet(user_id)
+        redis_client = cls._get_redis()
+        if redis_client is not None:
+            return await cls._redeem_credits_redis(redis_client, user_id, amount)
+        
+        wallet = await cls.get_wallet(user_id)
         
         if wallet.total_credits < amount:
             return {
@@ -219,8 +306,49 @@ class GreenCreditsService:
         }
     
     @classmethod
-    def reset_wallet(cls, user_id: str) -> None:
+    async def _redeem_credits_redis(cls, redis_client, user_id: str, amount: float) -> Dict:
+        """Redeem credits atomically against the Redis wallet hash"""
+        import redis
+        
+        await cls.get_wallet(user_id)
+        wallet_key = cls._wallet_key(user_id)
+        
+        async with redis_client.pipeline() as pipe:
+            while True:
+                try:
+                    # Retry if the balance changes between the check and the update
+                    await pipe.watch(wallet_key)
+                    total_credits = float(await pipe.hget(wallet_key, "total_credits") or 0.0)
+                    if total_credits < amount:
+                        await pipe.unwatch()
+                        return {
+                            "success": False,
+                            "message": f"Insufficient credits. Available: {total_credits}, Required: {amount}"
+                        }
+                    
+                    pipe.multi()
+                    pipe.hincrbyfloat(wallet_key, "total_credits", -amount)
+                    pipe.hincrbyfloat(wallet_key, "credits_redeemed", amount)
+                    pipe.hset(wallet_key, "last_updated", datetime.utcnow().isoformat())
+                    new_balance = float((await pipe.execute())[0])
+                    break
+                except redis.WatchError:
+                    continue
+        
+        return {
+            "success": True,
+            "message": f"Successfully redeemed {amount} credits",
+            "new_balance": new_balance
+        }
+    
+    @classmethod
+    async def reset_wallet(cls, user_id: str) -> None:
         """Reset a user's wallet (for testing purposes)"""
+        redis_client = cls._get_redis()
+        if redis_client is not None:
+            await redis_client.delete(cls._wallet_key(user_id), cls._transactions_key(user_id))
+            return
+        
         if user_id in cls._wallets:
             del cls._wallets[user_id]
         if user_id in cls._transactions:
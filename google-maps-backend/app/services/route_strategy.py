@@ -3,20 +3,34 @@ Enhanced Route Strategy Engine for Google Maps Backend
 Generates 3 distinct route types with optimization algorithms
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Mapping, NamedTuple
 from enum import Enum
+from collections import OrderedDict
+from types import MappingProxyType
 import logging
+import re
 from datetime import datetime, timedelta
 import asyncio
+import time
 
-from ..models.route_models import (
-    RouteRequest, Route, TravelMode, OptimizationMode, 
-    TrafficModel, LocationInput
-)
+import numpy as np
+
+from ..config import get_settings
+from ..models.route_models import Route, TravelMode, TrafficModel, LocationInput
 from ..services.google_maps import GoogleMapsService
 from ..services.green_credits_service import GreenCreditsService
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Route strategy result cache settings
+ROUTE_CACHE_MAX_SIZE = 1024
+ROUTE_CACHE_TTL_SECONDS = 300
+DEPARTURE_BUCKET_SECONDS = 300  # Quantize departure times to 5-minute buckets
+COORDINATE_PRECISION = 5
+
+# Road features detected in route summaries in a single scan
+_SUMMARY_RE = re.compile(r'(highway|toll|ferry)', re.IGNORECASE)
 
 
 class RouteStrategy(str, Enum):
@@ -26,6 +40,74 @@ class RouteStrategy(str, Enum):
     BALANCED = "balanced"         # Balance of time, cost, and environment
 
 
+# Directions parameters shared by every strategy query
+_BASE_DIRECTIONS_PARAMS = {
+    "region": "IN",
+    "language": "en",
+    "units": "metric"
+}
+
+# Per-strategy Directions options, overlaid on the shared parameters
+_STRATEGY_DIRECTIONS_PARAMS = {
+    # FASTEST: speed first - highways and tolls allowed, optimistic traffic
+    RouteStrategy.FASTEST: {
+        "alternatives": False,
+        "avoid": ["ferries"],
+        "traffic_model": TrafficModel.OPTIMISTIC.value
+    },
+    # ECO_FRIENDLY: avoid highways (lower speeds = better fuel efficiency),
+    # alternatives to pick the lowest-impact route, realistic traffic
+    RouteStrategy.ECO_FRIENDLY: {
+        "alternatives": True,
+        "avoid": ["highways", "ferries"],
+        "traffic_model": TrafficModel.BEST_GUESS.value
+    },
+    # BALANCED: strategic highway use, avoid tolls for cost savings
+    RouteStrategy.BALANCED: {
+        "alternatives": True,
+        "avoid": ["tolls", "ferries"],
+        "traffic_model": TrafficModel.BEST_GUESS.value
+    }
+}
+
+# Neutral query whose alternatives are classified into every strategy
+_SHARED_ALTERNATIVES_PARAMS = {
+    "alternatives": True,
+    "avoid": ["ferries"],
+    "traffic_model": TrafficModel.BEST_GUESS.value
+}
+
+
+# Static strategy metadata, shared read-only across all generated routes
+_FASTEST_METADATA = MappingProxyType({
+    "strategy_focus": "Minimum travel time",
+    "traffic_optimization": "Real-time traffic with optimistic model",
+    "road_preferences": "Highways and toll roads allowed for speed",
+    "optimization_factors": ("travel_time", "traffic_conditions", "road_efficiency")
+})
+_ECO_METADATA = MappingProxyType({
+    "strategy_focus": "Minimum environmental impact and fuel consumption",
+    "traffic_optimization": "Avoid congested areas for steady speeds",
+    "road_preferences": "Local roads preferred over highways",
+    "optimization_factors": ("fuel_efficiency", "co2_emissions", "steady_speeds", "fewer_stops")
+})
+_BALANCED_METADATA = MappingProxyType({
+    "strategy_focus": "Optimal balance of time, cost, and environmental impact",
+    "traffic_optimization": "Realistic traffic with moderate assumptions",
+    "road_preferences": "Strategic use of highways, avoid tolls",
+    "optimization_factors": ("travel_time", "fuel_cost", "comfort", "environmental_impact")
+})
+
+
+class _ProcessingContext:
+    """Per-request memo so route data picked by several strategies is converted once"""
+    
+    def __init__(self):
+        self.converted: Dict[int, Route] = {}
+        # All strategies of one batch share the same optimization timestamp
+        self.optimization_timestamp = datetime.now().isoformat()
+
+
 class RouteStrategyEngine:
     """
     Advanced route strategy engine that generates 3 distinct route types:
@@ -34,9 +116,71 @@ class RouteStrategyEngine:
     3. BALANCED - Optimal balance of time, cost, and environmental impact
     """
     
+    # Shared across engine instances (one engine is created per request)
+    _route_cache: "OrderedDict[tuple, Tuple[float, Route]]" = OrderedDict()
+    _inflight_locks: Dict[tuple, asyncio.Lock] = {}
+    _inflight_waiters: Dict[tuple, int] = {}  # holders plus queued waiters per lock
+    
     def __init__(self, gmaps_service: GoogleMapsService):
         self.gmaps_service = gmaps_service
         self.green_credits_service = GreenCreditsService()
+    
+    @staticmethod
+    def _location_cache_key(location: LocationInput) -> Tuple[str, Any]:
+        """Normalize a location input into a hashable cache key component"""
+        if location.coordinates is not None:
+            return (
+                "coordinates",
+                (
+                    round(location.coordinates.lat, COORDINATE_PRECISION),
+                    round(location.coordinates.lng, COORDINATE_PRECISION)
+                )
+            )
+        if location.place_id:
+            return ("place_id", location.place_id)
+        return ("address", (location.address or "").strip().lower())
+    
+    def _corridor_cache_key(
+        self,
+        origin: LocationInput,
+        destination: LocationInput,
+        travel_mode: TravelMode,
+        departure_time: datetime
+    ) -> tuple:
+        """Build the cache key shared by all strategies of one corridor"""
+        return (
+            self._location_cache_key(origin),
+            self._location_cache_key(destination),
+            travel_mode.value,
+            int(departure_time.timestamp() // DEPARTURE_BUCKET_SECONDS)
+        )
+    
+    def _lookup_cached_route(self, key: tuple) -> Optional[Route]:
+        """Get an unexpired cached route and mark it most recently used"""
+        entry = self._route_cache.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, route = entry
+        if time.monotonic() - stored_at > ROUTE_CACHE_TTL_SECONDS:
+            del self._route_cache[key]
+            return None
+        
+        self._route_cache.move_to_end(key)
+        return route
+    
+    def _store_cached_route(self, key: tuple, route: Route) -> None:
+        """Insert a route, evicting expired entries and then least recently used ones"""
+        cache = self._route_cache
+        now = time.monotonic()
+        
+        for expired_key in [k for k, (stored_at, _) in cache.items() if now - stored_at > ROUTE_CACHE_TTL_SECONDS]:
+            del cache[expired_key]
+        
+        cache[key] = (now, route)
+        cache.move_to_end(key)
+        while len(cache) > ROUTE_CACHE_MAX_SIZE:
+            cache.popitem(last=False)
         
     async def generate_three_route_strategies(
         self, 
@@ -48,266 +192,285 @@ class RouteStrategyEngine:
         """
         Generate 3 strategically different routes for the same origin/destination
         
+        Cached strategies are served from the route cache; the remaining ones
+        are fetched together in one Directions batch. Concurrent misses for
+        the same corridor wait on a per-corridor lock so only one batch is
+        sent (single-flight).
+        
         Returns:
             Dict with keys: 'fastest', 'eco_friendly', 'balanced'
         """
-        
-        # Execute all 3 strategies concurrently
-        tasks = [
-            self._calculate_fastest_route(origin, destination, travel_mode, departure_time),
-            self._calculate_eco_friendly_route(origin, destination, travel_mode, departure_time),
-            self._calculate_balanced_route(origin, destination, travel_mode, departure_time)
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
+        # Resolve once so the cache key and every strategy query share one departure time
+        departure_time = departure_time or datetime.now()
+        corridor_key = self._corridor_cache_key(origin, destination, travel_mode, departure_time)
+        routes = self._lookup_cached_strategies(corridor_key)
+        
+        if len(routes) < len(RouteStrategy):
+            lock = self._inflight_locks.setdefault(corridor_key, asyncio.Lock())
+            self._inflight_waiters[corridor_key] = self._inflight_waiters.get(corridor_key, 0) + 1
+            try:
+                async with lock:
+                    # Another request may have filled the cache while we waited
+                    routes = self._lookup_cached_strategies(corridor_key)
+                    missing = [strategy for strategy in RouteStrategy if strategy.value not in routes]
+                    if missing:
+                        base_params = self._base_directions_params(
+                            origin, destination, travel_mode, departure_time
+                        )
+                        calculated = await self._calculate_all_strategies_from_single_query(
+                            missing, base_params, travel_mode
+                        )
+                        if calculated is None:
+                            calculated = await self._calculate_routes_batch(
+                                missing, base_params, travel_mode
+                            )
+                        for strategy_name, route in calculated.items():
+                            self._store_cached_route(corridor_key + (strategy_name,), route)
+                        routes.update(calculated)
+            finally:
+                # Drop the lock only once nobody holds or waits on it; a released lock
+                # reads as unlocked before its queued waiters have woken up
+                self._inflight_waiters[corridor_key] -= 1
+                if not self._inflight_waiters[corridor_key]:
+                    del self._inflight_waiters[corridor_key], self._inflight_locks[corridor_key]
+        
+        return {
+            strategy.value: routes[strategy.value]
+            for strategy in RouteStrategy
+            if strategy.value in routes
+        }
+    
+    def _lookup_cached_strategies(self, corridor_key: tuple) -> Dict[str, Route]:
+        """Get every unexpired cached strategy route for a corridor"""
         routes = {}
-        strategy_names = ["fastest", "eco_friendly", "balanced"]
-        
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Failed to calculate {strategy_names[i]} route: {result}")
-                continue
-            routes[strategy_names[i]] = result
-            
+        for strategy in RouteStrategy:
+            route = self._lookup_cached_route(corridor_key + (strategy.value,))
+            if route is not None:
+                routes[strategy.value] = route
         return routes
     
-    async def _calculate_fastest_route(
-        self, 
-        origin: LocationInput, 
+    def _base_directions_params(
+        self,
+        origin: LocationInput,
         destination: LocationInput,
         travel_mode: TravelMode,
-        departure_time: Optional[datetime]
-    ) -> Route:
-        """
-        Strategy 1: FASTEST ROUTE
-        - Prioritizes speed and minimal travel time
-        - Uses real-time traffic data
-        - May include highways and toll roads for speed
-        - Optimistic traffic model for best-case scenarios
+        departure_time: datetime
+    ) -> Dict[str, Any]:
+        """Build the Directions parameters shared by every strategy query"""
+        params = {
+            **_BASE_DIRECTIONS_PARAMS,
+            "origin": self.gmaps_service.resolve_location_input(origin),
+            "destination": self.gmaps_service.resolve_location_input(destination),
+            "mode": travel_mode.value
+        }
+        if travel_mode == TravelMode.DRIVING:
+            params["departure_time"] = departure_time
+        return params
+    
+    def _strategy_directions_params(
+        self,
+        base_params: Dict[str, Any],
+        strategy_params: Dict[str, Any],
+        travel_mode: TravelMode
+    ) -> Dict[str, Any]:
+        """Overlay strategy-specific options on the shared Directions parameters"""
+        params = {**base_params, **strategy_params}
+        if travel_mode != TravelMode.DRIVING or not settings.enable_traffic_model:
+            params.pop("traffic_model", None)
+        return params
+    
+    async def _calculate_all_strategies_from_single_query(
+        self,
+        strategies: List[RouteStrategy],
+        base_params: Dict[str, Any],
+        travel_mode: TravelMode
+    ) -> Optional[Dict[str, Route]]:
         """
+        Classify one set of Directions alternatives into every strategy
         
-        request = RouteRequest(
-            origin=origin,
-            destination=destination,
-            travel_mode=travel_mode,
-            optimization_mode=OptimizationMode.FASTEST,
-            alternatives=False,
-            avoid_highways=False,  # Allow highways for speed
-            avoid_tolls=False,     # Allow tolls for speed
-            avoid_ferries=True,    # Avoid ferries (usually slower)
-            departure_time=departure_time or datetime.now(),
-            traffic_model=TrafficModel.OPTIMISTIC,  # Best-case traffic
-            region="IN",
-            language="en"
+        Issues a single neutral query with alternatives and applies each
+        strategy's selector to the shared routes. Returns None when Google
+        returns fewer than two alternatives (or the query fails), in which
+        case the per-strategy queries are needed to get distinct routes.
+        """
+        params = self._strategy_directions_params(
+            base_params, _SHARED_ALTERNATIVES_PARAMS, travel_mode
         )
         
-        directions = await self.gmaps_service.calculate_directions(request)
+        try:
+            directions = await self.gmaps_service.calculate_directions_params(params)
+        except Exception as e:
+            logger.warning("Shared alternatives query failed, falling back to per-strategy queries: %s", e)
+            return None
         
-        if not directions or directions[0]['status'] != 'OK':
-            raise ValueError("Failed to calculate fastest route")
-            
-        route_data = directions[0]['routes'][0]
-        route = await self._process_route_with_strategy_metadata(
-            route_data, 
-            travel_mode, 
-            RouteStrategy.FASTEST,
-            {
-                "strategy_focus": "Minimum travel time",
-                "traffic_optimization": "Real-time traffic with optimistic model",
-                "road_preferences": "Highways and toll roads allowed for speed",
-                "optimization_factors": ["travel_time", "traffic_conditions", "road_efficiency"]
-            }
-        )
+        if len(directions) <= 1:
+            return None
         
-        return route
+        return await asyncio.to_thread(
+            self._process_strategies,
+            [(strategy, directions) for strategy in strategies],
+            travel_mode
+        )
     
-    async def _calculate_eco_friendly_route(
-        self, 
-        origin: LocationInput, 
-        destination: LocationInput,
-        travel_mode: TravelMode,
-        departure_time: Optional[datetime]
-    ) -> Route:
-        """
-        Strategy 2: ECO-FRIENDLY ROUTE
-        - Minimizes environmental impact and fuel consumption
-        - Avoids highways when possible (lower speeds = better fuel efficiency)
-        - Prefers routes with less traffic congestion
-        - Optimizes for steady speeds and fewer stops
+    async def _calculate_routes_batch(
+        self,
+        strategies: List[RouteStrategy],
+        base_params: Dict[str, Any],
+        travel_mode: TravelMode
+    ) -> Dict[str, Route]:
         """
+        Fetch directions for several strategies in one batch and process each result
         
-        request = RouteRequest(
-            origin=origin,
-            destination=destination,
-            travel_mode=travel_mode,
-            optimization_mode=OptimizationMode.ECO_FRIENDLY,
-            alternatives=True,  # Get alternatives to find most eco-friendly
-            avoid_highways=True,    # Highways = higher speeds = more fuel consumption
-            avoid_tolls=False,      # Tolls may have less traffic = more efficient
-            avoid_ferries=True,
-            departure_time=departure_time or datetime.now(),
-            traffic_model=TrafficModel.BEST_GUESS,  # Realistic traffic for efficiency
-            region="IN",
-            language="en"
-        )
-        
-        directions = await self.gmaps_service.calculate_directions(request)
+        Strategies whose request or processing fails are logged and omitted.
+        """
+        results = await self.gmaps_service.calculate_directions_batch([
+            self._strategy_directions_params(
+                base_params, _STRATEGY_DIRECTIONS_PARAMS[strategy], travel_mode
+            )
+            for strategy in strategies
+        ])
         
-        if not directions or directions[0]['status'] != 'OK':
-            raise ValueError("Failed to calculate eco-friendly route")
+        strategy_directions = []
+        for strategy, result in zip(strategies, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to calculate %s route: %s", strategy.value, result)
+                continue
+            strategy_directions.append((strategy, result))
         
-        # Select the most eco-friendly route from alternatives
-        best_route_data = self._select_most_eco_friendly_route(directions[0]['routes'])
+        return await asyncio.to_thread(self._process_strategies, strategy_directions, travel_mode)
+    
+    def _process_strategies(
+        self,
+        strategy_directions: List[Tuple[RouteStrategy, List[Dict[str, Any]]]],
+        travel_mode: TravelMode
+    ) -> Dict[str, Route]:
+        """
+        Select and convert the route for each strategy
         
-        route = await self._process_route_with_strategy_metadata(
-            best_route_data,
-            travel_mode,
-            RouteStrategy.ECO_FRIENDLY,
-            {
-                "strategy_focus": "Minimum environmental impact and fuel consumption",
-                "traffic_optimization": "Avoid congested areas for steady speeds",
-                "road_preferences": "Local roads preferred over highways",
-                "optimization_factors": ["fuel_efficiency", "co2_emissions", "steady_speeds", "fewer_stops"]
-            }
-        )
+        Pure CPU work; callers run it in a worker thread to keep the event
+        loop free. Strategies whose processing fails are logged and omitted.
+        """
+        # Strategies often pick the same alternative; convert each one only once
+        context = _ProcessingContext()
+        routes = {}
+        for strategy, directions in strategy_directions:
+            try:
+                routes[strategy.value] = self._process_strategy_directions(
+                    strategy, directions, travel_mode, context
+                )
+            except Exception as e:
+                logger.error("Failed to calculate %s route: %s", strategy.value, e)
         
-        return route
+        return routes
     
-    async def _calculate_balanced_route(
-        self, 
-        origin: LocationInput, 
-        destination: LocationInput,
+    def _process_strategy_directions(
+        self,
+        strategy: RouteStrategy,
+        directions: List[Dict[str, Any]],
         travel_mode: TravelMode,
-        departure_time: Optional[datetime]
+        context: Optional[_ProcessingContext] = None
     ) -> Route:
-        """
-        Strategy 3: BALANCED ROUTE
-        - Optimizes for best overall experience
-        - Balances time, cost, comfort, and environmental impact
-        - Uses moderate traffic assumptions
-        - Considers road quality and driver experience
-        """
-        
-        request = RouteRequest(
-            origin=origin,
-            destination=destination,
-            travel_mode=travel_mode,
-            optimization_mode=OptimizationMode.BALANCED,
-            alternatives=True,
-            avoid_highways=False,   # Use highways strategically
-            avoid_tolls=True,       # Avoid tolls for cost savings
-            avoid_ferries=True,
-            departure_time=departure_time or datetime.now(),
-            traffic_model=TrafficModel.BEST_GUESS,  # Realistic traffic model
-            region="IN",
-            language="en"
-        )
-        
-        directions = await self.gmaps_service.calculate_directions(request)
+        """Pick the route for a strategy from its Directions results and process it"""
+        
+        if not directions:
+            raise ValueError(f"Failed to calculate {strategy.value} route")
+        
+        if strategy == RouteStrategy.FASTEST:
+            return self._process_route_with_strategy_metadata(
+                self._select_fastest_route(directions),
+                travel_mode,
+                RouteStrategy.FASTEST,
+                _FASTEST_METADATA,
+                context
+            )
         
-        if not directions or directions[0]['status'] != 'OK':
-            raise ValueError("Failed to calculate balanced route")
+        if strategy == RouteStrategy.ECO_FRIENDLY:
+            # Select the most eco-friendly route from alternatives
+            return self._process_route_with_strategy_metadata(
+                self._select_most_eco_friendly_route(directions),
+                travel_mode,
+                RouteStrategy.ECO_FRIENDLY,
+                _ECO_METADATA,
+                context
+            )
         
         # Select the most balanced route from alternatives
-        best_route_data = self._select_most_balanced_route(directions[0]['routes'])
-        
-        route = await self._process_route_with_strategy_metadata(
-            best_route_data,
+        return self._process_route_with_strategy_metadata(
+            self._select_most_balanced_route(directions),
             travel_mode,
             RouteStrategy.BALANCED,
-            {
-                "strategy_focus": "Optimal balance of time, cost, and environmental impact",
-                "traffic_optimization": "Realistic traffic with moderate assumptions",
-                "road_preferences": "Strategic use of highways, avoid tolls",
-                "optimization_factors": ["travel_time", "fuel_cost", "comfort", "environmental_impact"]
-            }
+            _BALANCED_METADATA,
+            context
         )
+    
+    def _select_fastest_route(self, routes: List[Dict]) -> Dict:
+        """Select the route with the shortest total travel time"""
+        if len(routes) == 1:
+            return routes[0]
         
-        return route
+        # Two alternatives (the common case): compare directly, skipping array setup
+        if len(routes) == 2:
+            duration0 = sum(leg['duration']['value'] for leg in routes[0]['legs'])
+            duration1 = sum(leg['duration']['value'] for leg in routes[1]['legs'])
+            return routes[0] if duration0 <= duration1 else routes[1]
+        
+        summary = _summarize_routes(routes)
+        return routes[int(np.argmin(summary['durations']))]
     
     def _select_most_eco_friendly_route(self, routes: List[Dict]) -> Dict:
         """Select the route with lowest environmental impact"""
         if len(routes) == 1:
             return routes[0]
         
-        best_route = routes[0]
-        best_score = float('inf')
+        # Two alternatives (the common case): compare directly, skipping array setup
+        if len(routes) == 2:
+            totals0, totals1 = _route_totals(routes[0]), _route_totals(routes[1])
+            score0 = _eco_scores(totals0.distance, totals0.has_highway)
+            score1 = _eco_scores(totals1.distance, totals1.has_highway)
+            return routes[0] if score0 <= score1 else routes[1]
         
-        for route in routes:
-            # Calculate eco-friendliness score based on:
-            # - Total distance (shorter = better)
-            # - Highway usage (less = better for fuel efficiency)
-            # - Traffic conditions (smoother = better)
-            
-            total_distance = sum(leg['distance']['value'] for leg in route['legs'])
-            
-            # Estimate highway usage from route summary
-            highway_penalty = 1.2 if 'highway' in route.get('summary', '').lower() else 1.0
-            
-            # Environmental score (lower is better)
-            eco_score = total_distance * highway_penalty
-            
-            if eco_score < best_score:
-                best_score = eco_score
-                best_route = route
-        
-        return best_route
+        summary = _summarize_routes(routes)
+        eco_scores = _eco_scores(summary['distances'], summary['highway_flags'])
+        return routes[int(np.argmin(eco_scores))]
     
     def _select_most_balanced_route(self, routes: List[Dict]) -> Dict:
         """Select the route with best overall balance"""
         if len(routes) == 1:
             return routes[0]
         
-        best_route = routes[0]
-        best_score = 0
-        
-        for route in routes:
-            # Calculate balanced score considering:
-            # - Time efficiency (40% weight)
-            # - Distance efficiency (30% weight)  
-            # - Cost efficiency (20% weight)
-            # - Comfort (10% weight)
-            
-            total_duration = sum(leg['duration']['value'] for leg in route['legs'])
-            total_distance = sum(leg['distance']['value'] for leg in route['legs'])
-            
-            # Normalize scores (lower duration/distance = higher score)
-            time_score = max(0, 100 - (total_duration / 60))  # Convert to minutes
-            distance_score = max(0, 100 - (total_distance / 1000))  # Convert to km
-            
-            # Cost score (avoid tolls = higher score)
-            cost_score = 80 if 'toll' not in route.get('summary', '').lower() else 60
-            
-            # Comfort score (fewer turns and highway usage)
-            total_steps = sum(len(leg['steps']) for leg in route['legs'])
-            comfort_score = max(0, 100 - total_steps * 2)
-            
-            # Weighted balanced score
-            balanced_score = (
-                time_score * 0.4 +
-                distance_score * 0.3 + 
-                cost_score * 0.2 +
-                comfort_score * 0.1
-            )
-            
-            if balanced_score > best_score:
-                best_score = balanced_score
-                best_route = route
+        # Two alternatives (the common case): compare directly, skipping array setup
+        if len(routes) == 2:
+            totals0, totals1 = _route_totals(routes[0]), _route_totals(routes[1])
+            score0 = _balanced_scores(totals0.duration, totals0.distance, totals0.steps, totals0.has_toll)
+            score1 = _balanced_scores(totals1.duration, totals1.distance, totals1.steps, totals1.has_toll)
+            return routes[0] if score0 >= score1 else routes[1]
         
-        return best_route
+        summary = _summarize_routes(routes)
+        balanced_scores = _balanced_scores(
+            summary['durations'], summary['distances'], summary['step_counts'], summary['toll_flags']
+        )
+        return routes[int(np.argmax(balanced_scores))]
     
-    async def _process_route_with_strategy_metadata(
+    def _process_route_with_strategy_metadata(
         self,
         route_data: Dict[str, Any],
         travel_mode: TravelMode,
         strategy: RouteStrategy,
-        strategy_metadata: Dict[str, Any]
+        strategy_metadata: Mapping[str, Any],
+        context: Optional[_ProcessingContext] = None
     ) -> Route:
         """Process route data with strategy-specific metadata"""
         
-        # Calculate emissions with strategy-specific factors
-        emissions = self.gmaps_service.calculate_emissions(route_data, travel_mode)
+        base_route = context.converted.get(id(route_data)) if context else None
+        if base_route is None:
+            emissions = self.gmaps_service.calculate_emissions(route_data, travel_mode)
+            base_route = self._convert_to_route_object(route_data, travel_mode, emissions)
+            if context is not None:
+                context.converted[id(route_data)] = base_route
+        
+        # Each strategy gets its own copy so adjustments don't leak between strategies
+        route = base_route.model_copy(update={"emissions": base_route.emissions.model_copy()})
+        emissions = route.emissions
         
         # Apply strategy-specific emissions adjustments
         if strategy == RouteStrategy.ECO_FRIENDLY:
@@ -317,35 +480,27 @@ class RouteStrategyEngine:
             # Penalty for speed-focused routes (usually less eco-friendly)
             emissions.eco_score = max(0.0, emissions.eco_score - 0.5)
         
-        # Process route similar to existing logic but add strategy metadata
-        route = await self._convert_to_route_object(route_data, travel_mode, emissions)
-        
-        # Add strategy-specific metadata
-        if not hasattr(route, 'strategy_info'):
-            route.strategy_info = {}
-        
+        # Add strategy-specific metadata (plain dict copy of the shared
+        # read-only metadata so the route stays JSON-serializable)
         route.strategy_info = {
             "strategy_type": strategy.value,
-            "strategy_metadata": strategy_metadata,
-            "optimization_timestamp": datetime.now().isoformat()
-        }
-        
-        # Calculate green credits based on strategy type
-        optimization_mode_map = {
-            RouteStrategy.FASTEST: "fastest",
-            RouteStrategy.ECO_FRIENDLY: "eco_friendly",
-            RouteStrategy.BALANCED: "balanced"
+            "strategy_metadata": dict(strategy_metadata),
+            "optimization_timestamp": (
+                context.optimization_timestamp if context else datetime.now().isoformat()
+            )
         }
         
-        optimization_mode = optimization_mode_map.get(strategy, "balanced")
+        # Calculate green credits based on strategy type (strategy values
+        # match the optimization mode names)
         route.green_credits_earned = self.green_credits_service.calculate_credits_for_route(
-            route=route,
-            optimization_mode=optimization_mode
+            route_distance_km=route.total_distance["value"] / 1000,
+            optimization_mode=strategy.value,
+            co2_emissions_kg=emissions.co2_emissions_kg
         )
         
         return route
     
-    async def _convert_to_route_object(
+    def _convert_to_route_object(
         self, 
         route_data: Dict[str, Any], 
         travel_mode: TravelMode, 
@@ -353,58 +508,48 @@ class RouteStrategyEngine:
     ) -> Route:
         """Convert Google Maps route data to Route object"""
         
-        # Calculate totals
-        total_distance = {"text": "0 km", "value": 0}
-        total_duration = {"text": "0 mins", "value": 0}
+        default_travel_mode = travel_mode.value
+        legs_data = route_data.get('legs', ())
+        
+        total_distance_value = 0
+        total_duration_value = 0
         
         legs = []
-        for leg_data in route_data.get('legs', []):
-            # Process steps
-            steps = []
-            for step_data in leg_data.get('steps', []):
-                step = {
-                    "instruction": step_data.get('html_instructions', ''),
-                    "distance": step_data.get('distance', {}),
-                    "duration": step_data.get('duration', {}),
-                    "start_location": {
-                        "lat": step_data['start_location']['lat'],
-                        "lng": step_data['start_location']['lng']
-                    },
-                    "end_location": {
-                        "lat": step_data['end_location']['lat'], 
-                        "lng": step_data['end_location']['lng']
-                    },
-                    "polyline": step_data.get('polyline', {}).get('points', ''),
-                    "travel_mode": step_data.get('travel_mode', travel_mode.value)
-                }
-                steps.append(step)
+        for leg_data in legs_data:
+            distance = leg_data.get('distance') or {}
+            duration = leg_data.get('duration') or {}
             
-            # Create leg
-            leg = {
+            # Google's {"lat", "lng"} location dicts are passed through as-is;
+            # Route validates them straight into Location models
+            legs.append({
                 "start_address": leg_data.get('start_address', ''),
                 "end_address": leg_data.get('end_address', ''),
-                "start_location": {
-                    "lat": leg_data['start_location']['lat'],
-                    "lng": leg_data['start_location']['lng']
-                },
-                "end_location": {
-                    "lat": leg_data['end_location']['lat'],
-                    "lng": leg_data['end_location']['lng']
-                },
-                "distance": leg_data.get('distance', {}),
-                "duration": leg_data.get('duration', {}),
+                "start_location": leg_data['start_location'],
+                "end_location": leg_data['end_location'],
+                "distance": distance,
+                "duration": duration,
                 "duration_in_traffic": leg_data.get('duration_in_traffic'),
-                "steps": steps
-            }
-            legs.append(leg)
+                "steps": [
+                    {
+                        "instruction": step_data.get('html_instructions', ''),
+                        "distance": step_data.get('distance', {}),
+                        "duration": step_data.get('duration', {}),
+                        "start_location": step_data['start_location'],
+                        "end_location": step_data['end_location'],
+                        "polyline": step_data.get('polyline', {}).get('points', ''),
+                        "travel_mode": step_data.get('travel_mode', default_travel_mode)
+                    }
+                    for step_data in leg_data.get('steps', ())
+                ]
+            })
             
             # Accumulate totals
-            total_distance["value"] += leg_data.get('distance', {}).get('value', 0)
-            total_duration["value"] += leg_data.get('duration', {}).get('value', 0)
+            total_distance_value += distance.get('value', 0)
+            total_duration_value += duration.get('value', 0)
         
-        # Format total texts
-        total_distance["text"] = f"{total_distance['value'] / 1000:.1f} km"
-        total_duration["text"] = f"{total_duration['value'] // 60} mins"
+        bounds = route_data['bounds']
+        northeast = bounds['northeast']
+        southwest = bounds['southwest']
         
         return Route(
             summary=route_data.get('summary', ''),
@@ -413,21 +558,21 @@ class RouteStrategyEngine:
             waypoint_order=route_data.get('waypoint_order'),
             overview_polyline=route_data.get('overview_polyline', {}).get('points', ''),
             bounds={
-                "northeast": {
-                    "lat": route_data['bounds']['northeast']['lat'],
-                    "lng": route_data['bounds']['northeast']['lng']
-                },
-                "southwest": {
-                    "lat": route_data['bounds']['southwest']['lat'], 
-                    "lng": route_data['bounds']['southwest']['lng']
-                }
+                "northeast": {"lat": northeast['lat'], "lng": northeast['lng']},
+                "southwest": {"lat": southwest['lat'], "lng": southwest['lng']}
             },
             copyrights=route_data.get('copyrights', ''),
             fare=route_data.get('fare'),
             emissions=emissions,
-            total_distance=total_distance,
-            total_duration=total_duration,
-            total_duration_in_traffic=route_data.get('legs', [{}])[0].get('duration_in_traffic')
+            total_distance={
+                "text": "%.1f km" % (total_distance_value / 1000),
+                "value": total_distance_value
+            },
+            total_duration={
+                "text": "%d mins" % (total_duration_value // 60),
+                "value": total_duration_value
+            },
+            total_duration_in_traffic=legs_data[0].get('duration_in_traffic') if legs_data else None
         )
 
 
@@ -452,34 +597,49 @@ class RouteOptimizer:
             "environmental_impact": {}
         }
         
-        # Compare routes
-        for strategy, route in routes.items():
+        # Compare routes, collecting per-route metrics into arrays in one pass
+        strategies = list(routes)
+        durations = np.empty(len(strategies))
+        eco_scores = np.empty(len(strategies))
+        co2_emissions = np.empty(len(strategies))
+        has_emissions = np.empty(len(strategies), dtype=bool)
+        
+        for i, strategy in enumerate(strategies):
+            route = routes[strategy]
+            emissions = route.emissions
+            durations[i] = route.total_duration["value"]
+            eco_scores[i] = emissions.eco_score if emissions else 0
+            co2_emissions[i] = emissions.co2_emissions_kg if emissions else 0
+            has_emissions[i] = emissions is not None
+            
             analysis["route_comparison"][strategy] = {
                 "distance_km": round(route.total_distance["value"] / 1000, 1),
-                "duration_minutes": round(route.total_duration["value"] / 60, 1),
-                "eco_score": route.emissions.eco_score if route.emissions else 0,
-                "co2_emissions_kg": route.emissions.co2_emissions_kg if route.emissions else 0
+                "duration_minutes": round(durations[i] / 60, 1),
+                "eco_score": eco_scores[i].item(),
+                "co2_emissions_kg": co2_emissions[i].item()
             }
         
         # Generate optimization suggestions
         suggestions = []
         
         # Time-based suggestions
-        fastest_route = min(routes.items(), key=lambda x: x[1].total_duration["value"])
+        fastest_index = int(np.argmin(durations))
+        time_savings = _calculate_time_savings(durations, fastest_index)
         suggestions.append({
             "type": "time_optimization",
-            "message": f"For fastest travel, use {fastest_route[0]} route - saves up to {_calculate_time_savings(routes, fastest_route[1])} minutes",
+            "message": f"For fastest travel, use {strategies[fastest_index]} route - saves up to {time_savings} minutes",
             "impact": "high",
-            "savings_minutes": _calculate_time_savings(routes, fastest_route[1])
+            "savings_minutes": time_savings
         })
         
         # Environmental suggestions
-        eco_route = max(routes.items(), key=lambda x: x[1].emissions.eco_score if x[1].emissions else 0)
+        eco_index = int(np.argmax(eco_scores))
+        co2_savings = _calculate_co2_savings(co2_emissions, has_emissions, eco_index)
         suggestions.append({
             "type": "environmental_optimization", 
-            "message": f"For lowest environmental impact, use {eco_route[0]} route - reduces CO2 by up to {_calculate_co2_savings(routes, eco_route[1]):.1f} kg",
+            "message": f"For lowest environmental impact, use {strategies[eco_index]} route - reduces CO2 by up to {co2_savings:.1f} kg",
             "impact": "medium",
-            "co2_savings_kg": _calculate_co2_savings(routes, eco_route[1])
+            "co2_savings_kg": co2_savings
         })
         
         # Traffic-based suggestions
@@ -495,27 +655,78 @@ class RouteOptimizer:
         return analysis
 
 
-def _calculate_time_savings(routes: Dict[str, Route], fastest_route: Route) -> int:
-    """Calculate time savings compared to slowest route"""
-    if not routes:
-        return 0
+class _RouteTotals(NamedTuple):
+    duration: int
+    distance: int
+    steps: int
+    has_highway: bool
+    has_toll: bool
+
+
+def _route_totals(route: Dict) -> _RouteTotals:
+    """Totals and road features of one route, with a single pass over its legs"""
+    duration = distance = steps = 0
+    for leg in route['legs']:
+        duration += leg['duration']['value']
+        distance += leg['distance']['value']
+        steps += len(leg['steps'])
     
-    slowest_time = max(route.total_duration["value"] for route in routes.values())
-    fastest_time = fastest_route.total_duration["value"]
+    flags = {match.group(1).lower() for match in _SUMMARY_RE.finditer(route.get('summary', ''))}
+    return _RouteTotals(duration, distance, steps, 'highway' in flags, 'toll' in flags)
+
+
+def _summarize_routes(routes: List[Dict]) -> Dict[str, np.ndarray]:
+    """Collect per-route totals into arrays"""
+    durations, distances, step_counts, highway_flags, toll_flags = zip(*map(_route_totals, routes))
+    return {
+        "durations": np.array(durations, dtype=float),
+        "distances": np.array(distances, dtype=float),
+        "step_counts": np.array(step_counts, dtype=float),
+        "highway_flags": np.array(highway_flags, dtype=bool),
+        "toll_flags": np.array(toll_flags, dtype=bool)
+    }
+
+
+# The scoring functions take either one route's totals or arrays from _summarize_routes
+
+def _eco_scores(distances, highway_flags):
+    """Environmental score (lower is better): distance, with a 20% penalty for highway use"""
+    return distances * np.where(highway_flags, 1.2, 1.0)
+
+
+def _balanced_scores(durations, distances, step_counts, toll_flags):
+    """Balanced score (higher is better): time 40%, distance 30%, cost 20%, comfort 10%"""
+    # Normalize scores (lower duration/distance = higher score)
+    time_scores = np.maximum(0, 100 - durations / 60)  # Convert to minutes
+    distance_scores = np.maximum(0, 100 - distances / 1000)  # Convert to km
     
-    return round((slowest_time - fastest_time) / 60)
+    # Cost score (avoid tolls = higher score)
+    cost_scores = np.where(toll_flags, 60, 80)
+    
+    # Comfort score (fewer turns)
+    comfort_scores = np.maximum(0, 100 - step_counts * 2)
+    
+    return (
+        time_scores * 0.4 +
+        distance_scores * 0.3 +
+        cost_scores * 0.2 +
+        comfort_scores * 0.1
+    )
 
 
-def _calculate_co2_savings(routes: Dict[str, Route], eco_route: Route) -> float:
-    """Calculate CO2 savings compared to highest emission route"""
-    if not routes:
-        return 0.0
+def _calculate_time_savings(durations: np.ndarray, fastest_index: int) -> int:
+    """Calculate time savings (minutes) compared to slowest route"""
+    if not durations.size:
+        return 0
     
-    emissions = [route.emissions.co2_emissions_kg for route in routes.values() if route.emissions]
-    if not emissions:
+    return round(float(durations.max() - durations[fastest_index]) / 60)
+
+
+def _calculate_co2_savings(co2_emissions: np.ndarray, has_emissions: np.ndarray, eco_index: int) -> float:
+    """Calculate CO2 savings compared to highest emission route"""
+    if not has_emissions.any():
         return 0.0
     
-    highest_emissions = max(emissions)
-    eco_emissions = eco_route.emissions.co2_emissions_kg if eco_route.emissions else 0
+    highest_emissions = co2_emissions[has_emissions].max()
     
-    return max(0.0, highest_emissions - eco_emissions)
\ No newline at end of file
+    return max(0.0, float(highest_emissions - co2_emissions[eco_index]))
@@ -5,22 +5,36 @@ Supports multiple vehicle types: Petrol, Diesel, CNG, Electric, Hybrid
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict
 from typing import Dict, Any, List, Optional
 import time
-import uuid
+import secrets
 import asyncio
 import uvicorn
 import random
 import os
-import json
+import re
+import sys
 from datetime import datetime
 from pathlib import Path
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
 import aiohttp
+import hashlib
 import logging
+import numpy as np
+from cachetools import TTLCache
+import orjson
+
+# The OpenAI client is only needed for LLM recommendations; without it they are rule-based
+try:
+    from openai import AsyncOpenAI
+except ImportError:
+    AsyncOpenAI = None
 
 # Setup logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
@@ -28,16 +42,30 @@ try:
     from dotenv import load_dotenv
     env_path = Path(__file__).parent / '.env'
     load_dotenv(dotenv_path=env_path)
-    print(f"✅ Loaded environment from: {env_path}")
+    logger.info("✅ Loaded environment from: %s", env_path)
 except ImportError:
-    print("⚠️ python-dotenv not installed. Using system environment variables.")
+    logger.warning("⚠️ python-dotenv not installed. Using system environment variables.")
 except Exception as e:
-    print(f"⚠️ Could not load .env file: {e}")
+    logger.warning("⚠️ Could not load .env file: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one pooled HTTP session across requests so Google Maps connections are reused"""
+    app.state.http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75),
+        timeout=aiohttp.ClientTimeout(total=8),
+        json_serialize=lambda obj: orjson.dumps(obj).decode()
+    )
+    app.state.llm_available = await _probe_llm_endpoints()
+    logger.info("LLM recommendations %s", "enabled" if app.state.llm_available else "unavailable, using rule-based fallback")
+    yield
+    await app.state.http.close()
 
 app = FastAPI(
     title="PragatiDhara Enhanced Backend",
     description="Vehicle-specific fuel cost analysis with comprehensive savings calculations",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for React frontend
@@ -55,9 +83,12 @@ MAPS_BASE_URL = "https://maps.googleapis.com/maps/api"
 USE_REAL_GMAPS = bool(GOOGLE_MAPS_API_KEY and GOOGLE_MAPS_API_KEY != 'YOUR_API_KEY_HERE')
 
 if USE_REAL_GMAPS:
-    print(f"✅ Google Maps API configured - using real route data")
+    logger.info("✅ Google Maps API configured - using real route data")
 else:
-    print(f"⚠️ Google Maps API not configured - using mock data")
+    logger.warning("⚠️ Google Maps API not configured - using mock data")
+
+# Optional artificial delay on mock endpoints for demo realism (off by default)
+SIMULATE_LATENCY = os.getenv('DEBUG_SIMULATE_LATENCY', 'false').lower() in ('1', 'true', 'yes')
 
 # Vehicle-specific fuel/energy costs (current Indian market rates)
 VEHICLE_COSTS = {
@@ -98,84 +129,213 @@ VEHICLE_COSTS = {
     }
 }
 
+# Canonical price field so lookups don't need to know the fuel unit
+for vehicle_data in VEHICLE_COSTS.values():
+    vehicle_data["price_per_unit"] = (
+        vehicle_data.get("price_per_liter") or vehicle_data.get("price_per_kg") or vehicle_data.get("price_per_kwh")
+    )
+
+# Request validation: membership set and the list quoted in error messages
+SUPPORTED_VEHICLE_TYPES = frozenset(VEHICLE_COSTS)
+SUPPORTED_VEHICLES_TEXT = str(list(VEHICLE_COSTS))
+
+# Structure-of-arrays view of VEHICLE_COSTS for the numeric kernels
+VEHICLE_IDS = tuple(VEHICLE_COSTS)
+VEHICLE_INDEX = {vehicle_type: i for i, vehicle_type in enumerate(VEHICLE_IDS)}
+VEHICLE_EFFICIENCIES = np.array([VEHICLE_COSTS[v]["efficiency_base"] for v in VEHICLE_IDS], dtype=np.float64)
+# Cost and emissions per km at a route factor of 1.0; the per-route figure is this divided by the route factor
+VEHICLE_PRICE_PER_KM_BASE = np.array(
+    [VEHICLE_COSTS[v]["price_per_unit"] / VEHICLE_COSTS[v]["efficiency_base"] for v in VEHICLE_IDS], dtype=np.float64
+)
+VEHICLE_EMISSION_PER_KM_BASE = np.array(
+    [VEHICLE_COSTS[v]["emission_factor"] / VEHICLE_COSTS[v]["efficiency_base"] for v in VEHICLE_IDS], dtype=np.float64
+)
+
+# Per-vehicle scalars unpacked by calc_three in a single lookup: (price_per_unit, unit, display_name)
+VEHICLE_COSTS_COMPILED = {
+    vehicle_type: (data["price_per_unit"], data["unit"], data["display_name"])
+    for vehicle_type, data in VEHICLE_COSTS.items()
+}
+
+# Static per-vehicle response text, formatted once instead of on every request
+PER_VEHICLE_TEXT = {
+    vehicle_type: {
+        "fastest_characteristic": f"Higher {data['unit']} consumption",
+        "eco_characteristic": f"Lowest {data['unit']} consumption",
+        "balanced_characteristic": f"Moderate {data['unit']} consumption",
+        "eco_title": f"🌱 Choose Eco-Friendly Route for Maximum {data['display_name']} Savings",
+        "balanced_title": f"⚖️ Balanced Route for Optimal {data['display_name']} Cost-Time Trade-off",
+        "fastest_title": f"🚀 Fastest Route - Premium {data['display_name']} Speed Choice",
+        "eco_vehicle_specific": f"Optimized for {data['display_name']} efficiency",
+        "balanced_vehicle_specific": f"Ideal compromise for {data['display_name']} users",
+        "fastest_vehicle_specific": f"Highway optimized for {data['display_name']}",
+        "base_efficiency": f"{data['efficiency_base']} km/{data['unit']}",
+        "emission_factor": f"{data['emission_factor']} kg CO₂/{data['unit']}",
+        "pricing_source": f"Current Indian market rates for {data['display_name']}"
+    }
+    for vehicle_type, data in VEHICLE_COSTS.items()
+}
+
 # Request models
 class RouteRequest(BaseModel):
-    origin: Dict[str, Any]
-    destination: Dict[str, Any]
+    model_config = ConfigDict(extra="ignore")
+
+    origin: dict
+    destination: dict
     travel_mode: Optional[str] = "driving"
     departure_time: Optional[str] = None
 
 class ThreeStrategiesRequest(BaseModel):
-    origin: Dict[str, Any]
-    destination: Dict[str, Any]
+    model_config = ConfigDict(extra="ignore")
+
+    origin: dict
+    destination: dict
     travel_mode: Optional[str] = "driving"
     departure_time: Optional[str] = None
     vehicle_type: Optional[str] = "petrol"  # petrol, diesel, cng, electric, hybrid_petrol
 
+class BatchThreeStrategiesRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    origin: dict
+    destination: dict
+    travel_mode: Optional[str] = "driving"
+    vehicle_types: List[str] = ["petrol", "diesel", "cng", "electric", "hybrid_petrol"]
+
 class AIRecommendationRequest(BaseModel):
     routes: List[Dict[str, Any]]  # The three routes data
     vehicle_type: str
 
+# Handlers serialize their already JSON-ready bodies with orjson themselves,
+# which skips FastAPI's jsonable_encoder walk over large payloads
+NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+
+def json_response(content: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=orjson.dumps(content), media_type="application/json", headers=headers)
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {
+    return json_response({
         "status": "healthy",
         "service": "enhanced_maps_backend", 
         "version": "2.0.0",
         "supported_vehicles": list(VEHICLE_COSTS.keys()),
         "timestamp": time.time()
-    }
+    }, headers=NO_STORE_HEADERS)
 
-def calculate_fuel_cost_and_consumption(distance_km: float, route_efficiency_factor: float, vehicle_type: str):
-    """Calculate fuel/energy consumption and cost for specific route and vehicle"""
-    vehicle_data = VEHICLE_COSTS.get(vehicle_type, VEHICLE_COSTS["petrol"])
-    base_efficiency = vehicle_data["efficiency_base"]
-    actual_efficiency = base_efficiency * route_efficiency_factor
-    
-    if vehicle_type == "electric":
-        energy_consumed = distance_km / actual_efficiency  # kWh
-        cost = energy_consumed * vehicle_data["price_per_kwh"]
-        price_per_unit = vehicle_data["price_per_kwh"]
-        fuel_consumed = energy_consumed  # For consistency in calculations
-    elif vehicle_type == "cng":
-        fuel_consumed = distance_km / actual_efficiency  # kg
-        cost = fuel_consumed * vehicle_data["price_per_kg"]
-        price_per_unit = vehicle_data["price_per_kg"]
-    else:  # petrol, diesel, hybrid_petrol
-        fuel_consumed = distance_km / actual_efficiency  # L
-        cost = fuel_consumed * vehicle_data["price_per_liter"]
-        price_per_unit = vehicle_data["price_per_liter"]
+# Strategy order used in responses, and the matching route_comparison keys
+STRATEGY_ORDER = ("fastest", "eco_friendly", "balanced")
+SAVINGS_KEYS = ("savings_vs_fastest", "savings_vs_eco", "savings_vs_balanced")
+
+# Eco score per strategy (in STRATEGY_ORDER); electric vehicles score higher on every route
+ECO_SCORES = {
+    vehicle_type: (9.2, 9.8, 9.5) if vehicle_type == "electric" else (6.2, 8.7, 7.5)
+    for vehicle_type in VEHICLE_COSTS
+}
+
+# Mock routes used without Google Maps; summaries are filled in per request
+MOCK_ROUTES_DISTANCES = {
+    'fastest': {'km': 45.2, 'meters': 45200, 'text': '45.2 km', 'duration_sec': 5100, 'duration_text': '1 hour 25 mins', 'summary': 'Via highways from {origin} to {destination}'},
+    'eco_friendly': {'km': 52.1, 'meters': 52100, 'text': '52.1 km', 'duration_sec': 6300, 'duration_text': '1 hour 45 mins', 'summary': 'Via eco-routes from {origin} to {destination}'},
+    'balanced': {'km': 48.7, 'meters': 48700, 'text': '48.7 km', 'duration_sec': 5520, 'duration_text': '1 hour 32 mins', 'summary': 'Optimized balance from {origin} to {destination}'}
+}
+
+# Route efficiency factor per strategy
+ROUTE_EFFICIENCY_FACTORS = {
+    "fastest": 0.85,
+    "eco_friendly": 1.15,
+    "balanced": 1.0
+}
+
+STRATEGY_EFFICIENCY_FACTORS = np.array([ROUTE_EFFICIENCY_FACTORS[strategy] for strategy in STRATEGY_ORDER])
+
+def calc_three(distances_km: np.ndarray, vehicle_type: str):
+    """Fuel calculations for the fastest, eco-friendly and balanced routes (in STRATEGY_ORDER) as array ops"""
+    idx = VEHICLE_INDEX.get(vehicle_type, VEHICLE_INDEX["petrol"])
+    price_per_unit, unit, display_name = VEHICLE_COSTS_COMPILED[VEHICLE_IDS[idx]]
     
-    emissions = fuel_consumed * vehicle_data["emission_factor"]
+    efficiency = VEHICLE_EFFICIENCIES[idx] * STRATEGY_EFFICIENCY_FACTORS
+    consumed = distances_km / efficiency
+    cost_per_km = VEHICLE_PRICE_PER_KM_BASE[idx] / STRATEGY_EFFICIENCY_FACTORS
+    cost = distances_km * cost_per_km
+    emissions = distances_km * VEHICLE_EMISSION_PER_KM_BASE[idx] / STRATEGY_EFFICIENCY_FACTORS
     
-    return {
-        "consumption": round(fuel_consumed, 2),
-        "cost": round(cost, 2),
-        "efficiency": round(actual_efficiency, 1),
-        "cost_per_km": round(cost / distance_km, 2),
-        "emissions_kg": round(emissions, 2),
-        "unit": vehicle_data["unit"],
-        "price_per_unit": price_per_unit,
-        "vehicle_display": vehicle_data["display_name"]
-    }
+    # Rounded per element with round(): np.round scales by 10**decimals and can land a cent off
+    return tuple(
+        {
+            "consumption": round(consumption, 2),
+            "cost": round(route_cost, 2),
+            "efficiency": round(route_efficiency, 1),
+            "cost_per_km": round(route_cost_per_km, 2),
+            "emissions_kg": round(route_emissions, 2),
+            "unit": unit,
+            "price_per_unit": price_per_unit,
+            "vehicle_display": display_name
+        }
+        for consumption, route_cost, route_efficiency, route_cost_per_km, route_emissions in zip(
+            consumed.tolist(), cost.tolist(), efficiency.tolist(), cost_per_km.tolist(), emissions.tolist()
+        )
+    )
 
-async def call_google_maps_api(session: aiohttp.ClientSession, endpoint: str, params: Dict[str, Any]):
+# Mock inputs are constant, so their fuel calculations are done once per vehicle
+MOCK_DISTANCES_KM = np.array([MOCK_ROUTES_DISTANCES[strategy]['km'] for strategy in STRATEGY_ORDER])
+PRECOMPUTED_MOCK_CALCS = {
+    vehicle_type: dict(zip(STRATEGY_ORDER, calc_three(MOCK_DISTANCES_KM, vehicle_type)))
+    for vehicle_type in VEHICLE_COSTS
+}
+
+# Google Maps responses by request fingerprint, so repeat corridors skip the network
+GMAPS_CACHE_TTL_SECONDS = 300
+_gmaps_cache = TTLCache(maxsize=4096, ttl=GMAPS_CACHE_TTL_SECONDS)
+_gmaps_inflight_locks: Dict[str, asyncio.Lock] = {}
+_gmaps_inflight_waiters: Dict[str, int] = {}  # holders plus queued waiters per lock
+
+def _gmaps_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    return hashlib.blake2b(f"{endpoint}|{sorted(params.items())}".encode(), digest_size=16).hexdigest()
+
+async def _fetch_google_maps_api(session: aiohttp.ClientSession, endpoint: str, params: Dict[str, Any]):
     """Make async call to Google Maps API"""
-    params['key'] = GOOGLE_MAPS_API_KEY
+    params = {**params, 'key': GOOGLE_MAPS_API_KEY}
     
     try:
         async with session.get(f"{MAPS_BASE_URL}/{endpoint}", params=params) as response:
             if response.status == 200:
-                return await response.json()
+                return orjson.loads(await response.read())
             else:
                 error_text = await response.text()
-                logger.error(f"Google Maps API error: {response.status} - {error_text}")
+                logger.error("Google Maps API error: %s - %s", response.status, error_text)
                 return None
     except Exception as e:
-        logger.error(f"Error calling Google Maps API: {e}")
+        logger.error("Error calling Google Maps API: %s", e)
         return None
 
+async def call_google_maps_api(session: aiohttp.ClientSession, endpoint: str, params: Dict[str, Any]):
+    """Google Maps API call served from a TTL cache; concurrent misses for one key share a fetch"""
+    cache_key = _gmaps_cache_key(endpoint, params)
+    cached = _gmaps_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    lock = _gmaps_inflight_locks.setdefault(cache_key, asyncio.Lock())
+    _gmaps_inflight_waiters[cache_key] = _gmaps_inflight_waiters.get(cache_key, 0) + 1
+    try:
+        async with lock:
+            # Another request may have filled the cache while we waited
+            cached = _gmaps_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            result = await _fetch_google_maps_api(session, endpoint, params)
+            if result and result.get('status') == 'OK':
+                _gmaps_cache[cache_key] = result
+            return result
+    finally:
+        # Drop the lock only once nobody holds or waits on it; a released lock
+        # reads as unlocked before its queued waiters have woken up
+        _gmaps_inflight_waiters[cache_key] -= 1
+        if not _gmaps_inflight_waiters[cache_key]:
+            del _gmaps_inflight_waiters[cache_key], _gmaps_inflight_locks[cache_key]
+
 def parse_location(location_data: Dict[str, Any]) -> str:
     """Parse location data to address string for Google Maps API"""
     if 'address' in location_data and location_data['address']:
@@ -183,9 +343,16 @@ def parse_location(location_data: Dict[str, Any]) -> str:
     elif 'lat' in location_data and 'lng' in location_data:
         return f"{location_data['lat']},{location_data['lng']}"
     else:
-        logger.warning(f"Invalid location data: {location_data}")
+        logger.warning("Invalid location data: %s", location_data)
         return "Pune, Maharashtra, India"  # Default fallback
 
+# Green credit multiplier per strategy
+_CREDIT_MULTIPLIERS = {
+    "eco_friendly": 1.0,   # 100% credits
+    "balanced": 0.6,       # 60% credits
+    "fastest": 0.0         # 0% credits (no reward for speed-focused)
+}
+
 def calculate_green_credits(distance_km: float, co2_saved_kg: float, optimization_mode: str) -> float:
     """
     Calculate green credits earned for a route based on distance and CO2 savings.
@@ -197,77 +364,82 @@ def calculate_green_credits(distance_km: float, co2_saved_kg: float, optimizatio
     - balanced: 60% (moderate credits)
     - fastest: 0% (no credits - speed-focused)
     """
-    # Base credits for distance
-    base_credits = distance_km * 0.5
-    
-    # Bonus credits for CO2 savings
-    bonus_credits = max(0, co2_saved_kg) * 5.0
-    
-    # Total before multiplier
-    total_credits = base_credits + bonus_credits
-    
-    # Apply strategy multiplier
-    multipliers = {
-        "eco_friendly": 1.0,   # 100% credits
-        "balanced": 0.6,       # 60% credits
-        "fastest": 0.0         # 0% credits (no reward for speed-focused)
-    }
-    
-    multiplier = multipliers.get(optimization_mode, 0.6)
-    final_credits = total_credits * multiplier
-    
-    return round(final_credits, 2)
+    multiplier = _CREDIT_MULTIPLIERS.get(optimization_mode, 0.6)
+    return round((distance_km * 0.5 + max(0.0, co2_saved_kg) * 5.0) * multiplier, 2)
 
-async def generate_llm_recommendations(routes_data: Dict[str, Any], vehicle_type: str) -> Dict[str, Any]:
-    """
-    Generate personalized route recommendations using LLM analysis.
-    Uses OpenAI-compatible API or Ollama, with fallback to rule-based recommendations.
-    """
-    try:
-        from openai import AsyncOpenAI
-        
-        # Get configuration from environment
-        use_openai = os.getenv("USE_OPENAI", "false").lower() in ("true", "1", "yes")
-        api_base = os.getenv("OPENAI_API_BASE_URL", "http://34.67.10.255/api/v1")
-        api_key = os.getenv("OPENAI_API_KEY", "pass")
-        model_name = os.getenv("MODEL_NAME", "Qwen/Qwen2.5-Math-1.5B-Instruct")
-        temperature = float(os.getenv("DEFAULT_TEMPERATURE", "0.7"))
-        max_tokens = int(os.getenv("DEFAULT_MAX_TOKENS", "1000"))
-        
-        # Prepare route data for LLM
-        fastest = routes_data.get("fastest", {})
-        eco = routes_data.get("eco_friendly", {})
-        balanced = routes_data.get("balanced", {})
-        
-        prompt = f"""You are a sustainability-focused transportation advisor passionate about environmental protection and eco-friendly travel. Your primary mission is to encourage users to choose routes that minimize environmental impact while still being practical. Prioritize eco-friendly and balanced routes that reduce carbon emissions, save fuel, and earn green credits.
+# Markdown code fences (```json / ```) that LLMs wrap around JSON answers
+_FENCE_RE = re.compile(r"```(?:json)?")
+
+# LLM endpoint configuration, read from the environment once at import
+_LLM_CFG = SimpleNamespace(
+    use_openai=os.getenv("USE_OPENAI", "false").lower() in ("true", "1", "yes"),
+    api_base=os.getenv("OPENAI_API_BASE_URL", "http://34.67.10.255/api/v1"),
+    api_key=os.getenv("OPENAI_API_KEY", "pass"),
+    model_name=os.getenv("MODEL_NAME", "Qwen/Qwen2.5-Math-1.5B-Instruct"),
+    temperature=float(os.getenv("DEFAULT_TEMPERATURE", "0.7")),
+    max_tokens=int(os.getenv("DEFAULT_MAX_TOKENS", "1000")),
+    # Safety net for a hung endpoint only; set well above the 2-10 s a full answer takes
+    timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "15.0")),
+    ollama_base=os.getenv("OLLAMA_API_BASE_URL", "http://localhost:11434/v1"),
+    ollama_model=os.getenv("OLLAMA_MODEL_NAME", "gemma3:1b"),
+    ollama_key=os.getenv("OLLAMA_API_KEY", "ollama")
+)
+
+# One client per endpoint, created on first use, so HTTP keep-alive works across requests
+_llm_clients: Dict[str, Any] = {}
+
+def _get_llm_client(base_url: str, api_key: str):
+    client = _llm_clients.get(base_url)
+    if client is None:
+        client = _llm_clients[base_url] = AsyncOpenAI(base_url=base_url, api_key=api_key)
+    return client
+
+async def _probe_llm_endpoints() -> bool:
+    """Check once at startup whether any configured LLM endpoint answers"""
+    if AsyncOpenAI is None:
+        return False
+    endpoints = [(_LLM_CFG.ollama_base, _LLM_CFG.ollama_key)]
+    if _LLM_CFG.use_openai:
+        endpoints.insert(0, (_LLM_CFG.api_base, _LLM_CFG.api_key))
+    for base_url, api_key in endpoints:
+        try:
+            await asyncio.wait_for(_get_llm_client(base_url, api_key).models.list(), timeout=2)
+            return True
+        except Exception as e:
+            logger.info("LLM endpoint %s unavailable: %s", base_url, e)
+    return False
+
+_LLM_SYSTEM_PROMPT = "You are a passionate environmental advocate and sustainable transportation expert. Your mission is to guide users toward eco-friendly travel choices that reduce carbon emissions and protect our planet. Always prioritize sustainability and environmental impact in your recommendations. Make users feel good about choosing green options and highlight the positive impact of their choices."
+
+_LLM_PROMPT_TEMPLATE = """You are a sustainability-focused transportation advisor passionate about environmental protection and eco-friendly travel. Your primary mission is to encourage users to choose routes that minimize environmental impact while still being practical. Prioritize eco-friendly and balanced routes that reduce carbon emissions, save fuel, and earn green credits.
 
 IMPORTANT: Unless the time difference is extremely critical (>30 minutes extra), always lean towards recommending eco-friendly or balanced routes. Emphasize the environmental benefits, cost savings, and green credits earned.
 
-Vehicle Type: {vehicle_type.upper()}
+Vehicle Type: {vehicle_type}
 
 Route 1 - FASTEST (Speed-Focused, Higher Environmental Impact):
-- Distance: {fastest.get('total_distance', {}).get('text', 'N/A')}
-- Duration: {fastest.get('total_duration', {}).get('text', 'N/A')}
-- Fuel Cost: ₹{fastest.get('fuel_analysis', {}).get('cost', 'N/A')}
-- CO2 Emissions: {fastest.get('emissions', {}).get('co2_emissions_kg', 'N/A')} kg ⚠️
-- Green Credits: {fastest.get('green_credits_earned', 0)} (NO REWARD for speed-focused travel)
-- Eco Score: {fastest.get('emissions', {}).get('eco_score', 'N/A')}/10
+- Distance: {fastest_distance}
+- Duration: {fastest_duration}
+- Fuel Cost: ₹{fastest_cost}
+- CO2 Emissions: {fastest_co2} kg ⚠️
+- Green Credits: {fastest_credits} (NO REWARD for speed-focused travel)
+- Eco Score: {fastest_eco_score}/10
 
 Route 2 - ECO-FRIENDLY (🌱 RECOMMENDED FOR SUSTAINABILITY):
-- Distance: {eco.get('total_distance', {}).get('text', 'N/A')}
-- Duration: {eco.get('total_duration', {}).get('text', 'N/A')}
-- Fuel Cost: ₹{eco.get('fuel_analysis', {}).get('cost', 'N/A')} 💰
-- CO2 Emissions: {eco.get('emissions', {}).get('co2_emissions_kg', 'N/A')} kg 🌍
-- Green Credits: {eco.get('green_credits_earned', 0)} ⭐ (MAXIMUM REWARD)
-- Eco Score: {eco.get('emissions', {}).get('eco_score', 'N/A')}/10 ✅
+- Distance: {eco_distance}
+- Duration: {eco_duration}
+- Fuel Cost: ₹{eco_cost} 💰
+- CO2 Emissions: {eco_co2} kg 🌍
+- Green Credits: {eco_credits} ⭐ (MAXIMUM REWARD)
+- Eco Score: {eco_eco_score}/10 ✅
 
 Route 3 - BALANCED (Good Compromise):
-- Distance: {balanced.get('total_distance', {}).get('text', 'N/A')}
-- Duration: {balanced.get('total_duration', {}).get('text', 'N/A')}
-- Fuel Cost: ₹{balanced.get('fuel_analysis', {}).get('cost', 'N/A')}
-- CO2 Emissions: {balanced.get('emissions', {}).get('co2_emissions_kg', 'N/A')} kg
-- Green Credits: {balanced.get('green_credits_earned', 0)} (60% reward)
-- Eco Score: {balanced.get('emissions', {}).get('eco_score', 'N/A')}/10
+- Distance: {balanced_distance}
+- Duration: {balanced_duration}
+- Fuel Cost: ₹{balanced_cost}
+- CO2 Emissions: {balanced_co2} kg
+- Green Credits: {balanced_credits} (60% reward)
+- Eco Score: {balanced_eco_score}/10
 
 Your Task:
 Analyze these routes with a strong bias towards environmental sustainability. Calculate the environmental impact difference and make users aware of their carbon footprint choices. Encourage eco-friendly decisions by highlighting:
@@ -285,49 +457,125 @@ Provide a JSON response with:
 
 Format as valid JSON only, no markdown."""
 
+async def _stream_llm_json(client, model: str, prompt: str) -> str:
+    """
+    Stream a chat completion and stop as soon as the first top-level JSON object is closed.
+    
+    Braces inside JSON strings are ignored. Closing the stream early also stops the
+    server-side generation instead of waiting for max_tokens.
+    """
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": _LLM_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=_LLM_CFG.temperature,
+        max_tokens=_LLM_CFG.max_tokens,
+        stream=True
+    )
+    parts = []
+    depth = 0
+    in_string = escaped = False
+    try:
+        async for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if not text:
+                continue
+            for i, ch in enumerate(text):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == '\\':
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = depth > 0
+                elif ch == '{':
+                    depth += 1
+                elif ch == '}' and depth > 0:
+                    depth -= 1
+                    if depth == 0:
+                        parts.append(text[:i + 1])
+                        return "".join(parts).strip()
+            parts.append(text)
+    finally:
+        await stream.close()
+    return "".join(parts).strip()
+
+def _pluck(d: Any, *path: str, default: Any = None) -> Any:
+    """Walk nested dicts along path without allocating empty fallback dicts"""
+    cur = d
+    for key in path:
+        cur = cur.get(key) if isinstance(cur, dict) else None
+    return default if cur is None else cur
+
+def _prompt_route_fields(prefix: str, routes_data: Dict[str, Any], strategy: str) -> Dict[str, Any]:
+    """Values for one route's placeholders in _LLM_PROMPT_TEMPLATE"""
+    route = routes_data.get(strategy)
+    return {
+        f"{prefix}_distance": _pluck(route, 'total_distance', 'text', default='N/A'),
+        f"{prefix}_duration": _pluck(route, 'total_duration', 'text', default='N/A'),
+        f"{prefix}_cost": _pluck(route, 'fuel_analysis', 'cost', default='N/A'),
+        f"{prefix}_co2": _pluck(route, 'emissions', 'co2_emissions_kg', default='N/A'),
+        f"{prefix}_credits": _pluck(route, 'green_credits_earned', default=0),
+        f"{prefix}_eco_score": _pluck(route, 'emissions', 'eco_score', default='N/A')
+    }
+
+async def generate_llm_recommendations(routes_data: Dict[str, Any], vehicle_type: str) -> Dict[str, Any]:
+    """
+    Generate personalized route recommendations using LLM analysis.
+    Uses OpenAI-compatible API or Ollama, with fallback to rule-based recommendations.
+    """
+    # Skip prompt building entirely when the startup probe found no LLM
+    if not getattr(app.state, "llm_available", True):
+        return generate_rule_based_recommendations(routes_data, vehicle_type)
+    
+    try:
+        if AsyncOpenAI is None:
+            raise ImportError("openai package not installed")
+        
+        # Prepare route data for LLM
+        prompt = _LLM_PROMPT_TEMPLATE.format_map({
+            "vehicle_type": vehicle_type.upper(),
+            **_prompt_route_fields("fastest", routes_data, "fastest"),
+            **_prompt_route_fields("eco", routes_data, "eco_friendly"),
+            **_prompt_route_fields("balanced", routes_data, "balanced")
+        })
+
         # Check if we should try OpenAI or skip directly to Ollama
-        if not use_openai:
-            print("ℹ️ USE_OPENAI=false, skipping OpenAI and using Ollama directly")
+        if not _LLM_CFG.use_openai:
+            logger.debug("ℹ️ USE_OPENAI=false, skipping OpenAI and using Ollama directly")
             raise ValueError("OpenAI disabled by configuration")
 
         try:
             # Try primary OpenAI-compatible endpoint
-            print(f"🔄 Attempting OpenAI-compatible endpoint: {api_base}")
-            client = AsyncOpenAI(
-                base_url=api_base,
-                api_key=api_key
-            )
+            logger.debug("🔄 Attempting OpenAI-compatible endpoint: %s", _LLM_CFG.api_base)
+            client = _get_llm_client(_LLM_CFG.api_base, _LLM_CFG.api_key)
             
-            response = await client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": "You are a passionate environmental advocate and sustainable transportation expert. Your mission is to guide users toward eco-friendly travel choices that reduce carbon emissions and protect our planet. Always prioritize sustainability and environmental impact in your recommendations. Make users feel good about choosing green options and highlight the positive impact of their choices."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens
+            llm_text = await asyncio.wait_for(
+                _stream_llm_json(client, _LLM_CFG.model_name, prompt), timeout=_LLM_CFG.timeout
             )
             
-            llm_text = response.choices[0].message.content.strip()
-            
             # Parse JSON response
             try:
                 # Remove markdown code blocks if present
-                clean_text = llm_text.replace('```json', '').replace('```', '').strip()
-                llm_data = json.loads(clean_text)
+                clean_text = _FENCE_RE.sub('', llm_text).strip()
+                llm_data = orjson.loads(clean_text)
                 
-                print(f"✅ OpenAI-compatible endpoint successful: {model_name}")
+                logger.debug("✅ OpenAI-compatible endpoint successful: %s", _LLM_CFG.model_name)
                 return {
                     "source": "openai_compatible",
-                    "model": model_name,
+                    "model": _LLM_CFG.model_name,
                     "timestamp": datetime.now().isoformat(),
                     **llm_data
                 }
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # If JSON parsing fails, return text response with eco-friendly default
                 return {
                     "source": "openai_compatible_text",
-                    "model": model_name,
+                    "model": _LLM_CFG.model_name,
                     "timestamp": datetime.now().isoformat(),
                     "recommended_route": "eco_friendly",  # Default to eco-friendly
                     "reasoning": llm_text[:200] if llm_text else "Choose eco-friendly for maximum environmental benefit and green credits!",
@@ -344,46 +592,32 @@ Format as valid JSON only, no markdown."""
                 }
                 
         except Exception as primary_error:
-            print(f"⚠️ Primary LLM endpoint failed: {primary_error}")
+            logger.debug("⚠️ Primary LLM endpoint failed: %s", primary_error)
             
             # Try Ollama fallback
             try:
-                print("🔄 Attempting Ollama fallback...")
-                ollama_base = os.getenv("OLLAMA_API_BASE_URL", "http://localhost:11434/v1")
-                ollama_model = os.getenv("OLLAMA_MODEL_NAME", "gemma3:1b")
-                ollama_key = os.getenv("OLLAMA_API_KEY", "ollama")
+                logger.debug("🔄 Attempting Ollama fallback...")
+                ollama_model = _LLM_CFG.ollama_model
+                logger.debug("📍 Ollama endpoint: %s, model: %s", _LLM_CFG.ollama_base, ollama_model)
                 
-                print(f"📍 Ollama endpoint: {ollama_base}, model: {ollama_model}")
+                client = _get_llm_client(_LLM_CFG.ollama_base, _LLM_CFG.ollama_key)
                 
-                client = AsyncOpenAI(
-                    base_url=ollama_base,
-                    api_key=ollama_key
-                )
-                
-                response = await client.chat.completions.create(
-                    model=ollama_model,
-                    messages=[
-                        {"role": "system", "content": "You are a passionate environmental advocate and sustainable transportation expert. Your mission is to guide users toward eco-friendly travel choices that reduce carbon emissions and protect our planet. Always prioritize sustainability and environmental impact in your recommendations. Make users feel good about choosing green options and highlight the positive impact of their choices."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=temperature,
-                    max_tokens=max_tokens
+                llm_text = await asyncio.wait_for(
+                    _stream_llm_json(client, ollama_model, prompt), timeout=_LLM_CFG.timeout
                 )
-                
-                llm_text = response.choices[0].message.content.strip()
-                clean_text = llm_text.replace('```json', '').replace('```', '').strip()
+                clean_text = _FENCE_RE.sub('', llm_text).strip()
                 
                 try:
-                    llm_data = json.loads(clean_text)
-                    print(f"✅ Ollama endpoint successful: {ollama_model}")
+                    llm_data = orjson.loads(clean_text)
+                    logger.debug("✅ Ollama endpoint successful: %s", ollama_model)
                     return {
                         "source": "ollama",
                         "model": ollama_model,
                         "timestamp": datetime.now().isoformat(),
                         **llm_data
                     }
-                except json.JSONDecodeError:
-                    print(f"⚠️ Ollama JSON parse failed, using fallback")
+                except orjson.JSONDecodeError:
+                    logger.debug("⚠️ Ollama JSON parse failed, using fallback")
                     return {
                         "source": "ollama_text",
                         "model": ollama_model,
@@ -402,36 +636,36 @@ Format as valid JSON only, no markdown."""
                         }
                     }
             except Exception as ollama_error:
-                print(f"❌ Ollama fallback also failed: {ollama_error}")
+                logger.debug("❌ Ollama fallback also failed: %s", ollama_error)
                 raise ValueError("All LLM endpoints unavailable")
             
     except Exception as e:
         # Fallback to rule-based recommendations
-        print(f"ℹ️ LLM unavailable, using rule-based recommendations: {e}")
+        logger.debug("ℹ️ LLM unavailable, using rule-based recommendations: %s", e)
         return generate_rule_based_recommendations(routes_data, vehicle_type)
 
 def generate_rule_based_recommendations(routes_data: Dict[str, Any], vehicle_type: str) -> Dict[str, Any]:
     """Generate intelligent sustainability-focused recommendations based on route analysis rules"""
     
-    fastest = routes_data.get("fastest", {})
-    eco = routes_data.get("eco_friendly", {})
-    balanced = routes_data.get("balanced", {})
+    fastest = routes_data.get("fastest")
+    eco = routes_data.get("eco_friendly")
+    balanced = routes_data.get("balanced")
     
     # Extract key metrics
-    fastest_cost = fastest.get('fuel_analysis', {}).get('cost', 999)
-    eco_cost = eco.get('fuel_analysis', {}).get('cost', 999)
-    balanced_cost = balanced.get('fuel_analysis', {}).get('cost', 999)
+    fastest_cost = _pluck(fastest, 'fuel_analysis', 'cost', default=999)
+    eco_cost = _pluck(eco, 'fuel_analysis', 'cost', default=999)
+    balanced_cost = _pluck(balanced, 'fuel_analysis', 'cost', default=999)
     
-    fastest_duration = fastest.get('total_duration', {}).get('value', 9999) / 60  # Convert to minutes
-    eco_duration = eco.get('total_duration', {}).get('value', 9999) / 60
-    balanced_duration = balanced.get('total_duration', {}).get('value', 9999) / 60
+    fastest_duration = _pluck(fastest, 'total_duration', 'value', default=9999) / 60  # Convert to minutes
+    eco_duration = _pluck(eco, 'total_duration', 'value', default=9999) / 60
+    balanced_duration = _pluck(balanced, 'total_duration', 'value', default=9999) / 60
     
-    eco_credits = eco.get('green_credits_earned', 0)
-    balanced_credits = balanced.get('green_credits_earned', 0)
+    eco_credits = _pluck(eco, 'green_credits_earned', default=0)
+    balanced_credits = _pluck(balanced, 'green_credits_earned', default=0)
     
-    fastest_co2 = fastest.get('emissions', {}).get('co2_emissions_kg', 0)
-    eco_co2 = eco.get('emissions', {}).get('co2_emissions_kg', 0)
-    balanced_co2 = balanced.get('emissions', {}).get('co2_emissions_kg', 0)
+    fastest_co2 = _pluck(fastest, 'emissions', 'co2_emissions_kg', default=0)
+    eco_co2 = _pluck(eco, 'emissions', 'co2_emissions_kg', default=0)
+    balanced_co2 = _pluck(balanced, 'emissions', 'co2_emissions_kg', default=0)
     
     # Calculate savings
     cost_savings_eco = fastest_cost - eco_cost
@@ -490,159 +724,126 @@ def generate_rule_based_recommendations(routes_data: Dict[str, Any], vehicle_typ
         }
     }
 
-# Three-route strategies endpoint
-@app.post("/api/v1/routes/three-strategies")
-async def get_three_route_strategies(request: ThreeStrategiesRequest):
-    """Generate three different route strategies with vehicle-specific optimization suggestions"""
-    
-    request_id = str(uuid.uuid4())[:8]
-    processing_start = time.time()
-    
-    # Extract request info
-    origin_info = request.origin.get('address', 'Unknown Origin')
-    dest_info = request.destination.get('address', 'Unknown Destination')
-    vehicle_type = request.vehicle_type or "petrol"
-    
-    # Validate vehicle type
-    if vehicle_type not in VEHICLE_COSTS:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported vehicle type: {vehicle_type}. Supported: {list(VEHICLE_COSTS.keys())}"
-        )
-    
-    vehicle_data = VEHICLE_COSTS[vehicle_type]
-    
-    # Try to get real Google Maps data if API key is configured
-    real_routes_data = None
-    if USE_REAL_GMAPS:
-        logger.info(f"🗺️ Fetching real routes from Google Maps API: {origin_info} → {dest_info}")
-        try:
-            origin = parse_location(request.origin)
-            destination = parse_location(request.destination)
-            
-            async with aiohttp.ClientSession() as session:
-                route_data = {}
-                
-                # Define three route strategies with Google Maps API parameters
-                strategies = {
-                    'fastest': {
-                        'avoid': [],  # No restrictions
-                        'description': 'Speed optimization with highway preference'
-                    },
-                    'eco_friendly': {
-                        'avoid': ['highways', 'tolls'],  # Avoid highways and tolls
-                        'description': 'Environmental impact minimization'
-                    },
-                    'balanced': {
-                        'avoid': ['tolls'],  # Avoid only tolls
-                        'description': 'Multi-criteria optimization'
-                    }
-                }
-                
-                for strategy_name, strategy_config in strategies.items():
-                    params = {
-                        'origin': origin,
-                        'destination': destination,
-                        'mode': 'driving',
-                        'departure_time': 'now',
-                        'alternatives': 'false'
-                    }
-                    
-                    # Add avoid parameters
-                    if strategy_config['avoid']:
-                        params['avoid'] = '|'.join(strategy_config['avoid'])
-                    
-                    gmaps_result = await call_google_maps_api(session, 'directions/json', params)
-                    
-                    if gmaps_result and gmaps_result.get('status') == 'OK' and gmaps_result.get('routes'):
-                        route = gmaps_result['routes'][0]
-                        leg = route['legs'][0]
-                        
-                        distance_meters = leg['distance']['value']
-                        distance_km = distance_meters / 1000
-                        duration_seconds = leg['duration']['value']
-                        
-                        route_data[strategy_name] = {
-                            'distance_km': distance_km,
-                            'distance_meters': distance_meters,
-                            'distance_text': leg['distance']['text'],
-                            'duration_seconds': duration_seconds,
-                            'duration_text': leg['duration']['text'],
-                            'summary': route.get('summary', f"{strategy_name} route"),
-                            'start_address': leg.get('start_address', origin_info),
-                            'end_address': leg.get('end_address', dest_info)
-                        }
-                        logger.info(f"  ✅ {strategy_name}: {distance_km:.1f} km, {duration_seconds//60} min")
-                    else:
-                        logger.warning(f"  ⚠️ No route found for {strategy_name} strategy")
-                
-                if len(route_data) == 3:
-                    real_routes_data = route_data
-                    logger.info(f"✅ Successfully fetched all 3 real routes from Google Maps")
-                else:
-                    logger.warning(f"⚠️ Only got {len(route_data)}/3 routes, falling back to mock data")
-                    
-        except Exception as e:
-            logger.error(f"❌ Error fetching Google Maps data: {e}")
-            logger.info(f"ℹ️ Falling back to mock data")
-    
-    # Use real data if available, otherwise use mock data
-    if real_routes_data:
-        # Calculate with REAL route data
-        fastest_data = real_routes_data['fastest']
-        eco_data = real_routes_data['eco_friendly']
-        balanced_data = real_routes_data['balanced']
-        
-        # Adjust efficiency factors based on route type
-        fastest_calc = calculate_fuel_cost_and_consumption(fastest_data['distance_km'], 0.85, vehicle_type)
-        eco_calc = calculate_fuel_cost_and_consumption(eco_data['distance_km'], 1.15, vehicle_type)
-        balanced_calc = calculate_fuel_cost_and_consumption(balanced_data['distance_km'], 1.0, vehicle_type)
-        
-        # Use real distance and duration
-        routes_distances = {
-            'fastest': {'km': fastest_data['distance_km'], 'meters': fastest_data['distance_meters'], 'text': fastest_data['distance_text'], 'duration_sec': fastest_data['duration_seconds'], 'duration_text': fastest_data['duration_text'], 'summary': fastest_data['summary']},
-            'eco_friendly': {'km': eco_data['distance_km'], 'meters': eco_data['distance_meters'], 'text': eco_data['distance_text'], 'duration_sec': eco_data['duration_seconds'], 'duration_text': eco_data['duration_text'], 'summary': eco_data['summary']},
-            'balanced': {'km': balanced_data['distance_km'], 'meters': balanced_data['distance_meters'], 'text': balanced_data['distance_text'], 'duration_sec': balanced_data['duration_seconds'], 'duration_text': balanced_data['duration_text'], 'summary': balanced_data['summary']}
+# Static scaffolding of the three optimization suggestions; only the savings
+# figures are filled into the %-style slots per request
+SUGGESTION_TEMPLATES = {
+    vehicle_type: (
+        {
+            "title": PER_VEHICLE_TEXT[vehicle_type]["eco_title"],
+            "message": f"Eco-friendly route saves ₹%s in {vehicle_type} costs compared to fastest route",
+            "details": f"Save %.2f{data['unit']} • %.1f%% cost reduction",
+            "vehicle_specific": PER_VEHICLE_TEXT[vehicle_type]["eco_vehicle_specific"]
+        },
+        {
+            "title": PER_VEHICLE_TEXT[vehicle_type]["balanced_title"],
+            "message": "Balanced route saves ₹%s with only 7 minutes extra time",
+            "details": f"Save %.2f{data['unit']} • Best time-cost balance",
+            "vehicle_specific": PER_VEHICLE_TEXT[vehicle_type]["balanced_vehicle_specific"]
+        },
+        {
+            "title": PER_VEHICLE_TEXT[vehicle_type]["fastest_title"],
+            "message": "Fastest route costs ₹%.2f extra but saves 20 minutes",
+            "details": f"Extra %.2f{data['unit']} • Premium for time-sensitive travel",
+            "vehicle_specific": PER_VEHICLE_TEXT[vehicle_type]["fastest_vehicle_specific"]
         }
-        data_source = "google_maps_api"
-    else:
-        # Use MOCK data (fallback)
-        await asyncio.sleep(0.2)  # Simulate processing
-        
-        fastest_calc = calculate_fuel_cost_and_consumption(45.2, 0.85, vehicle_type)
-        eco_calc = calculate_fuel_cost_and_consumption(52.1, 1.15, vehicle_type)
-        balanced_calc = calculate_fuel_cost_and_consumption(48.7, 1.0, vehicle_type)
-        
-        routes_distances = {
-            'fastest': {'km': 45.2, 'meters': 45200, 'text': '45.2 km', 'duration_sec': 5100, 'duration_text': '1 hour 25 mins', 'summary': f'Via highways from {origin_info} to {dest_info}'},
-            'eco_friendly': {'km': 52.1, 'meters': 52100, 'text': '52.1 km', 'duration_sec': 6300, 'duration_text': '1 hour 45 mins', 'summary': f'Via eco-routes from {origin_info} to {dest_info}'},
-            'balanced': {'km': 48.7, 'meters': 48700, 'text': '48.7 km', 'duration_sec': 5520, 'duration_text': '1 hour 32 mins', 'summary': f'Optimized balance from {origin_info} to {dest_info}'}
+    )
+    for vehicle_type, data in VEHICLE_COSTS.items()
+}
+
+def build_suggestions(vehicle_type: str, fastest_calc: Dict[str, Any], eco_calc: Dict[str, Any],
+                      balanced_calc: Dict[str, Any], fastest_vs_eco_savings: float,
+                      fastest_vs_balanced_savings: float, eco_amount_saved: float,
+                      balanced_amount_saved: float, eco_co2_saved: float,
+                      balanced_co2_saved: float) -> List[Dict[str, Any]]:
+    """Fill the vehicle's suggestion templates with this request's (already rounded) savings figures"""
+    eco_template, balanced_template, fastest_template = SUGGESTION_TEMPLATES[vehicle_type]
+    fastest_cost = fastest_calc["cost"]
+    eco_amount = fastest_calc["consumption"] - eco_calc["consumption"]
+    balanced_amount = fastest_calc["consumption"] - balanced_calc["consumption"]
+    eco_percentage = (fastest_vs_eco_savings / fastest_cost * 100) if fastest_cost > 0 else 0
+    
+    return [
+        {
+            "title": eco_template["title"],
+            "message": eco_template["message"] % fastest_vs_eco_savings,
+            "impact": "high",
+            "savings_minutes": -20,
+            "fuel_savings_inr": fastest_vs_eco_savings,
+            "fuel_savings_amount": eco_amount_saved,
+            "co2_savings_kg": round(eco_co2_saved, 2),
+            "route_color": "#006400",
+            "details": eco_template["details"] % (eco_amount, eco_percentage),
+            "vehicle_specific": eco_template["vehicle_specific"]
+        },
+        {
+            "title": balanced_template["title"],
+            "message": balanced_template["message"] % fastest_vs_balanced_savings,
+            "impact": "medium",
+            "savings_minutes": -7,
+            "fuel_savings_inr": fastest_vs_balanced_savings,
+            "fuel_savings_amount": balanced_amount_saved,
+            "co2_savings_kg": round(balanced_co2_saved, 2),
+            "route_color": "#000080",
+            "details": balanced_template["details"] % balanced_amount,
+            "vehicle_specific": balanced_template["vehicle_specific"]
+        },
+        {
+            "title": fastest_template["title"],
+            "message": fastest_template["message"] % fastest_vs_eco_savings,
+            "impact": "low",
+            "savings_minutes": 20,
+            "fuel_cost_extra": fastest_vs_eco_savings,
+            "fuel_extra_amount": eco_amount_saved,
+            "route_color": "#FF6B00", 
+            "details": fastest_template["details"] % eco_amount,
+            "vehicle_specific": fastest_template["vehicle_specific"]
         }
-        data_source = "mock_data"
+    ]
+
+def _pct(num: float, denom: float) -> str:
+    """num as a one-decimal percentage of denom, or "0%" when there is no base to compare against"""
+    return f"{num / denom * 100:.1f}%" if denom > 0 else "0%"
+
+def build_three_strategies_body(
+    vehicle_type: str,
+    routes_distances: Dict[str, Dict[str, Any]],
+    fastest_calc: Dict[str, Any],
+    eco_calc: Dict[str, Any],
+    balanced_calc: Dict[str, Any],
+    data_source: str
+) -> Dict[str, Any]:
+    """Build the request-independent part of the three-strategies response"""
+    vehicle_data = VEHICLE_COSTS[vehicle_type]
+    vehicle_text = PER_VEHICLE_TEXT[vehicle_type]
+    eco_scores = ECO_SCORES[vehicle_type]
     
     # Calculate CO2 savings compared to fastest route (baseline)
     fastest_co2 = fastest_calc["emissions_kg"]
     eco_co2_saved = fastest_co2 - eco_calc["emissions_kg"]
     balanced_co2_saved = fastest_co2 - balanced_calc["emissions_kg"]
     
+    # Each route's distance fields, bound once (in STRATEGY_ORDER) for the blocks below
+    distances = tuple(routes_distances[strategy] for strategy in STRATEGY_ORDER)
+    fastest_dist, eco_dist, balanced_dist = distances
+    
     # Calculate green credits for each route
-    fastest_credits = calculate_green_credits(routes_distances['fastest']['km'], 0, "fastest")
-    eco_credits = calculate_green_credits(routes_distances['eco_friendly']['km'], eco_co2_saved, "eco_friendly")
-    balanced_credits = calculate_green_credits(routes_distances['balanced']['km'], balanced_co2_saved, "balanced")
+    fastest_credits = calculate_green_credits(fastest_dist['km'], 0, "fastest")
+    eco_credits = calculate_green_credits(eco_dist['km'], eco_co2_saved, "eco_friendly")
+    balanced_credits = calculate_green_credits(balanced_dist['km'], balanced_co2_saved, "balanced")
     
     # Generate three distinct routes with vehicle-specific calculations
     routes = {
         "fastest": {
             "type": "fastest",
             "color": "#FF6B00",  # Dark Orange
-            "total_distance": {"value": routes_distances['fastest']['meters'], "text": routes_distances['fastest']['text']},
-            "total_duration": {"value": routes_distances['fastest']['duration_sec'], "text": routes_distances['fastest']['duration_text']},
-            "summary": routes_distances['fastest']['summary'],
+            "total_distance": {"value": fastest_dist['meters'], "text": fastest_dist['text']},
+            "total_duration": {"value": fastest_dist['duration_sec'], "text": fastest_dist['duration_text']},
+            "summary": fastest_dist['summary'],
             "vehicle_type": vehicle_type,
             "green_credits_earned": fastest_credits,
             "emissions": {
                 "co2_emissions_kg": fastest_calc["emissions_kg"],
-                "eco_score": 6.2 if vehicle_type != "electric" else 9.2,
+                "eco_score": eco_scores[0],
                 "fuel_consumption_liters": fastest_calc["consumption"]
             },
             "fuel_analysis": fastest_calc,
@@ -651,7 +852,7 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
                     "strategy_focus": "Speed optimization with highway preference",
                     "optimization_factors": ["highways", "tolls_allowed", "traffic_avoidance"],
                     "route_characteristics": [
-                        f"Higher {vehicle_data['unit']} consumption" if vehicle_type != "electric" else "Higher kWh consumption",
+                        vehicle_text["fastest_characteristic"],
                         "Fast travel time", 
                         "Highway tolls applicable"
                     ]
@@ -661,14 +862,14 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
         "eco_friendly": {
             "type": "eco-friendly", 
             "color": "#006400",  # Dark Green
-            "total_distance": {"value": routes_distances['eco_friendly']['meters'], "text": routes_distances['eco_friendly']['text']},
-            "total_duration": {"value": routes_distances['eco_friendly']['duration_sec'], "text": routes_distances['eco_friendly']['duration_text']},
-            "summary": routes_distances['eco_friendly']['summary'],
+            "total_distance": {"value": eco_dist['meters'], "text": eco_dist['text']},
+            "total_duration": {"value": eco_dist['duration_sec'], "text": eco_dist['duration_text']},
+            "summary": eco_dist['summary'],
             "vehicle_type": vehicle_type,
             "green_credits_earned": eco_credits,
             "emissions": {
                 "co2_emissions_kg": eco_calc["emissions_kg"],
-                "eco_score": 8.7 if vehicle_type != "electric" else 9.8,
+                "eco_score": eco_scores[1],
                 "fuel_consumption_liters": eco_calc["consumption"]
             },
             "fuel_analysis": eco_calc,
@@ -677,7 +878,7 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
                     "strategy_focus": "Environmental impact minimization",
                     "optimization_factors": ["local_roads", "fuel_efficiency", "emissions_reduction"],
                     "route_characteristics": [
-                        f"Lowest {vehicle_data['unit']} consumption" if vehicle_type != "electric" else "Lowest kWh consumption",
+                        vehicle_text["eco_characteristic"],
                         "Eco-friendly driving", 
                         "No highway tolls"
                     ]
@@ -687,14 +888,14 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
         "balanced": {
             "type": "balanced",
             "color": "#000080",  # Dark Blue
-            "total_distance": {"value": routes_distances['balanced']['meters'], "text": routes_distances['balanced']['text']},
-            "total_duration": {"value": routes_distances['balanced']['duration_sec'], "text": routes_distances['balanced']['duration_text']},
-            "summary": routes_distances['balanced']['summary'],
+            "total_distance": {"value": balanced_dist['meters'], "text": balanced_dist['text']},
+            "total_duration": {"value": balanced_dist['duration_sec'], "text": balanced_dist['duration_text']},
+            "summary": balanced_dist['summary'],
             "vehicle_type": vehicle_type,
             "green_credits_earned": balanced_credits,
             "emissions": {
                 "co2_emissions_kg": balanced_calc["emissions_kg"],
-                "eco_score": 7.5 if vehicle_type != "electric" else 9.5,
+                "eco_score": eco_scores[2],
                 "fuel_consumption_liters": balanced_calc["consumption"]
             },
             "fuel_analysis": balanced_calc,
@@ -703,7 +904,7 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
                     "strategy_focus": "Multi-criteria optimization",
                     "optimization_factors": ["time_balance", "eco_balance", "cost_efficiency"],
                     "route_characteristics": [
-                        f"Moderate {vehicle_data['unit']} consumption" if vehicle_type != "electric" else "Moderate kWh consumption",
+                        vehicle_text["balanced_characteristic"],
                         "Balanced time-cost ratio", 
                         "Selected highways only"
                     ]
@@ -717,110 +918,62 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
     eco_cost = eco_calc["cost"]
     balanced_cost = balanced_calc["cost"]
     
+    # Pairwise savings for all strategies at once: entry [a, b] compares route a
+    # against route b; percentages are relative to the earlier route in
+    # STRATEGY_ORDER (the fastest route, or eco vs balanced)
+    calcs = (fastest_calc, eco_calc, balanced_calc)
+    costs = np.array([calc["cost"] for calc in calcs])
+    consumption = np.array([calc["consumption"] for calc in calcs])
+    cost_diff = costs[None, :] - costs[:, None]
+    fuel_diff = consumption[None, :] - consumption[:, None]
+    order = np.arange(len(calcs))
+    base_costs = costs[np.minimum.outer(order, order)]
+    percentages = np.where(base_costs > 0, cost_diff / np.where(base_costs > 0, base_costs, 1) * 100, 0)
+    # Rounded with round() like calc_three: np.round can land a cent off the scalar figures
+    cost_diff = [[round(diff, 2) for diff in row] for row in cost_diff.tolist()]
+    fuel_diff = [[round(diff, 2) for diff in row] for row in fuel_diff.tolist()]
+    percentages = [
+        [f"{pct:.1f}%" if has_base else "0%" for pct, has_base in zip(row, has_base_row)]
+        for row, has_base_row in zip(percentages.tolist(), (base_costs > 0).tolist())
+    ]
+    
     # Route comparison summary with vehicle-specific analysis using ACTUAL route distances
-    route_comparison = {
-        "fastest": {
-            "distance_km": routes_distances['fastest']['km'],
-            "duration_minutes": routes_distances['fastest']['duration_sec'] // 60,
-            "co2_emissions_kg": fastest_calc["emissions_kg"],
-            "eco_score": routes["fastest"]["emissions"]["eco_score"],
-            "fuel_cost_inr": fastest_cost,
-            "fuel_efficiency": fastest_calc["efficiency"],
-            "savings_vs_fastest": {"cost": 0, "fuel": 0, "percentage": "0%"},
-            "savings_vs_eco": {
-                "cost": round(eco_cost - fastest_cost, 2),
-                "fuel": round(eco_calc["consumption"] - fastest_calc["consumption"], 2),
-                "percentage": f"{round(((eco_cost - fastest_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
-            },
-            "savings_vs_balanced": {
-                "cost": round(balanced_cost - fastest_cost, 2),
-                "fuel": round(balanced_calc["consumption"] - fastest_calc["consumption"], 2),
-                "percentage": f"{round(((balanced_cost - fastest_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
-            }
-        },
-        "eco_friendly": {
-            "distance_km": routes_distances['eco_friendly']['km'],
-            "duration_minutes": routes_distances['eco_friendly']['duration_sec'] // 60, 
-            "co2_emissions_kg": eco_calc["emissions_kg"],
-            "eco_score": routes["eco_friendly"]["emissions"]["eco_score"],
-            "fuel_cost_inr": eco_cost,
-            "fuel_efficiency": eco_calc["efficiency"],
-            "savings_vs_fastest": {
-                "cost": round(fastest_cost - eco_cost, 2),
-                "fuel": round(fastest_calc["consumption"] - eco_calc["consumption"], 2),
-                "percentage": f"{round(((fastest_cost - eco_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
-            },
-            "savings_vs_eco": {"cost": 0, "fuel": 0, "percentage": "0%"},
-            "savings_vs_balanced": {
-                "cost": round(balanced_cost - eco_cost, 2),
-                "fuel": round(balanced_calc["consumption"] - eco_calc["consumption"], 2),
-                "percentage": f"{round(((balanced_cost - eco_cost) / eco_cost) * 100, 1)}%" if eco_cost > 0 else "0%"
-            }
-        },
-        "balanced": {
-            "distance_km": routes_distances['balanced']['km'],
-            "duration_minutes": routes_distances['balanced']['duration_sec'] // 60,
-            "co2_emissions_kg": balanced_calc["emissions_kg"],
-            "eco_score": routes["balanced"]["emissions"]["eco_score"],
-            "fuel_cost_inr": balanced_cost,
-            "fuel_efficiency": balanced_calc["efficiency"],
-            "savings_vs_fastest": {
-                "cost": round(fastest_cost - balanced_cost, 2),
-                "fuel": round(fastest_calc["consumption"] - balanced_calc["consumption"], 2),
-                "percentage": f"{round(((fastest_cost - balanced_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
-            },
-            "savings_vs_eco": {
-                "cost": round(eco_cost - balanced_cost, 2),
-                "fuel": round(eco_calc["consumption"] - balanced_calc["consumption"], 2),
-                "percentage": f"{round(((eco_cost - balanced_cost) / eco_cost) * 100, 1)}%" if eco_cost > 0 else "0%"
-            },
-            "savings_vs_balanced": {"cost": 0, "fuel": 0, "percentage": "0%"}
+    route_comparison = {}
+    for a, strategy in enumerate(STRATEGY_ORDER):
+        calc = calcs[a]
+        comparison = {
+            "distance_km": distances[a]['km'],
+            "duration_minutes": distances[a]['duration_sec'] // 60,
+            "co2_emissions_kg": calc["emissions_kg"],
+            "eco_score": eco_scores[a],
+            "fuel_cost_inr": calc["cost"],
+            "fuel_efficiency": calc["efficiency"]
         }
-    }
-    
-    # Generate vehicle-specific optimization suggestions
-    fastest_vs_eco_savings = round(fastest_cost - eco_cost, 2)
-    fastest_vs_balanced_savings = round(fastest_cost - balanced_cost, 2)
+        for b, savings_key in enumerate(SAVINGS_KEYS):
+            if a == b:
+                comparison[savings_key] = {"cost": 0, "fuel": 0, "percentage": "0%"}
+            else:
+                comparison[savings_key] = {
+                    "cost": cost_diff[a][b],
+                    "fuel": fuel_diff[a][b],
+                    "percentage": percentages[a][b]
+                }
+        route_comparison[strategy] = comparison
     
-    suggestions = [
-        {
-            "title": f"🌱 Choose Eco-Friendly Route for Maximum {vehicle_data['display_name']} Savings",
-            "message": f"Eco-friendly route saves ₹{fastest_vs_eco_savings} in {vehicle_type} costs compared to fastest route",
-            "impact": "high",
-            "savings_minutes": -20,
-            "fuel_savings_inr": fastest_vs_eco_savings,
-            "fuel_savings_amount": round(fastest_calc["consumption"] - eco_calc["consumption"], 2),
-            "co2_savings_kg": round(fastest_calc["emissions_kg"] - eco_calc["emissions_kg"], 2),
-            "route_color": "#006400",
-            "details": f"Save {round(fastest_calc['consumption'] - eco_calc['consumption'], 2)}{vehicle_data['unit']} • {round(((fastest_vs_eco_savings/fastest_cost)*100), 1) if fastest_cost > 0 else 0}% cost reduction",
-            "vehicle_specific": f"Optimized for {vehicle_data['display_name']} efficiency"
-        },
-        {
-            "title": f"⚖️ Balanced Route for Optimal {vehicle_data['display_name']} Cost-Time Trade-off", 
-            "message": f"Balanced route saves ₹{fastest_vs_balanced_savings} with only 7 minutes extra time",
-            "impact": "medium",
-            "savings_minutes": -7,
-            "fuel_savings_inr": fastest_vs_balanced_savings,
-            "fuel_savings_amount": round(fastest_calc["consumption"] - balanced_calc["consumption"], 2),
-            "co2_savings_kg": round(fastest_calc["emissions_kg"] - balanced_calc["emissions_kg"], 2),
-            "route_color": "#000080",
-            "details": f"Save {round(fastest_calc['consumption'] - balanced_calc['consumption'], 2)}{vehicle_data['unit']} • Best time-cost balance",
-            "vehicle_specific": f"Ideal compromise for {vehicle_data['display_name']} users"
-        },
-        {
-            "title": f"🚀 Fastest Route - Premium {vehicle_data['display_name']} Speed Choice",
-            "message": f"Fastest route costs ₹{round(fastest_cost - eco_cost, 2)} extra but saves 20 minutes",
-            "impact": "low",
-            "savings_minutes": 20,
-            "fuel_cost_extra": round(fastest_cost - eco_cost, 2),
-            "fuel_extra_amount": round(fastest_calc["consumption"] - eco_calc["consumption"], 2),
-            "route_color": "#FF6B00", 
-            "details": f"Extra {round(fastest_calc['consumption'] - eco_calc['consumption'], 2)}{vehicle_data['unit']} • Premium for time-sensitive travel",
-            "vehicle_specific": f"Highway optimized for {vehicle_data['display_name']}"
-        }
-    ]
+    # Savings vs the fastest route, computed and rounded once for the suggestions and the summary
+    eco_cost_diff = fastest_cost - eco_cost
+    balanced_cost_diff = fastest_cost - balanced_cost
+    eco_cost_saved = round(eco_cost_diff, 2)
+    balanced_cost_saved = round(balanced_cost_diff, 2)
+    eco_amount_saved = round(fastest_calc["consumption"] - eco_calc["consumption"], 2)
+    balanced_amount_saved = round(fastest_calc["consumption"] - balanced_calc["consumption"], 2)
     
-    processing_time = round((time.time() - processing_start) * 1000, 1)
+    # Generate vehicle-specific optimization suggestions
+    suggestions = build_suggestions(
+        vehicle_type, fastest_calc, eco_calc, balanced_calc,
+        eco_cost_saved, balanced_cost_saved, eco_amount_saved, balanced_amount_saved,
+        eco_co2_saved, balanced_co2_saved
+    )
     
     # Comprehensive vehicle-specific fuel cost summary
     fuel_cost_summary = {
@@ -828,8 +981,8 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
             "type": vehicle_type,
             "display_name": vehicle_data["display_name"],
             "unit": vehicle_data["unit"],
-            "price_per_unit": vehicle_data.get("price_per_liter", vehicle_data.get("price_per_kg", vehicle_data.get("price_per_kwh"))),
-            "base_efficiency": f"{vehicle_data['efficiency_base']} km/{vehicle_data['unit']}"
+            "price_per_unit": vehicle_data["price_per_unit"],
+            "base_efficiency": vehicle_text["base_efficiency"]
         },
         "routes_analysis": {
             "fastest_route": {
@@ -856,22 +1009,22 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
         },
         "savings_comparison": {
             "eco_vs_fastest": {
-                "amount_saved": round(fastest_calc["consumption"] - eco_calc["consumption"], 2),
-                "cost_saved_inr": round(fastest_cost - eco_cost, 2),
-                "percentage_saved": f"{round(((fastest_cost - eco_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
+                "amount_saved": eco_amount_saved,
+                "cost_saved_inr": eco_cost_saved,
+                "percentage_saved": _pct(eco_cost_diff, fastest_cost)
             },
             "balanced_vs_fastest": {
-                "amount_saved": round(fastest_calc["consumption"] - balanced_calc["consumption"], 2),
-                "cost_saved_inr": round(fastest_cost - balanced_cost, 2),
-                "percentage_saved": f"{round(((fastest_cost - balanced_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
+                "amount_saved": balanced_amount_saved,
+                "cost_saved_inr": balanced_cost_saved,
+                "percentage_saved": _pct(balanced_cost_diff, fastest_cost)
             }
         },
         "monthly_projections": {
             "trips_per_month": 20,
-            "eco_monthly_savings": round((fastest_cost - eco_cost) * 20, 2),
-            "balanced_monthly_savings": round((fastest_cost - balanced_cost) * 20, 2),
-            "annual_potential_eco": round((fastest_cost - eco_cost) * 240, 2),  # 20 trips * 12 months
-            "annual_potential_balanced": round((fastest_cost - balanced_cost) * 240, 2)
+            "eco_monthly_savings": round(eco_cost_diff * 20, 2),
+            "balanced_monthly_savings": round(balanced_cost_diff * 20, 2),
+            "annual_potential_eco": round(eco_cost_diff * 240, 2),  # 20 trips * 12 months
+            "annual_potential_balanced": round(balanced_cost_diff * 240, 2)
         },
         "recommendations": {
             "most_economical": "eco_friendly",
@@ -881,45 +1034,288 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
         }
     }
     
-    # AI recommendations are now loaded separately via /ai-recommendations endpoint
-    # This keeps the main response fast and non-blocking
-    
     return {
-        "request_id": request_id,
-        "processing_time_ms": processing_time,
         "routes": [routes["fastest"], routes["eco_friendly"], routes["balanced"]],
         "route_comparison": route_comparison,
         "fuel_cost_summary": fuel_cost_summary,
         "optimization_suggestions": suggestions,
-        "data_source": data_source,  # Indicates if using real Google Maps or mock data
-        "metadata": {
-            "origin": request.origin,
-            "destination": request.destination,
-            "travel_mode": request.travel_mode,
-            "vehicle_type": vehicle_type,
-            "vehicle_display": vehicle_data["display_name"],
-            "timestamp": time.time(),
-            "pricing_source": f"Current Indian market rates for {vehicle_data['display_name']}",
-            "google_maps_enabled": USE_REAL_GMAPS
+        "data_source": data_source  # Indicates if using real Google Maps or mock data
+    }
+
+# Mock responses differ per request only in ids, timestamps and route summaries,
+# so the body is built once per vehicle type and patched on each request
+MOCK_RESPONSE_TEMPLATES = {
+    vehicle_type: build_three_strategies_body(
+        vehicle_type,
+        MOCK_ROUTES_DISTANCES,
+        calcs["fastest"],
+        calcs["eco_friendly"],
+        calcs["balanced"],
+        "mock_data"
+    )
+    for vehicle_type, calcs in PRECOMPUTED_MOCK_CALCS.items()
+}
+
+# Three-route strategies endpoint
+# Directions 'avoid' restrictions per strategy, used when alternatives can't be classified
+STRATEGY_AVOID_PARAMS = {
+    'fastest': {},  # No restrictions
+    'eco_friendly': {'avoid': 'highways|tolls'},  # Avoid highways and tolls
+    'balanced': {'avoid': 'tolls'}  # Avoid only tolls
+}
+
+def _route_distance_fields(route: Dict[str, Any], summary_fallback: str) -> Dict[str, Any]:
+    """Distance/duration fields of a Directions route in the shape build_three_strategies_body expects"""
+    leg = route['legs'][0]
+    distance_meters = leg['distance']['value']
+    return {
+        'km': distance_meters / 1000,
+        'meters': distance_meters,
+        'text': leg['distance']['text'],
+        'duration_sec': leg['duration']['value'],
+        'duration_text': leg['duration']['text'],
+        'summary': route.get('summary', summary_fallback)
+    }
+
+def _classify_alternatives(routes: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Pick the fastest, shortest (eco-friendly) and best normalized time+distance route"""
+    durations = np.array([route['legs'][0]['duration']['value'] for route in routes], dtype=np.float64)
+    distances = np.array([route['legs'][0]['distance']['value'] for route in routes], dtype=np.float64)
+    balanced_scores = durations / durations.max() + distances / distances.max()
+    return {
+        'fastest': routes[int(durations.argmin())],
+        'eco_friendly': routes[int(distances.argmin())],
+        'balanced': routes[int(balanced_scores.argmin())]
+    }
+
+async def fetch_real_routes_distances(origin_data: Dict[str, Any], destination_data: Dict[str, Any],
+                                      origin_info: str, dest_info: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Fetch the three strategy routes from Google Maps; None when any of them is unavailable.
+    
+    A single query with alternatives is classified into all three strategies when
+    Google returns more than one route; otherwise each strategy is queried with
+    its own avoid restrictions.
+    """
+    logger.info("🗺️ Fetching real routes from Google Maps API: %s → %s", origin_info, dest_info)
+    try:
+        session = app.state.http
+        base_params = {
+            'origin': parse_location(origin_data),
+            'destination': parse_location(destination_data),
+            'mode': 'driving',
+            'departure_time': 'now'
         }
+        
+        shared_result = await call_google_maps_api(session, 'directions/json', {**base_params, 'alternatives': 'true'})
+        if shared_result and shared_result.get('status') == 'OK' and len(shared_result.get('routes', [])) > 1:
+            logger.info("✅ Classified %d alternatives into all 3 strategies", len(shared_result['routes']))
+            return {
+                strategy_name: _route_distance_fields(route, f"{strategy_name} route")
+                for strategy_name, route in _classify_alternatives(shared_result['routes']).items()
+            }
+        
+        # The three strategies are independent, so fetch them concurrently
+        results = await asyncio.gather(
+            *(
+                call_google_maps_api(session, 'directions/json', {**base_params, 'alternatives': 'false', **STRATEGY_AVOID_PARAMS[strategy_name]})
+                for strategy_name in STRATEGY_ORDER
+            ),
+            return_exceptions=True
+        )
+        
+        route_data = {}
+        for strategy_name, gmaps_result in zip(STRATEGY_ORDER, results):
+            if isinstance(gmaps_result, Exception):
+                logger.error("  ❌ %s request failed: %s", strategy_name, gmaps_result)
+            elif gmaps_result and gmaps_result.get('status') == 'OK' and gmaps_result.get('routes'):
+                route_data[strategy_name] = _route_distance_fields(gmaps_result['routes'][0], f"{strategy_name} route")
+                logger.info("  ✅ %s: %.1f km, %d min", strategy_name, route_data[strategy_name]['km'], route_data[strategy_name]['duration_sec'] // 60)
+            else:
+                logger.warning("  ⚠️ No route found for %s strategy", strategy_name)
+        
+        if len(route_data) == 3:
+            logger.info("✅ Successfully fetched all 3 real routes from Google Maps")
+            return route_data
+        logger.warning("⚠️ Only got %d/3 routes, falling back to mock data", len(route_data))
+            
+    except Exception as e:
+        logger.error("❌ Error fetching Google Maps data: %s", e)
+        logger.info("ℹ️ Falling back to mock data")
+    return None
+
+def three_strategies_body_for_vehicle(vehicle_type: str, routes_distances: Optional[Dict[str, Dict[str, Any]]],
+                                      origin_info: str, dest_info: str) -> Dict[str, Any]:
+    """Response body for one vehicle, from real route data or the precomputed mock template"""
+    if routes_distances:
+        # Adjust efficiency factors based on route type
+        fastest_calc, eco_calc, balanced_calc = calc_three(
+            np.array([routes_distances[strategy]['km'] for strategy in STRATEGY_ORDER]), vehicle_type
+        )
+        return build_three_strategies_body(
+            vehicle_type, routes_distances, fastest_calc, eco_calc, balanced_calc, "google_maps_api"
+        )
+    
+    template = MOCK_RESPONSE_TEMPLATES[vehicle_type]
+    return {
+        **template,
+        "routes": [
+            {**route, "summary": route["summary"].format(origin=origin_info, destination=dest_info)}
+            for route in template["routes"]
+        ]
+    }
+
+# Real-route response bodies per (origin, destination, travel_mode, vehicle_type); they
+# live as long as the Google Maps responses they are built from. Mock bodies are
+# already precomputed in MOCK_RESPONSE_TEMPLATES and are never stored here.
+_three_strategies_cache = TTLCache(maxsize=1024, ttl=GMAPS_CACHE_TTL_SECONDS)
+_three_strategies_inflight_locks: Dict[str, asyncio.Lock] = {}
+_three_strategies_inflight_waiters: Dict[str, int] = {}
+
+def _three_strategies_cache_key(request: BaseModel, vehicle_type: str) -> str:
+    key = (request.origin, request.destination, request.travel_mode, vehicle_type)
+    return hashlib.blake2b(orjson.dumps(key, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+async def real_three_strategies_body(request: BaseModel, vehicle_type: str, origin_info: str,
+                                     dest_info: str) -> Optional[Dict[str, Any]]:
+    """Cached real-route body; identical in-flight requests share one build. None if Google Maps fails"""
+    cache_key = _three_strategies_cache_key(request, vehicle_type)
+    cached = _three_strategies_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    lock = _three_strategies_inflight_locks.setdefault(cache_key, asyncio.Lock())
+    _three_strategies_inflight_waiters[cache_key] = _three_strategies_inflight_waiters.get(cache_key, 0) + 1
+    try:
+        async with lock:
+            # Another request may have built the body while we waited
+            cached = _three_strategies_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            routes_distances = await fetch_real_routes_distances(request.origin, request.destination, origin_info, dest_info)
+            if not routes_distances:
+                return None
+            body = three_strategies_body_for_vehicle(vehicle_type, routes_distances, origin_info, dest_info)
+            _three_strategies_cache[cache_key] = body
+            return body
+    finally:
+        # Waiter-counted cleanup, as in call_google_maps_api
+        _three_strategies_inflight_waiters[cache_key] -= 1
+        if not _three_strategies_inflight_waiters[cache_key]:
+            del _three_strategies_inflight_waiters[cache_key], _three_strategies_inflight_locks[cache_key]
+
+def three_strategies_metadata(request: BaseModel, vehicle_type: str, timestamp: float) -> Dict[str, Any]:
+    """Request echo and pricing metadata attached to each three-strategies result"""
+    return {
+        "origin": request.origin,
+        "destination": request.destination,
+        "travel_mode": request.travel_mode,
+        "vehicle_type": vehicle_type,
+        "vehicle_display": VEHICLE_COSTS[vehicle_type]["display_name"],
+        "timestamp": timestamp,
+        "pricing_source": PER_VEHICLE_TEXT[vehicle_type]["pricing_source"],
+        "google_maps_enabled": USE_REAL_GMAPS
     }
 
+@app.post("/api/v1/routes/three-strategies")
+async def get_three_route_strategies(request: ThreeStrategiesRequest):
+    """Generate three different route strategies with vehicle-specific optimization suggestions"""
+    
+    request_id = secrets.token_hex(4)
+    processing_start = time.perf_counter()
+    
+    # Extract request info
+    origin_info = request.origin.get('address', 'Unknown Origin')
+    dest_info = request.destination.get('address', 'Unknown Destination')
+    vehicle_type = request.vehicle_type or "petrol"
+    
+    # Validate vehicle type
+    if vehicle_type not in SUPPORTED_VEHICLE_TYPES:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Unsupported vehicle type: {vehicle_type}. Supported: {SUPPORTED_VEHICLES_TEXT}"
+        )
+    
+    # Try to get real Google Maps data if API key is configured; repeat requests reuse the built body
+    body = None
+    if USE_REAL_GMAPS:
+        body = await real_three_strategies_body(request, vehicle_type, origin_info, dest_info)
+    
+    if body is None:
+        if SIMULATE_LATENCY:
+            await asyncio.sleep(0.2)  # Simulate processing
+        body = three_strategies_body_for_vehicle(vehicle_type, None, origin_info, dest_info)
+    
+    # AI recommendations are now loaded separately via /ai-recommendations endpoint
+    # This keeps the main response fast and non-blocking
+    
+    processing_time = round((time.perf_counter() - processing_start) * 1000, 1)
+    
+    return json_response({
+        "request_id": request_id,
+        "processing_time_ms": processing_time,
+        **body,
+        "metadata": three_strategies_metadata(request, vehicle_type, time.time())
+    }, headers=NO_STORE_HEADERS)
+
+@app.post("/api/v1/routes/three-strategies/batch")
+async def get_three_route_strategies_batch(request: BatchThreeStrategiesRequest):
+    """Three route strategies for several vehicle types in one response, keyed by vehicle type"""
+    
+    request_id = secrets.token_hex(4)
+    processing_start = time.perf_counter()
+    
+    origin_info = request.origin.get('address', 'Unknown Origin')
+    dest_info = request.destination.get('address', 'Unknown Destination')
+    
+    unsupported = [vehicle_type for vehicle_type in request.vehicle_types if vehicle_type not in SUPPORTED_VEHICLE_TYPES]
+    if unsupported:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported vehicle types: {unsupported}. Supported: {SUPPORTED_VEHICLES_TEXT}"
+        )
+    
+    # Routes don't depend on the vehicle, so Google Maps is queried once for the whole batch
+    routes_distances = None
+    if USE_REAL_GMAPS:
+        routes_distances = await fetch_real_routes_distances(request.origin, request.destination, origin_info, dest_info)
+    
+    if not routes_distances and SIMULATE_LATENCY:
+        await asyncio.sleep(0.2)  # Simulate processing
+    
+    # One timestamp for the whole batch
+    now = time.time()
+    results = {}
+    for vehicle_type in dict.fromkeys(request.vehicle_types):
+        body = three_strategies_body_for_vehicle(vehicle_type, routes_distances, origin_info, dest_info)
+        results[vehicle_type] = {**body, "metadata": three_strategies_metadata(request, vehicle_type, now)}
+    
+    return json_response({
+        "request_id": request_id,
+        "processing_time_ms": round((time.perf_counter() - processing_start) * 1000, 1),
+        "results": results
+    }, headers=NO_STORE_HEADERS)
+
 # Simple route calculation endpoint
 @app.post("/api/v1/routes/calculate")
 async def calculate_route(request: RouteRequest):
     """Basic route calculation endpoint"""
     
-    await asyncio.sleep(0.1)
+    if SIMULATE_LATENCY:
+        await asyncio.sleep(0.1)
     
-    return {
-        "request_id": str(uuid.uuid4())[:8],
+    return json_response({
+        "request_id": secrets.token_hex(4),
         "route": {
             "distance": {"value": 42000, "text": "42.0 km"},
             "duration": {"value": 4800, "text": "1 hour 20 mins"},
             "summary": f"Route from {request.origin} to {request.destination}",
         },
         "status": "success"
-    }
+    })
+
+# Route "type" values in three-strategies responses, mapped to the strategy keys the recommenders read
+ROUTE_TYPE_KEYS = {"fastest": "fastest", "eco-friendly": "eco_friendly", "balanced": "balanced"}
 
 # AI Recommendations endpoint (separate for async loading)
 @app.post("/api/v1/routes/ai-recommendations")
@@ -928,99 +1324,105 @@ async def get_ai_recommendations(request: AIRecommendationRequest):
     Generate AI-powered route recommendations asynchronously.
     This endpoint can be called separately to avoid blocking the main route response.
     """
+    # Convert routes list to dict format expected by the recommenders
+    routes_dict = {
+        ROUTE_TYPE_KEYS[route['type']]: route
+        for route in request.routes
+        if route.get('type') in ROUTE_TYPE_KEYS
+    }
+    
     try:
-        # Convert routes list to dict format expected by the function
-        routes_dict = {}
-        for route in request.routes:
-            route_type = route.get('type', '')
-            if route_type == 'fastest':
-                routes_dict['fastest'] = route
-            elif route_type == 'eco-friendly':
-                routes_dict['eco_friendly'] = route
-            elif route_type == 'balanced':
-                routes_dict['balanced'] = route
-        
         # Generate recommendations
         recommendations = await generate_llm_recommendations(routes_dict, request.vehicle_type)
         
-        return {
+        return json_response({
             "success": True,
             "recommendations": recommendations,
             "timestamp": time.time()
-        }
+        })
     except Exception as e:
         # Return error but don't fail - fall back to rule-based
-        print(f"AI recommendations error: {e}")
-        return {
+        logger.error("AI recommendations error: %s", e)
+        return json_response({
             "success": False,
             "error": str(e),
-            "recommendations": generate_rule_based_recommendations(
-                {route.get('type', ''): route for route in request.routes},
-                request.vehicle_type
-            ),
+            "recommendations": generate_rule_based_recommendations(routes_dict, request.vehicle_type),
             "timestamp": time.time()
+        })
+
+# Static payloads for /api/v1/vehicles and /, serialized once at import
+STATIC_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+_VEHICLES_PAYLOAD = orjson.dumps({
+    "supported_vehicles": {
+        vehicle_type: {
+            "display_name": data["display_name"],
+            "unit": data["unit"],
+            "base_efficiency": PER_VEHICLE_TEXT[vehicle_type]["base_efficiency"],
+            "fuel_cost_per_unit": data["price_per_unit"],
+            "emission_factor": PER_VEHICLE_TEXT[vehicle_type]["emission_factor"]
         }
+        for vehicle_type, data in VEHICLE_COSTS.items()
+    },
+    "recommended_defaults": {
+        "city_driving": "petrol",
+        "highway_driving": "diesel",
+        "environmental_focus": "electric",
+        "cost_effective": "cng",
+        "balanced_option": "hybrid_petrol"
+    }
+})
+
+_ROOT_PAYLOAD = orjson.dumps({
+    "message": "PragatiDhara Enhanced Backend API",
+    "version": "2.0.0",
+    "features": [
+        "Vehicle-specific fuel cost analysis",
+        "Multi-vehicle support (Petrol, Diesel, CNG, Electric, Hybrid)",
+        "Comprehensive savings calculations",
+        "Route optimization strategies",
+        "Environmental impact assessment"
+    ],
+    "endpoints": {
+        "health": "/health",
+        "vehicles": "/api/v1/vehicles",
+        "three_strategies": "/api/v1/routes/three-strategies",
+        "basic_route": "/api/v1/routes/calculate",
+        "documentation": "/docs"
+    },
+    "supported_vehicles": list(VEHICLE_COSTS.keys()),
+    "status": "running"
+})
 
 # Get available vehicle types
 @app.get("/api/v1/vehicles")
 async def get_vehicle_types():
     """Get all supported vehicle types with their specifications"""
-    return {
-        "supported_vehicles": {
-            vehicle_type: {
-                "display_name": data["display_name"],
-                "unit": data["unit"],
-                "base_efficiency": f"{data['efficiency_base']} km/{data['unit']}",
-                "fuel_cost_per_unit": data.get("price_per_liter", data.get("price_per_kg", data.get("price_per_kwh"))),
-                "emission_factor": f"{data['emission_factor']} kg CO₂/{data['unit']}"
-            }
-            for vehicle_type, data in VEHICLE_COSTS.items()
-        },
-        "recommended_defaults": {
-            "city_driving": "petrol",
-            "highway_driving": "diesel",
-            "environmental_focus": "electric",
-            "cost_effective": "cng",
-            "balanced_option": "hybrid_petrol"
-        }
-    }
+    return Response(content=_VEHICLES_PAYLOAD, media_type="application/json", headers=STATIC_CACHE_HEADERS)
 
 # Root endpoint
 @app.get("/")
 async def root():
-    return {
-        "message": "PragatiDhara Enhanced Backend API",
-        "version": "2.0.0",
-        "features": [
-            "Vehicle-specific fuel cost analysis",
-            "Multi-vehicle support (Petrol, Diesel, CNG, Electric, Hybrid)",
-            "Comprehensive savings calculations",
-            "Route optimization strategies",
-            "Environmental impact assessment"
-        ],
-        "endpoints": {
-            "health": "/health",
-            "vehicles": "/api/v1/vehicles",
-            "three_strategies": "/api/v1/routes/three-strategies",
-            "basic_route": "/api/v1/routes/calculate",
-            "documentation": "/docs"
-        },
-        "supported_vehicles": list(VEHICLE_COSTS.keys()),
-        "status": "running"
-    }
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json", headers=STATIC_CACHE_HEADERS)
 
 if __name__ == "__main__":
-    import uvicorn
-if __name__ == "__main__":
-    print("🚀 Starting PragatiDhara Enhanced Backend...")
-    print("📍 Server will be available at: http://127.0.0.1:8001")
-    print("📚 API Documentation: http://127.0.0.1:8001/docs")
-    print("🚗 Supported Vehicles:", ", ".join(VEHICLE_COSTS.keys()))
+    logger.info("🚀 Starting PragatiDhara Enhanced Backend...")
+    logger.info("📍 Server will be available at: http://127.0.0.1:8001")
+    logger.info("📚 API Documentation: http://127.0.0.1:8001/docs")
+    logger.info("🚗 Supported Vehicles: %s", ", ".join(VEHICLE_COSTS))
     
+    # --dev restores the auto-reloading single-process server
+    dev_mode = "--dev" in sys.argv
+
     uvicorn.run(
         "enhanced_server:app",
         host="127.0.0.1",
         port=8001,
-        reload=True,
-        log_level="info"
+        loop="auto",  # uvloop when installed (not available on Windows)
+        http="auto",  # httptools when installed
+        workers=1 if dev_mode else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        reload=dev_mode,
+        limit_concurrency=1000,  # answer 503 instead of queueing unbounded in-flight requests
+        backlog=2048,
+        timeout_keep_alive=5,
+        log_level="info" if dev_mode else "warning"
     )
\ No newline at end of file
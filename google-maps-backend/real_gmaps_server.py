@@ -5,24 +5,44 @@ This replaces the mock simple_server.py with actual Google Maps API calls
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import os
+import sys
 import time
-import uuid
+import random
+import secrets
 import asyncio
 import aiohttp
+import orjson
 import logging
+import hashlib
+from contextlib import asynccontextmanager
 from datetime import datetime
+from cachetools import TTLCache
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one pooled HTTP session across requests so Google Maps connections are reused"""
+    app.state.http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=50, ttl_dns_cache=300, keepalive_timeout=75),
+        timeout=aiohttp.ClientTimeout(total=10, connect=3),
+        json_serialize=lambda obj: orjson.dumps(obj).decode()
+    )
+    yield
+    await app.state.http.close()
+
 app = FastAPI(
     title="PragatiDhara Google Maps Backend",
     description="Real Google Maps Routes API integration for sustainable route optimization",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for React frontend
@@ -34,12 +54,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Route payloads (polylines, addresses) compress well; small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
 # Configuration
 GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY', 'YOUR_API_KEY_HERE')
 MAPS_BASE_URL = "https://maps.googleapis.com/maps/api"
 
 # Setup logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # Request models
@@ -55,23 +78,94 @@ class ThreeStrategiesRequest(BaseModel):
     travel_mode: Optional[str] = "driving"
     departure_time: Optional[str] = None
 
+# Google Maps responses by request fingerprint, so repeat corridors skip the network
+GMAPS_CACHE_TTL_SECONDS = 300
+_gmaps_cache = TTLCache(maxsize=4096, ttl=GMAPS_CACHE_TTL_SECONDS)
+_gmaps_inflight_locks: Dict[str, asyncio.Lock] = {}
+_gmaps_inflight_waiters: Dict[str, int] = {}  # holders plus queued waiters per lock
+
+# Cap on in-flight Google Maps requests per worker, so bursts queue here instead of tripping the QPS quota
+_gmaps_semaphore = asyncio.Semaphore(int(os.getenv('GMAPS_MAX_CONCURRENCY', '25')))
+
+# Rate-limit and transient server errors are retried with jittered exponential backoff
+GMAPS_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+GMAPS_MAX_ATTEMPTS = 4
+GMAPS_MAX_RETRY_DELAY_SECONDS = 8.0
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to wait before the next attempt, honouring a numeric Retry-After header"""
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = 2 ** attempt + random.random()
+    return min(delay, GMAPS_MAX_RETRY_DELAY_SECONDS)
+
+def _gmaps_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    return hashlib.blake2b(f"{endpoint}|{sorted(params.items())}".encode(), digest_size=16).hexdigest()
+
 # Helper functions
-async def call_google_maps_api(session: aiohttp.ClientSession, endpoint: str, params: Dict[str, Any]):
+async def _fetch_google_maps_api(session: aiohttp.ClientSession, endpoint: str, params: Dict[str, Any]):
     """Make async call to Google Maps API"""
-    params['key'] = GOOGLE_MAPS_API_KEY
+    params = {**params, 'key': GOOGLE_MAPS_API_KEY}
     
     try:
-        async with session.get(f"{MAPS_BASE_URL}/{endpoint}", params=params) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
+        for attempt in range(GMAPS_MAX_ATTEMPTS):
+            async with _gmaps_semaphore, session.get(f"{MAPS_BASE_URL}/{endpoint}", params=params) as response:
+                if response.status == 200:
+                    return orjson.loads(await response.read())
                 error_text = await response.text()
-                logger.error(f"Google Maps API error: {response.status} - {error_text}")
-                raise HTTPException(status_code=response.status, detail=f"Google Maps API error: {error_text}")
+                if response.status not in GMAPS_RETRY_STATUSES or attempt == GMAPS_MAX_ATTEMPTS - 1:
+                    logger.error("Google Maps API error: %s - %s", response.status, error_text)
+                    raise HTTPException(status_code=response.status, detail=f"Google Maps API error: {error_text}")
+                delay = _retry_delay(response.headers.get('Retry-After'), attempt)
+            
+            # Back off outside the semaphore so the slot serves other requests meanwhile
+            logger.warning("Google Maps API returned %s, retrying in %.1fs", response.status, delay)
+            await asyncio.sleep(delay)
     except aiohttp.ClientError as e:
-        logger.error(f"Network error calling Google Maps API: {e}")
+        logger.error("Network error calling Google Maps API: %s", e)
         raise HTTPException(status_code=503, detail=f"Network error: {str(e)}")
 
+async def call_google_maps_api(session: aiohttp.ClientSession, endpoint: str, params: Dict[str, Any]):
+    """Cached Google Maps call; concurrent identical requests share a single upstream fetch"""
+    cache_key = _gmaps_cache_key(endpoint, params)
+    cached = _gmaps_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    lock = _gmaps_inflight_locks.setdefault(cache_key, asyncio.Lock())
+    _gmaps_inflight_waiters[cache_key] = _gmaps_inflight_waiters.get(cache_key, 0) + 1
+    try:
+        async with lock:
+            # Another request may have filled the cache while we waited
+            cached = _gmaps_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            result = await _fetch_google_maps_api(session, endpoint, params)
+            if result and result.get('status') == 'OK':
+                _gmaps_cache[cache_key] = result
+            return result
+    finally:
+        # Drop the lock only once nobody holds or waits on it; a released lock
+        # reads as unlocked before its queued waiters have woken up
+        _gmaps_inflight_waiters[cache_key] -= 1
+        if not _gmaps_inflight_waiters[cache_key]:
+            del _gmaps_inflight_waiters[cache_key], _gmaps_inflight_locks[cache_key]
+
+# Default locations based on node letters (Pune area)
+DEFAULT_LOCATIONS = {
+    'A': 'Katraj, Pune, Maharashtra, India',
+    'B': 'Swargate, Pune, Maharashtra, India', 
+    'C': 'Deccan Gymkhana, Pune, Maharashtra, India',
+    'D': 'Shivajinagar, Pune, Maharashtra, India',
+    'E': 'University Circle, Pune, Maharashtra, India',
+    'F': 'Kothrud Bypass, Pune, Maharashtra, India',
+    'G': 'Balewadi Stadium, Pune, Maharashtra, India',
+    'H': 'Baner, Pune, Maharashtra, India',
+    'I': 'Wakad, Pune, Maharashtra, India',
+    'J': 'Hinjawadi Phase 1, Pune, Maharashtra, India'
+}
+
 def parse_location(location_data: Dict[str, Any]) -> str:
     """Parse location data to address string"""
     if 'address' in location_data:
@@ -79,197 +173,204 @@ def parse_location(location_data: Dict[str, Any]) -> str:
     elif 'lat' in location_data and 'lng' in location_data:
         return f"{location_data['lat']},{location_data['lng']}"
     else:
-        # Default locations based on node letters (Pune area)
-        default_locations = {
-            'A': 'Katraj, Pune, Maharashtra, India',
-            'B': 'Swargate, Pune, Maharashtra, India', 
-            'C': 'Deccan Gymkhana, Pune, Maharashtra, India',
-            'D': 'Shivajinagar, Pune, Maharashtra, India',
-            'E': 'University Circle, Pune, Maharashtra, India',
-            'F': 'Kothrud Bypass, Pune, Maharashtra, India',
-            'G': 'Balewadi Stadium, Pune, Maharashtra, India',
-            'H': 'Baner, Pune, Maharashtra, India',
-            'I': 'Wakad, Pune, Maharashtra, India',
-            'J': 'Hinjawadi Phase 1, Pune, Maharashtra, India'
-        }
-        
-        node = location_data.get('node', 'A')
-        return default_locations.get(node, 'Pune, Maharashtra, India')
+        return DEFAULT_LOCATIONS.get(location_data.get('node', 'A'), 'Pune, Maharashtra, India')
+
+# Emissions factor (kg CO2 per km) for an average car, and route-specific multipliers
+BASE_EMISSION_FACTOR = 0.18
+EMISSION_MULTIPLIERS = {
+    'fastest': 1.2,      # Higher emissions due to highway/high-speed driving
+    'eco-friendly': 0.7,  # Lower emissions due to eco-driving
+    'balanced': 1.0       # Standard emissions
+}
+
+# Per route type: (kg CO2 per km, liters per km at 15 km/L, eco score). The eco score
+# (1-10 scale, higher is better) depends only on the emissions rate, so it is fixed per type.
+EMISSION_RATES = {
+    route_type: (
+        BASE_EMISSION_FACTOR * multiplier,
+        multiplier / 15.0,
+        round(max(1.0, 10.0 - BASE_EMISSION_FACTOR * multiplier * 50), 1)
+    )
+    for route_type, multiplier in EMISSION_MULTIPLIERS.items()
+}
 
 def calculate_emissions(distance_meters: int, route_type: str) -> Dict[str, float]:
     """Calculate CO2 emissions based on route type and distance"""
+    co2_per_km, fuel_per_km, eco_score = EMISSION_RATES.get(route_type, EMISSION_RATES['balanced'])
     distance_km = distance_meters / 1000.0
     
-    # Emissions factors (kg CO2 per km)
-    base_emission_factor = 0.18  # Average car emissions
-    
-    # Route-specific multipliers
-    emission_multipliers = {
-        'fastest': 1.2,      # Higher emissions due to highway/high-speed driving
-        'eco-friendly': 0.7,  # Lower emissions due to eco-driving
-        'balanced': 1.0       # Standard emissions
-    }
-    
-    multiplier = emission_multipliers.get(route_type, 1.0)
-    co2_emissions_kg = distance_km * base_emission_factor * multiplier
-    
-    # Fuel consumption (assuming 15 km/L efficiency)
-    fuel_consumption_liters = distance_km / 15.0 * multiplier
-    
-    # Eco score (1-10 scale, higher is better)
-    eco_score = max(1.0, 10.0 - (co2_emissions_kg / distance_km * 50))
-    
     return {
-        'co2_emissions_kg': round(co2_emissions_kg, 2),
-        'eco_score': round(eco_score, 1),
-        'fuel_consumption_liters': round(fuel_consumption_liters, 2)
+        'co2_emissions_kg': round(distance_km * co2_per_km, 2),
+        'eco_score': eco_score,
+        'fuel_consumption_liters': round(distance_km * fuel_per_km, 2)
     }
 
+# Three route strategies, in response order
+ROUTE_STRATEGIES = {
+    'fastest': {
+        'avoid': [],
+        'mode': 'driving',
+        'optimize_for': 'time'
+    },
+    'eco_friendly': {
+        'avoid': ['highways', 'tolls'],
+        'mode': 'driving', 
+        'optimize_for': 'fuel_efficiency'
+    },
+    'balanced': {
+        'avoid': ['tolls'],
+        'mode': 'driving',
+        'optimize_for': 'balance'
+    }
+}
+
+# Directions query parameters per strategy, built once; requests only add origin and destination
+STRATEGY_PARAMS = {
+    strategy_name: {
+        'mode': strategy_config['mode'],
+        'departure_time': 'now',
+        'traffic_model': 'best_guess',
+        'alternatives': 'false',  # only routes[0] is read; alternates multiply the payload
+        **({'avoid': '|'.join(strategy_config['avoid'])} if strategy_config['avoid'] else {})
+    }
+    for strategy_name, strategy_config in ROUTE_STRATEGIES.items()
+}
+
+async def fetch_strategy(session: aiohttp.ClientSession, strategy_name: str, strategy_config: Dict[str, Any],
+                         origin: str, destination: str,
+                         verbose: bool) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """(route data, route comparison entry) for one strategy. Fallback route data without a
+    comparison entry if the API call fails; (None, None) if Google finds no route."""
+    params = {'origin': origin, 'destination': destination, **STRATEGY_PARAMS[strategy_name]}
+    
+    try:
+        directions_data = await call_google_maps_api(session, 'directions/json', params)
+        
+        if directions_data['status'] == 'OK' and directions_data['routes']:
+            route = directions_data['routes'][0]  # Get best route
+            leg = route['legs'][0]  # Get first leg
+            
+            # Calculate emissions
+            distance_meters = leg['distance']['value']
+            duration_seconds = leg['duration']['value']
+            emissions = calculate_emissions(distance_meters, strategy_name)
+            
+            strategy_metadata = {
+                "strategy_focus": strategy_config.get('optimize_for', 'general'),
+                "optimization_factors": strategy_config.get('avoid', []),
+                "polyline": route.get('overview_polyline', {}).get('points', '')
+            }
+            route_data = {
+                "total_distance": leg['distance'],
+                "total_duration": leg['duration'],
+                "summary": route.get('summary', f"Route via {strategy_name} strategy"),
+                "emissions": emissions,
+                "strategy_info": {"strategy_metadata": strategy_metadata}
+            }
+            if verbose:
+                strategy_metadata["bounds"] = route.get('bounds', {})
+                strategy_metadata["warnings"] = route.get('warnings', [])
+                route_data["raw_google_data"] = {
+                    "distance_meters": distance_meters,
+                    "duration_seconds": duration_seconds,
+                    "start_address": leg['start_address'],
+                    "end_address": leg['end_address']
+                }
+            
+            comparison = {
+                "distance_km": round(distance_meters / 1000, 1),
+                "duration_minutes": round(duration_seconds / 60),
+                "co2_emissions_kg": emissions['co2_emissions_kg'],
+                "eco_score": emissions['eco_score']
+            }
+            return route_data, comparison
+        
+        logger.error("No routes found for %s: %s", strategy_name, directions_data)
+        return None, None
+            
+    except Exception as e:
+        logger.error("Error getting %s route: %s", strategy_name, e)
+        # Use fallback data for this strategy; it is left out of the route comparison
+        return await get_fallback_route_data(strategy_name, origin, destination), None
+
+def json_response(content: Dict[str, Any]) -> Response:
+    """Serialize a JSON-ready body with orjson, skipping FastAPI's jsonable_encoder walk"""
+    return Response(content=orjson.dumps(content), media_type="application/json")
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     api_key_status = "configured" if GOOGLE_MAPS_API_KEY != 'YOUR_API_KEY_HERE' else "not_configured"
     
-    return {
+    return json_response({
         "status": "healthy",
         "service": "pragati_dhara_google_maps_backend", 
         "version": "2.0.0",
         "api_key_status": api_key_status,
         "timestamp": time.time()
-    }
+    })
 
 # Three-route strategies endpoint with real Google Maps integration
 @app.post("/api/v1/routes/three-strategies")
-async def get_three_route_strategies(request: ThreeStrategiesRequest):
-    """Get three different route strategies using real Google Maps Directions API"""
+async def get_three_route_strategies(request: ThreeStrategiesRequest, verbose: bool = False):
+    """Get three different route strategies using real Google Maps Directions API.
+    Pass ?verbose=true to include the raw Google leg data, bounds and warnings."""
     
     if GOOGLE_MAPS_API_KEY == 'YOUR_API_KEY_HERE':
         # Fallback to mock data if API key not configured
         logger.warning("Google Maps API key not configured, using mock data")
-        return await get_mock_three_strategies(request)
+        return json_response(await get_mock_three_strategies(request))
     
     processing_start = time.time()
-    request_id = str(uuid.uuid4())[:8]
+    request_id = secrets.token_hex(4)
     
     # Parse origin and destination
     origin = parse_location(request.origin)
     destination = parse_location(request.destination)
     
-    logger.info(f"Calculating routes from {origin} to {destination}")
+    logger.info("Calculating routes from %s to %s", origin, destination)
     
-    async with aiohttp.ClientSession() as session:
-        routes = {}
-        
-        # Define three route strategies
-        strategies = {
-            'fastest': {
-                'avoid': [],
-                'mode': 'driving',
-                'optimize_for': 'time'
-            },
-            'eco_friendly': {
-                'avoid': ['highways', 'tolls'],
-                'mode': 'driving', 
-                'optimize_for': 'fuel_efficiency'
-            },
-            'balanced': {
-                'avoid': ['tolls'],
-                'mode': 'driving',
-                'optimize_for': 'balance'
-            }
-        }
-        
-        for strategy_name, strategy_config in strategies.items():
-            params = {
-                'origin': origin,
-                'destination': destination,
-                'mode': strategy_config['mode'],
-                'departure_time': 'now',
-                'traffic_model': 'best_guess',
-                'alternatives': 'true'
-            }
-            
-            # Add avoid parameters
-            if strategy_config['avoid']:
-                params['avoid'] = '|'.join(strategy_config['avoid'])
-            
-            try:
-                directions_data = await call_google_maps_api(session, 'directions/json', params)
-                
-                if directions_data['status'] == 'OK' and directions_data['routes']:
-                    route = directions_data['routes'][0]  # Get best route
-                    leg = route['legs'][0]  # Get first leg
-                    
-                    # Calculate emissions
-                    distance_meters = leg['distance']['value']
-                    emissions = calculate_emissions(distance_meters, strategy_name)
-                    
-                    routes[strategy_name] = {
-                        "total_distance": leg['distance'],
-                        "total_duration": leg['duration'],
-                        "summary": route.get('summary', f"Route via {strategy_name} strategy"),
-                        "emissions": emissions,
-                        "strategy_info": {
-                            "strategy_metadata": {
-                                "strategy_focus": strategy_config.get('optimize_for', 'general'),
-                                "optimization_factors": strategy_config.get('avoid', []),
-                                "polyline": route.get('overview_polyline', {}).get('points', ''),
-                                "bounds": route.get('bounds', {}),
-                                "warnings": route.get('warnings', [])
-                            }
-                        },
-                        "raw_google_data": {
-                            "distance_meters": distance_meters,
-                            "duration_seconds": leg['duration']['value'],
-                            "start_address": leg['start_address'],
-                            "end_address": leg['end_address']
-                        }
-                    }
-                else:
-                    logger.error(f"No routes found for {strategy_name}: {directions_data}")
-                    
-            except Exception as e:
-                logger.error(f"Error getting {strategy_name} route: {e}")
-                # Use fallback data for this strategy
-                routes[strategy_name] = await get_fallback_route_data(strategy_name, origin, destination)
-        
-        # If no routes found, use mock data
-        if not routes:
-            logger.warning("No routes found from Google Maps API, using mock data")
-            return await get_mock_three_strategies(request)
-        
-        # Generate route comparison
-        route_comparison = {}
-        for strategy_name, route_data in routes.items():
-            if 'raw_google_data' in route_data:
-                route_comparison[strategy_name] = {
-                    "distance_km": round(route_data['raw_google_data']['distance_meters'] / 1000, 1),
-                    "duration_minutes": round(route_data['raw_google_data']['duration_seconds'] / 60),
-                    "co2_emissions_kg": route_data['emissions']['co2_emissions_kg'],
-                    "eco_score": route_data['emissions']['eco_score']
-                }
-        
-        # Generate optimization suggestions
-        suggestions = generate_optimization_suggestions(route_comparison)
-        
-        processing_time = round((time.time() - processing_start) * 1000, 1)
-        
-        return {
-            "request_id": request_id,
-            "processing_time_ms": processing_time,
-            "routes": routes,
-            "route_comparison": route_comparison,
-            "optimization_suggestions": suggestions,
-            "api_status": "real_google_maps_api",
-            "metadata": {
-                "origin": request.origin,
-                "destination": request.destination,
-                "travel_mode": request.travel_mode,
-                "timestamp": time.time(),
-                "origin_address": origin,
-                "destination_address": destination
-            }
+    # The three strategies are independent, so query them concurrently over the pooled session
+    results = await asyncio.gather(
+        *(
+            fetch_strategy(app.state.http, strategy_name, strategy_config, origin, destination, verbose)
+            for strategy_name, strategy_config in ROUTE_STRATEGIES.items()
+        )
+    )
+    routes = {}
+    route_comparison = {}
+    for strategy_name, (route_data, comparison) in zip(ROUTE_STRATEGIES, results):
+        if route_data is not None:
+            routes[strategy_name] = route_data
+        if comparison is not None:
+            route_comparison[strategy_name] = comparison
+    
+    # If no routes found, use mock data
+    if not routes:
+        logger.warning("No routes found from Google Maps API, using mock data")
+        return json_response(await get_mock_three_strategies(request))
+    
+    # Generate optimization suggestions
+    suggestions = generate_optimization_suggestions(route_comparison)
+    
+    processing_time = round((time.time() - processing_start) * 1000, 1)
+    
+    return json_response({
+        "request_id": request_id,
+        "processing_time_ms": processing_time,
+        "routes": routes,
+        "route_comparison": route_comparison,
+        "optimization_suggestions": suggestions,
+        "api_status": "real_google_maps_api",
+        "metadata": {
+            "origin": request.origin,
+            "destination": request.destination,
+            "travel_mode": request.travel_mode,
+            "timestamp": time.time(),
+            "origin_address": origin,
+            "destination_address": destination
         }
+    })
 
 async def get_fallback_route_data(strategy_name: str, origin: str, destination: str):
     """Fallback route data when Google Maps API fails"""
@@ -303,71 +404,73 @@ async def get_fallback_route_data(strategy_name: str, origin: str, destination:
         }
     }
 
+# Mock routes returned when no API key is configured
+MOCK_ROUTES = {
+    "fastest": {
+        "total_distance": {"value": 45200, "text": "45.2 km"},
+        "total_duration": {"value": 5100, "text": "1 hour 25 mins"},
+        "summary": "Mock fastest route (API key needed for real data)",
+        "emissions": {"co2_emissions_kg": 8.4, "eco_score": 6.2, "fuel_consumption_liters": 3.6}
+    },
+    "eco_friendly": {
+        "total_distance": {"value": 52100, "text": "52.1 km"},
+        "total_duration": {"value": 6300, "text": "1 hour 45 mins"}, 
+        "summary": "Mock eco-friendly route (API key needed for real data)",
+        "emissions": {"co2_emissions_kg": 6.2, "eco_score": 8.7, "fuel_consumption_liters": 2.7}
+    },
+    "balanced": {
+        "total_distance": {"value": 48700, "text": "48.7 km"},
+        "total_duration": {"value": 5520, "text": "1 hour 32 mins"},
+        "summary": "Mock balanced route (API key needed for real data)", 
+        "emissions": {"co2_emissions_kg": 7.1, "eco_score": 7.5, "fuel_consumption_liters": 3.1}
+    }
+}
+
 async def get_mock_three_strategies(request: ThreeStrategiesRequest):
     """Fallback to mock data when API key not available"""
-    # Import the mock response from simple_server.py logic
-    from simple_server import app as mock_app
-    
-    # Simulate the mock response
-    await asyncio.sleep(0.1)
-    
     return {
-        "request_id": str(uuid.uuid4())[:8],
-        "processing_time_ms": 100,
+        "request_id": secrets.token_hex(4),
+        "processing_time_ms": 0,
         "api_status": "mock_fallback",
-        "routes": {
-            "fastest": {
-                "total_distance": {"value": 45200, "text": "45.2 km"},
-                "total_duration": {"value": 5100, "text": "1 hour 25 mins"},
-                "summary": "Mock fastest route (API key needed for real data)",
-                "emissions": {"co2_emissions_kg": 8.4, "eco_score": 6.2, "fuel_consumption_liters": 3.6}
-            },
-            "eco_friendly": {
-                "total_distance": {"value": 52100, "text": "52.1 km"},
-                "total_duration": {"value": 6300, "text": "1 hour 45 mins"}, 
-                "summary": "Mock eco-friendly route (API key needed for real data)",
-                "emissions": {"co2_emissions_kg": 6.2, "eco_score": 8.7, "fuel_consumption_liters": 2.7}
-            },
-            "balanced": {
-                "total_distance": {"value": 48700, "text": "48.7 km"},
-                "total_duration": {"value": 5520, "text": "1 hour 32 mins"},
-                "summary": "Mock balanced route (API key needed for real data)", 
-                "emissions": {"co2_emissions_kg": 7.1, "eco_score": 7.5, "fuel_consumption_liters": 3.1}
-            }
-        }
+        "routes": MOCK_ROUTES
     }
 
+# Suggestion appended to every response; never mutated, so one dict is shared across responses
+PUBLIC_TRANSPORT_SUGGESTION = {
+    "message": "Consider carpooling or public transport for even lower emissions",
+    "impact": "high",
+    "co2_savings_kg": 0,
+    "rationale": "Public transport can reduce emissions by 45-65%"
+}
+
 def generate_optimization_suggestions(route_comparison: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Generate optimization suggestions based on route comparison"""
-    suggestions = []
+    fastest = route_comparison.get('fastest')
+    eco = route_comparison.get('eco_friendly')
+    if not fastest or not eco:
+        return [PUBLIC_TRANSPORT_SUGGESTION]
     
-    if 'fastest' in route_comparison and 'eco_friendly' in route_comparison:
-        time_diff = route_comparison['eco_friendly']['duration_minutes'] - route_comparison['fastest']['duration_minutes']
-        co2_savings = route_comparison['fastest']['co2_emissions_kg'] - route_comparison['eco_friendly']['co2_emissions_kg']
-        
-        if co2_savings > 0:
-            suggestions.append({
-                "message": f"Eco-friendly route saves {co2_savings:.1f}kg CO₂ with only {time_diff} extra minutes",
-                "impact": "high" if co2_savings > 2 else "medium",
-                "co2_savings_kg": co2_savings,
-                "time_cost_minutes": time_diff
-            })
-    
-    suggestions.append({
-        "message": "Consider carpooling or public transport for even lower emissions",
-        "impact": "high",
-        "co2_savings_kg": 0,
-        "rationale": "Public transport can reduce emissions by 45-65%"
-    })
+    co2_savings = fastest['co2_emissions_kg'] - eco['co2_emissions_kg']
+    if co2_savings <= 0:
+        return [PUBLIC_TRANSPORT_SUGGESTION]
     
-    return suggestions
+    time_diff = eco['duration_minutes'] - fastest['duration_minutes']
+    return [
+        {
+            "message": f"Eco-friendly route saves {co2_savings:.1f}kg CO₂ with only {time_diff} extra minutes",
+            "impact": "high" if co2_savings > 2 else "medium",
+            "co2_savings_kg": co2_savings,
+            "time_cost_minutes": time_diff
+        },
+        PUBLIC_TRANSPORT_SUGGESTION
+    ]
 
 # Root endpoint
 @app.get("/")
 async def root():
     api_key_status = "✅ Configured" if GOOGLE_MAPS_API_KEY != 'YOUR_API_KEY_HERE' else "❌ Not configured"
     
-    return {
+    return json_response({
         "message": "PragatiDhara Google Maps Backend API",
         "version": "2.0.0",
         "api_key_status": api_key_status,
@@ -377,7 +480,7 @@ async def root():
             "documentation": "/docs"
         },
         "status": "running"
-    }
+    })
 
 if __name__ == "__main__":
     import uvicorn
@@ -394,10 +497,16 @@ if __name__ == "__main__":
         print("📖 See GOOGLE_MAPS_SETUP.md for setup instructions")
         print("🔄 Falling back to mock data for now...")
     
+    # --dev restores the auto-reloading single-process server
+    dev_mode = "--dev" in sys.argv
+    
     uvicorn.run(
         "real_gmaps_server:app",
         host="127.0.0.1",
         port=8001,
-        reload=True,
-        log_level="info"
+        loop="auto",  # uvloop when installed (not available on Windows)
+        http="auto",  # httptools when installed
+        workers=1 if dev_mode else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        reload=dev_mode,
+        log_level="info" if dev_mode else "warning"
     )
\ No newline at end of file
@@ -5,12 +5,18 @@ This is a minimal version to test the three-route strategy integration
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict
 from typing import Dict, Any, List, Optional
+from functools import lru_cache
+import os
+import sys
 import time
-import uuid
+import secrets
 import asyncio
 import random
+import re
+import orjson
 
 app = FastAPI(
     title="Google Maps Test Backend",
@@ -52,6 +58,76 @@ VEHICLE_COSTS = {
     }
 }
 
+# Price key for each fuel unit
+UNIT_PRICE_KEYS = {"L": "price_per_liter", "kg": "price_per_kg", "kWh": "price_per_kwh"}
+
+# Simulated routes, one row per strategy: (strategy, route type, color,
+# distance m, duration s, duration text, CO2 kg, eco score, fuel/energy use
+# in the vehicle's unit)
+MOCK_ROUTES = (
+    ("fastest", "fastest", "#FF6B00", 45200, 5100, "1 hour 25 mins", 8.4, 6.2, 3.6),  # Dark Orange
+    ("eco_friendly", "eco-friendly", "#006400", 52100, 6300, "1 hour 45 mins", 6.2, 8.7, 2.7),  # Dark Green
+    ("balanced", "balanced", "#000080", 48700, 5520, "1 hour 32 mins", 7.1, 7.5, 3.1)  # Dark Blue
+)
+STRATEGY_ORDER = tuple(route[0] for route in MOCK_ROUTES)
+SAVINGS_KEYS = ("savings_vs_fastest", "savings_vs_eco", "savings_vs_balanced")
+FASTEST, ECO, BALANCED = range(len(MOCK_ROUTES))
+
+STRATEGY_DETAILS = {
+    "fastest": {
+        "summary": "Via highways from {origin} to {destination}",
+        "strategy_metadata": {
+            "strategy_focus": "Speed optimization with highway preference",
+            "optimization_factors": ["highways", "tolls_allowed", "traffic_avoidance"],
+            "route_characteristics": ["High fuel consumption", "Fast travel time", "Highway tolls"]
+        }
+    },
+    "eco_friendly": {
+        "summary": "Via eco-routes from {origin} to {destination}",
+        "strategy_metadata": {
+            "strategy_focus": "Environmental impact minimization",
+            "optimization_factors": ["local_roads", "fuel_efficiency", "emissions_reduction"],
+            "route_characteristics": ["Lowest fuel consumption", "Eco-friendly driving", "No highway tolls"]
+        }
+    },
+    "balanced": {
+        "summary": "Optimized balance from {origin} to {destination}",
+        "strategy_metadata": {
+            "strategy_focus": "Multi-criteria optimization",
+            "optimization_factors": ["time_balance", "eco_balance", "cost_efficiency"],
+            "route_characteristics": ["Moderate fuel consumption", "Balanced time-cost ratio", "Selected highways"]
+        }
+    }
+}
+
+def _unit_price(vehicle_data: Dict[str, Any]) -> float:
+    return vehicle_data[UNIT_PRICE_KEYS[vehicle_data["unit"]]]
+
+def _fuel_analysis(consumption: float, distance_km: float, price: float) -> Dict[str, Any]:
+    return {
+        "fuel_consumption_liters": consumption,
+        "fuel_cost_inr": round(consumption * price, 2),
+        "fuel_efficiency_kmpl": round(distance_km / consumption, 1),
+        "cost_per_km": round((consumption * price) / distance_km, 2)
+    }
+
+# Per-vehicle fuel analysis of each simulated route, priced at the vehicle's own rate
+_FUEL_TABLE = {
+    vehicle_type: {
+        strategy: _fuel_analysis(consumption, meters / 1000, _unit_price(vehicle_data))
+        for strategy, _, _, meters, *_, consumption in MOCK_ROUTES
+    }
+    for vehicle_type, vehicle_data in VEHICLE_COSTS.items()
+}
+
+FUEL_PRICE_SOURCES = {
+    vehicle_type: f"Current Indian market rates (₹{_unit_price(vehicle_data):g}/{vehicle_data['unit']})"
+    for vehicle_type, vehicle_data in VEHICLE_COSTS.items()
+}
+
+# Optional artificial delay on the simulated endpoints for demo realism (off by default)
+SIMULATE_LATENCY = os.getenv('DEBUG_SIMULATE_LATENCY', 'false').lower() in ('1', 'true', 'yes')
+
 # CORS middleware for React frontend
 app.add_middleware(
     CORSMiddleware,
@@ -63,220 +139,109 @@ app.add_middleware(
 
 # Request models
 class RouteRequest(BaseModel):
-    origin: Dict[str, Any]
-    destination: Dict[str, Any]
+    model_config = ConfigDict(extra="ignore")
+
+    origin: dict
+    destination: dict
     travel_mode: Optional[str] = "driving"
     departure_time: Optional[str] = None
 
 class ThreeStrategiesRequest(BaseModel):
-    origin: Dict[str, Any]
-    destination: Dict[str, Any]
+    model_config = ConfigDict(extra="ignore")
+
+    origin: dict
+    destination: dict
     travel_mode: Optional[str] = "driving"
     departure_time: Optional[str] = None
     vehicle_type: Optional[str] = "petrol"  # petrol, diesel, cng, electric, hybrid_petrol
 
+def json_response(content: Dict[str, Any]) -> Response:
+    """Serialize a JSON-ready body with orjson, skipping FastAPI's jsonable_encoder walk"""
+    return Response(content=orjson.dumps(content), media_type="application/json")
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {
+    return json_response({
         "status": "healthy",
         "service": "google_maps_test_backend", 
         "version": "1.0.0",
         "timestamp": time.time()
-    }
+    })
 
-# Three-route strategies endpoint
-@app.post("/api/v1/routes/three-strategies")
-async def get_three_route_strategies(request: ThreeStrategiesRequest):
-    """Generate three different route strategies with optimization suggestions"""
-    
-    # Simulate processing time
-    await asyncio.sleep(0.2)  # 200ms simulated processing
-    
-    request_id = str(uuid.uuid4())[:8]
-    processing_start = time.time()
+NO_SAVINGS = {"cost": 0, "fuel_liters": 0, "percentage": "0%"}
+
+# Three-route strategies response body
+def build_three_strategies_body(vehicle_type: str) -> Dict[str, Any]:
+    """Routes, comparison, fuel summary and suggestions; route summaries are filled in per request"""
     
-    # Extract origin/destination info for simulation
-    origin_info = request.origin.get('address', 'Unknown Origin')
-    dest_info = request.destination.get('address', 'Unknown Destination')
-    vehicle_type = request.vehicle_type or "petrol"
+    fuel = _FUEL_TABLE[vehicle_type]
+    costs = [fuel[strategy]["fuel_cost_inr"] for strategy in STRATEGY_ORDER]
+    consumptions = [route[-1] for route in MOCK_ROUTES]
+    co2s = [route[6] for route in MOCK_ROUTES]
     
-    # Get vehicle-specific cost data
-    vehicle_data = VEHICLE_COSTS.get(vehicle_type, VEHICLE_COSTS["petrol"])
+    # Every pairwise difference, computed and rounded once: [i][j] is route j minus route i,
+    # with percentages relative to whichever of the two comes first in STRATEGY_ORDER
+    cost_deltas = [[round(other - cost, 2) for other in costs] for cost in costs]
+    fuel_deltas = [[round(other - consumption, 1) for other in consumptions] for consumption in consumptions]
+    co2_deltas = [[round(other - co2, 1) for other in co2s] for co2 in co2s]
+    pct_deltas = [
+        [
+            f"{round(((costs[j] - costs[i]) / costs[min(i, j)]) * 100, 1)}%" if costs[min(i, j)] > 0 else "0%"
+            for j in range(len(costs))
+        ]
+        for i in range(len(costs))
+    ]
     
-    def calculate_fuel_cost_and_consumption(distance_km: float, route_efficiency_factor: float):
-        """Calculate fuel/energy consumption and cost for specific route"""
-        base_efficiency = vehicle_data["efficiency_base"]
-        actual_efficiency = base_efficiency * route_efficiency_factor
-        
-        if vehicle_type == "electric":
-            energy_consumed = distance_km / actual_efficiency  # kWh
-            cost = energy_consumed * vehicle_data["price_per_kwh"]
-        elif vehicle_type == "cng":
-            fuel_consumed = distance_km / actual_efficiency  # kg
-            cost = fuel_consumed * vehicle_data["price_per_kg"]
-        else:  # petrol, diesel, hybrid_petrol
-            fuel_consumed = distance_km / actual_efficiency  # L
-            cost = fuel_consumed * vehicle_data["price_per_liter"]
+    # Routes, their comparison and their fuel analysis, one simulated route at a time
+    routes, route_comparison, routes_fuel_analysis = {}, {}, {}
+    for i, (strategy, route_type, color, meters, seconds, duration_text, co2, eco_score, consumption) in enumerate(MOCK_ROUTES):
+        analysis = fuel[strategy]
+        details = STRATEGY_DETAILS[strategy]
         
-        emissions = fuel_consumed * vehicle_data["emission_factor"]
-        
-        return {
-            "consumption": round(fuel_consumed, 2),
-            "cost": round(cost, 2),
-            "efficiency": round(actual_efficiency, 1),
-            "cost_per_km": round(cost / distance_km, 2),
-            "emissions_kg": round(emissions, 2)
-        }
-    
-    # Generate three distinct routes with realistic differences and detailed fuel analysis
-    routes = {
-        "fastest": {
-            "type": "fastest",
-            "color": "#FF6B00",  # Dark Orange
-            "total_distance": {"value": 45200, "text": "45.2 km"},
-            "total_duration": {"value": 5100, "text": "1 hour 25 mins"},
-            "summary": f"Via highways from {origin_info} to {dest_info}",
-            "emissions": {
-                "co2_emissions_kg": 8.4,
-                "eco_score": 6.2,
-                "fuel_consumption_liters": 3.6
-            },
-            "fuel_analysis": {
-                "fuel_consumption_liters": 3.6,
-                "fuel_cost_inr": round(3.6 * FUEL_PRICE_PER_LITER, 2),
-                "fuel_efficiency_kmpl": round(45.2 / 3.6, 1),
-                "cost_per_km": round((3.6 * FUEL_PRICE_PER_LITER) / 45.2, 2)
-            },
-            "strategy_info": {
-                "strategy_metadata": {
-                    "strategy_focus": "Speed optimization with highway preference",
-                    "optimization_factors": ["highways", "tolls_allowed", "traffic_avoidance"],
-                    "route_characteristics": ["High fuel consumption", "Fast travel time", "Highway tolls"]
-                }
-            }
-        },
-        "eco_friendly": {
-            "type": "eco-friendly", 
-            "color": "#006400",  # Dark Green
-            "total_distance": {"value": 52100, "text": "52.1 km"},
-            "total_duration": {"value": 6300, "text": "1 hour 45 mins"},
-            "summary": f"Via eco-routes from {origin_info} to {dest_info}",
+        routes[strategy] = {
+            "type": route_type,
+            "color": color,
+            "total_distance": {"value": meters, "text": f"{meters / 1000} km"},
+            "total_duration": {"value": seconds, "text": duration_text},
+            "summary": details["summary"],
             "emissions": {
-                "co2_emissions_kg": 6.2,
-                "eco_score": 8.7,
-                "fuel_consumption_liters": 2.7
+                "co2_emissions_kg": co2,
+                "eco_score": eco_score,
+                "fuel_consumption_liters": consumption
             },
-            "fuel_analysis": {
-                "fuel_consumption_liters": 2.7,
-                "fuel_cost_inr": round(2.7 * FUEL_PRICE_PER_LITER, 2),
-                "fuel_efficiency_kmpl": round(52.1 / 2.7, 1),
-                "cost_per_km": round((2.7 * FUEL_PRICE_PER_LITER) / 52.1, 2)
-            },
-            "strategy_info": {
-                "strategy_metadata": {
-                    "strategy_focus": "Environmental impact minimization",
-                    "optimization_factors": ["local_roads", "fuel_efficiency", "emissions_reduction"],
-                    "route_characteristics": ["Lowest fuel consumption", "Eco-friendly driving", "No highway tolls"]
-                }
-            }
-        },
-        "balanced": {
-            "type": "balanced",
-            "color": "#000080",  # Dark Blue
-            "total_distance": {"value": 48700, "text": "48.7 km"},
-            "total_duration": {"value": 5520, "text": "1 hour 32 mins"},
-            "summary": f"Optimized balance from {origin_info} to {dest_info}",
-            "emissions": {
-                "co2_emissions_kg": 7.1,
-                "eco_score": 7.5,
-                "fuel_consumption_liters": 3.1
-            },
-            "fuel_analysis": {
-                "fuel_consumption_liters": 3.1,
-                "fuel_cost_inr": round(3.1 * FUEL_PRICE_PER_LITER, 2),
-                "fuel_efficiency_kmpl": round(48.7 / 3.1, 1),
-                "cost_per_km": round((3.1 * FUEL_PRICE_PER_LITER) / 48.7, 2)
-            },
-            "strategy_info": {
-                "strategy_metadata": {
-                    "strategy_focus": "Multi-criteria optimization",
-                    "optimization_factors": ["time_balance", "eco_balance", "cost_efficiency"],
-                    "route_characteristics": ["Moderate fuel consumption", "Balanced time-cost ratio", "Selected highways"]
+            "fuel_analysis": analysis,
+            "strategy_info": {"strategy_metadata": details["strategy_metadata"]}
+        }
+        
+        route_comparison[strategy] = {
+            "distance_km": meters / 1000,
+            "duration_minutes": seconds // 60,
+            "co2_emissions_kg": co2,
+            "eco_score": eco_score,
+            "fuel_cost_inr": costs[i],
+            "fuel_efficiency_kmpl": analysis["fuel_efficiency_kmpl"],
+            **{
+                key: NO_SAVINGS if j == i else {
+                    "cost": cost_deltas[i][j],
+                    "fuel_liters": fuel_deltas[i][j],
+                    "percentage": pct_deltas[i][j]
                 }
+                for j, key in enumerate(SAVINGS_KEYS)
             }
         }
-    }
-    
-    # Calculate fuel savings and cost differences relative to each route
-    fastest_cost = routes["fastest"]["fuel_analysis"]["fuel_cost_inr"]
-    eco_cost = routes["eco_friendly"]["fuel_analysis"]["fuel_cost_inr"] 
-    balanced_cost = routes["balanced"]["fuel_analysis"]["fuel_cost_inr"]
-    
-    # Route comparison summary with detailed fuel cost analysis
-    route_comparison = {
-        "fastest": {
-            "distance_km": 45.2,
-            "duration_minutes": 85,
-            "co2_emissions_kg": 8.4,
-            "eco_score": 6.2,
-            "fuel_cost_inr": fastest_cost,
-            "fuel_efficiency_kmpl": routes["fastest"]["fuel_analysis"]["fuel_efficiency_kmpl"],
-            "savings_vs_fastest": {"cost": 0, "fuel_liters": 0, "percentage": "0%"},
-            "savings_vs_eco": {
-                "cost": round(eco_cost - fastest_cost, 2),
-                "fuel_liters": round(routes["eco_friendly"]["fuel_analysis"]["fuel_consumption_liters"] - 3.6, 1),
-                "percentage": f"{round(((eco_cost - fastest_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
-            },
-            "savings_vs_balanced": {
-                "cost": round(balanced_cost - fastest_cost, 2),
-                "fuel_liters": round(routes["balanced"]["fuel_analysis"]["fuel_consumption_liters"] - 3.6, 1),
-                "percentage": f"{round(((balanced_cost - fastest_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
-            }
-        },
-        "eco_friendly": {
-            "distance_km": 52.1,
-            "duration_minutes": 105, 
-            "co2_emissions_kg": 6.2,
-            "eco_score": 8.7,
-            "fuel_cost_inr": eco_cost,
-            "fuel_efficiency_kmpl": routes["eco_friendly"]["fuel_analysis"]["fuel_efficiency_kmpl"],
-            "savings_vs_fastest": {
-                "cost": round(fastest_cost - eco_cost, 2),
-                "fuel_liters": round(3.6 - routes["eco_friendly"]["fuel_analysis"]["fuel_consumption_liters"], 1),
-                "percentage": f"{round(((fastest_cost - eco_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
-            },
-            "savings_vs_eco": {"cost": 0, "fuel_liters": 0, "percentage": "0%"},
-            "savings_vs_balanced": {
-                "cost": round(balanced_cost - eco_cost, 2),
-                "fuel_liters": round(routes["balanced"]["fuel_analysis"]["fuel_consumption_liters"] - 2.7, 1),
-                "percentage": f"{round(((balanced_cost - eco_cost) / eco_cost) * 100, 1)}%" if eco_cost > 0 else "0%"
-            }
-        },
-        "balanced": {
-            "distance_km": 48.7,
-            "duration_minutes": 92,
-            "co2_emissions_kg": 7.1,
-            "eco_score": 7.5,
-            "fuel_cost_inr": balanced_cost,
-            "fuel_efficiency_kmpl": routes["balanced"]["fuel_analysis"]["fuel_efficiency_kmpl"],
-            "savings_vs_fastest": {
-                "cost": round(fastest_cost - balanced_cost, 2),
-                "fuel_liters": round(3.6 - routes["balanced"]["fuel_analysis"]["fuel_consumption_liters"], 1),
-                "percentage": f"{round(((fastest_cost - balanced_cost) / fastest_cost) * 100, 1)}%" if fastest_cost > 0 else "0%"
-            },
-            "savings_vs_eco": {
-                "cost": round(eco_cost - balanced_cost, 2),
-                "fuel_liters": round(routes["eco_friendly"]["fuel_analysis"]["fuel_consumption_liters"] - 3.1, 1),
-                "percentage": f"{round(((eco_cost - balanced_cost) / eco_cost) * 100, 1)}%" if eco_cost > 0 else "0%"
-            },
-            "savings_vs_balanced": {"cost": 0, "fuel_liters": 0, "percentage": "0%"}
+        
+        routes_fuel_analysis[f"{strategy}_route"] = {
+            "color": color,
+            "fuel_liters": consumption,
+            "fuel_cost_inr": costs[i],
+            "efficiency_kmpl": analysis["fuel_efficiency_kmpl"],
+            "cost_per_km_inr": analysis["cost_per_km"]
         }
-    }
     
     # Generate fuel-focused optimization suggestions
-    fastest_vs_eco_savings = round(fastest_cost - eco_cost, 2)
-    fastest_vs_balanced_savings = round(fastest_cost - balanced_cost, 2)
+    fastest_vs_eco_savings = cost_deltas[ECO][FASTEST]
+    fastest_vs_balanced_savings = cost_deltas[BALANCED][FASTEST]
     
     suggestions = [
         {
@@ -285,10 +250,10 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
             "impact": "high",
             "savings_minutes": -20,  # 20 minutes extra
             "fuel_savings_inr": fastest_vs_eco_savings,
-            "fuel_savings_liters": round(3.6 - 2.7, 1),
-            "co2_savings_kg": round(8.4 - 6.2, 1),
+            "fuel_savings_liters": fuel_deltas[ECO][FASTEST],
+            "co2_savings_kg": co2_deltas[ECO][FASTEST],
             "route_color": "#006400",
-            "details": f"Save {round(3.6 - 2.7, 1)}L fuel • {round(((fastest_vs_eco_savings/fastest_cost)*100), 1)}% cost reduction"
+            "details": f"Save {fuel_deltas[ECO][FASTEST]}L fuel • {pct_deltas[ECO][FASTEST]} cost reduction"
         },
         {
             "title": "⚖️ Balanced Route for Optimal Cost-Time Trade-off", 
@@ -296,20 +261,20 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
             "impact": "medium",
             "savings_minutes": -7,   # 7 minutes extra
             "fuel_savings_inr": fastest_vs_balanced_savings,
-            "fuel_savings_liters": round(3.6 - 3.1, 1),
-            "co2_savings_kg": round(8.4 - 7.1, 1),
+            "fuel_savings_liters": fuel_deltas[BALANCED][FASTEST],
+            "co2_savings_kg": co2_deltas[BALANCED][FASTEST],
             "route_color": "#000080",
-            "details": f"Save {round(3.6 - 3.1, 1)}L fuel • Best time-cost balance"
+            "details": f"Save {fuel_deltas[BALANCED][FASTEST]}L fuel • Best time-cost balance"
         },
         {
             "title": "🚀 Fastest Route - Premium Speed Choice",
-            "message": f"Fastest route costs ₹{round(fastest_cost - eco_cost, 2)} extra but saves 20 minutes",
+            "message": f"Fastest route costs ₹{fastest_vs_eco_savings} extra but saves 20 minutes",
             "impact": "low",
             "savings_minutes": 20,   # 20 minutes saved
-            "fuel_cost_extra": round(fastest_cost - eco_cost, 2),
-            "fuel_extra_liters": round(3.6 - 2.7, 1),
+            "fuel_cost_extra": fastest_vs_eco_savings,
+            "fuel_extra_liters": fuel_deltas[ECO][FASTEST],
             "route_color": "#FF6B00", 
-            "details": f"Extra {round(3.6 - 2.7, 1)}L fuel • Premium for time-sensitive travel"
+            "details": f"Extra {fuel_deltas[ECO][FASTEST]}L fuel • Premium for time-sensitive travel"
         },
         {
             "title": "⏰ Optimal Departure Times for All Routes",
@@ -321,96 +286,118 @@ async def get_three_route_strategies(request: ThreeStrategiesRequest):
         }
     ]
     
-    processing_time = round((time.time() - processing_start) * 1000, 1)
-    
     # Comprehensive fuel cost summary
     fuel_cost_summary = {
-        "fuel_price_per_liter_inr": FUEL_PRICE_PER_LITER,
-        "routes_fuel_analysis": {
-            "fastest_route": {
-                "color": "#FF6B00",
-                "fuel_liters": 3.6,
-                "fuel_cost_inr": fastest_cost,
-                "efficiency_kmpl": routes["fastest"]["fuel_analysis"]["fuel_efficiency_kmpl"],
-                "cost_per_km_inr": routes["fastest"]["fuel_analysis"]["cost_per_km"]
-            },
-            "eco_friendly_route": {
-                "color": "#006400", 
-                "fuel_liters": 2.7,
-                "fuel_cost_inr": eco_cost,
-                "efficiency_kmpl": routes["eco_friendly"]["fuel_analysis"]["fuel_efficiency_kmpl"],
-                "cost_per_km_inr": routes["eco_friendly"]["fuel_analysis"]["cost_per_km"]
-            },
-            "balanced_route": {
-                "color": "#000080",
-                "fuel_liters": 3.1,
-                "fuel_cost_inr": balanced_cost,
-                "efficiency_kmpl": routes["balanced"]["fuel_analysis"]["fuel_efficiency_kmpl"],
-                "cost_per_km_inr": routes["balanced"]["fuel_analysis"]["cost_per_km"]
-            }
-        },
+        "fuel_price_per_liter_inr": _unit_price(VEHICLE_COSTS[vehicle_type]),
+        "routes_fuel_analysis": routes_fuel_analysis,
         "savings_comparison": {
             "eco_vs_fastest": {
-                "fuel_saved_liters": round(3.6 - 2.7, 1),
-                "cost_saved_inr": round(fastest_cost - eco_cost, 2),
-                "percentage_saved": f"{round(((fastest_cost - eco_cost) / fastest_cost) * 100, 1)}%"
+                "fuel_saved_liters": fuel_deltas[ECO][FASTEST],
+                "cost_saved_inr": fastest_vs_eco_savings,
+                "percentage_saved": pct_deltas[ECO][FASTEST]
             },
             "balanced_vs_fastest": {
-                "fuel_saved_liters": round(3.6 - 3.1, 1), 
-                "cost_saved_inr": round(fastest_cost - balanced_cost, 2),
-                "percentage_saved": f"{round(((fastest_cost - balanced_cost) / fastest_cost) * 100, 1)}%"
+                "fuel_saved_liters": fuel_deltas[BALANCED][FASTEST],
+                "cost_saved_inr": fastest_vs_balanced_savings,
+                "percentage_saved": pct_deltas[BALANCED][FASTEST]
             },
             "balanced_vs_eco": {
-                "fuel_extra_liters": round(3.1 - 2.7, 1),
-                "cost_extra_inr": round(balanced_cost - eco_cost, 2),
-                "percentage_extra": f"{round(((balanced_cost - eco_cost) / eco_cost) * 100, 1)}%"
+                "fuel_extra_liters": fuel_deltas[ECO][BALANCED],
+                "cost_extra_inr": cost_deltas[ECO][BALANCED],
+                "percentage_extra": pct_deltas[ECO][BALANCED]
             }
         },
         "recommendations": {
             "most_fuel_efficient": "eco_friendly",
             "best_value": "balanced", 
             "fastest_option": "fastest",
-            "monthly_savings_potential_inr": round((fastest_cost - eco_cost) * 20, 2)  # 20 trips per month
+            "monthly_savings_potential_inr": round(fastest_vs_eco_savings * 20, 2)  # 20 trips per month
         }
     }
     
     return {
-        "request_id": request_id,
-        "processing_time_ms": processing_time,
         "routes": routes,
         "route_comparison": route_comparison,
         "fuel_cost_summary": fuel_cost_summary,
-        "optimization_suggestions": suggestions,
-        "metadata": {
-            "origin": request.origin,
-            "destination": request.destination,
-            "travel_mode": request.travel_mode,
-            "timestamp": time.time(),
-            "fuel_price_source": "Current Indian market rates (₹110/L)"
-        }
+        "optimization_suggestions": suggestions
     }
 
+# Only the route summaries depend on the request, so each vehicle's body is
+# serialized once (without its enclosing braces) and only the {origin} and
+# {destination} placeholders in the summaries are filled in on each request
+RESPONSE_TEMPLATE_BODIES = {
+    vehicle_type: orjson.dumps(build_three_strategies_body(vehicle_type))[1:-1]
+    for vehicle_type in VEHICLE_COSTS
+}
+SUMMARY_PLACEHOLDER = re.compile(rb"\{(origin|destination)\}")
+
+def _json_string_contents(value: Any) -> bytes:
+    return orjson.dumps(str(value))[1:-1]
+
+# Commuters re-query the same origin/destination pairs, so filled-in bodies are
+# kept per (vehicle type, origin, destination); at ~5 KB each this stays a few MB
+@lru_cache(maxsize=1024)
+def three_strategies_body(vehicle_type: str, origin: bytes, destination: bytes) -> bytes:
+    """Template body with its summaries filled in; one pass, so placeholder text in an address stays literal"""
+    summary_values = {b"origin": origin, b"destination": destination}
+    return SUMMARY_PLACEHOLDER.sub(lambda match: summary_values[match.group(1)], RESPONSE_TEMPLATE_BODIES[vehicle_type])
+
+# Three-route strategies endpoint
+@app.post("/api/v1/routes/three-strategies")
+async def get_three_route_strategies(request: ThreeStrategiesRequest):
+    """Generate three different route strategies with optimization suggestions"""
+    
+    if SIMULATE_LATENCY:
+        await asyncio.sleep(0.2)  # 200ms simulated processing
+    
+    request_id = secrets.token_hex(4)
+    processing_start = time.perf_counter()
+    
+    # Extract origin/destination info for simulation
+    origin_info = request.origin.get('address', 'Unknown Origin')
+    dest_info = request.destination.get('address', 'Unknown Destination')
+    vehicle_type = request.vehicle_type if request.vehicle_type in VEHICLE_COSTS else "petrol"
+    
+    body = three_strategies_body(vehicle_type, _json_string_contents(origin_info), _json_string_contents(dest_info))
+    
+    processing_time = round((time.perf_counter() - processing_start) * 1000, 1)
+    
+    metadata = {
+        "origin": request.origin,
+        "destination": request.destination,
+        "travel_mode": request.travel_mode,
+        "timestamp": time.time(),
+        "fuel_price_source": FUEL_PRICE_SOURCES[vehicle_type]
+    }
+    return Response(
+        content=b'{"request_id":%s,"processing_time_ms":%s,%s,"metadata":%s}' % (
+            orjson.dumps(request_id), orjson.dumps(processing_time), body, orjson.dumps(metadata)
+        ),
+        media_type="application/json"
+    )
+
 # Simple route calculation endpoint
 @app.post("/api/v1/routes/calculate")
 async def calculate_route(request: RouteRequest):
     """Basic route calculation endpoint"""
     
-    await asyncio.sleep(0.1)  # Simulate processing
+    if SIMULATE_LATENCY:
+        await asyncio.sleep(0.1)  # Simulate processing
     
-    return {
-        "request_id": str(uuid.uuid4())[:8],
+    return json_response({
+        "request_id": secrets.token_hex(4),
         "route": {
             "distance": {"value": 42000, "text": "42.0 km"},
             "duration": {"value": 4800, "text": "1 hour 20 mins"},
             "summary": f"Route from {request.origin} to {request.destination}",
         },
         "status": "success"
-    }
+    })
 
 # Root endpoint
 @app.get("/")
 async def root():
-    return {
+    return json_response({
         "message": "Google Maps Test Backend API",
         "version": "1.0.0",
         "endpoints": {
@@ -420,7 +407,7 @@ async def root():
             "documentation": "/docs"
         },
         "status": "running"
-    }
+    })
 
 if __name__ == "__main__":
     import uvicorn
@@ -428,10 +415,17 @@ if __name__ == "__main__":
     print("📍 Server will be available at: http://127.0.0.1:8001")
     print("📚 API Documentation: http://127.0.0.1:8001/docs")
     
+    # --dev restores the auto-reloading single-process server
+    dev_mode = "--dev" in sys.argv
+    
     uvicorn.run(
         "simple_server:app",
         host="127.0.0.1",
         port=8001,
-        reload=True,
-        log_level="info"
+        loop="auto",  # uvloop when installed (not available on Windows)
+        http="auto",  # httptools when installed
+        workers=1 if dev_mode else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        reload=dev_mode,
+        access_log=dev_mode,  # no per-request log line outside development
+        log_level="info" if dev_mode else "warning"
     )
\ No newline at end of file
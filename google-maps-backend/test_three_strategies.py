@@ -7,6 +7,8 @@ Demonstrates the API usage and route comparison features
 import asyncio
 import aiohttp
 import json
+import os
+import sys
 from datetime import datetime
 from typing import Dict, Any
 
@@ -30,15 +32,63 @@ TEST_ROUTES = [
     }
 ]
 
+# Output markers: plain ASCII tags by default so piped CI logs stay greppable;
+# set RICH_OUTPUT=1 for the emoji versions in an interactive terminal
+RICH_OUTPUT = os.getenv('RICH_OUTPUT', 'false').lower() in ('1', 'true', 'yes')
+ICONS = {
+    "run": "🚀",
+    "ok": "✅",
+    "err": "❌",
+    "clock": "⏱️ ",  # trailing space pads the wide glyph
+    "table": "📊",
+    "fastest": "🚀",
+    "eco": "🌱",
+    "balanced": "⚖️",
+    "route": "📍",
+    "details": "📋",
+    "tip": "💡",
+    "high": "🔴",
+    "medium": "🟡",
+    "low": "🟢",
+    "impact": "🔵",
+    "times": "🕐",
+    "health": "🏥",
+    "version": "📄",
+    "api": "🌐",
+    "test": "🧪",
+    "done": "🎉",
+    "docs": "📚",
+    "stop": "⏹️ "  # trailing space pads the wide glyph
+} if RICH_OUTPUT else {
+    "run": "[RUN]",
+    "ok": "[OK]",
+    "err": "[ERR]",
+    "clock": "[t]",
+    "table": "[#]",
+    "fastest": "[FAST]",
+    "eco": "[ECO]",
+    "balanced": "[BAL]",
+    "route": "[*]",
+    "details": "[i]",
+    "tip": "[TIP]",
+    "high": "[HIGH]",
+    "medium": "[MED]",
+    "low": "[LOW]",
+    "impact": "[-]",
+    "times": "[@]",
+    "health": "[HEALTH]",
+    "version": "[v]",
+    "api": "[API]",
+    "test": "[TEST]",
+    "done": "[DONE]",
+    "docs": "[DOCS]",
+    "stop": "[STOP]"
+}
+
 
 async def test_three_route_strategies(session: aiohttp.ClientSession, route_config: Dict[str, Any]):
     """Test the three-route strategy API endpoint"""
     
-    print(f"\n🚀 Testing Route: {route_config['name']}")
-    print(f"   From: {route_config['origin']}")
-    print(f"   To: {route_config['destination']}")
-    print("-" * 60)
-    
     try:
         # Prepare API request
         payload = {
@@ -57,154 +107,171 @@ async def test_three_route_strategies(session: aiohttp.ClientSession, route_conf
             
             if response.status == 200:
                 data = await response.json()
+                print_route_header(route_config)
                 display_route_results(data)
             else:
                 error_text = await response.text()
-                print(f"❌ API Error ({response.status}): {error_text}")
+                print_route_header(route_config)
+                print(f"{ICONS['err']} API Error ({response.status}): {error_text}")
                 
     except Exception as e:
-        print(f"❌ Request failed: {str(e)}")
+        print_route_header(route_config)
+        print(f"{ICONS['err']} Request failed: {str(e)}")
+
+
+def print_route_header(route_config: Dict[str, Any]):
+    """Header for one route's results; printed once its response is in, so concurrent tests don't interleave"""
+    
+    print(f"\n{ICONS['run']} Testing Route: {route_config['name']}")
+    print(f"   From: {route_config['origin']}")
+    print(f"   To: {route_config['destination']}")
+    print("-" * 60)
 
 
 def display_route_results(data: Dict[str, Any]):
     """Display the three-route strategy results in a formatted manner"""
     
-    print(f"✅ Request ID: {data.get('request_id', 'N/A')}")
-    print(f"⏱️  Processing Time: {data.get('processing_time_ms', 0)}ms")
-    print()
+    # Collected and written in one go rather than one print() per line
+    lines = []
+    lines.append(f"{ICONS['ok']} Request ID: {data.get('request_id', 'N/A')}")
+    lines.append(f"{ICONS['clock']} Processing Time: {data.get('processing_time_ms', 0)}ms")
+    lines.append("")
     
     routes = data.get('routes', {})
     comparison = data.get('route_comparison', {})
     
     # Route Summary Table
-    print("📊 ROUTE COMPARISON SUMMARY")
-    print("=" * 80)
-    print(f"{'Strategy':<15} {'Distance':<12} {'Duration':<12} {'CO2 (kg)':<10} {'Eco Score':<10}")
-    print("-" * 80)
+    lines.append(f"{ICONS['table']} ROUTE COMPARISON SUMMARY")
+    lines.append("=" * 80)
+    lines.append(f"{'Strategy':<15} {'Distance':<12} {'Duration':<12} {'CO2 (kg)':<10} {'Eco Score':<10}")
+    lines.append("-" * 80)
     
     strategies = ['fastest', 'eco_friendly', 'balanced']
-    strategy_icons = {'fastest': '🚀', 'eco_friendly': '🌱', 'balanced': '⚖️'}
+    strategy_icons = {'fastest': ICONS['fastest'], 'eco_friendly': ICONS['eco'], 'balanced': ICONS['balanced']}
     
     for strategy in strategies:
         if strategy in comparison:
             comp = comparison[strategy]
-            icon = strategy_icons.get(strategy, '📍')
-            print(f"{icon} {strategy.replace('_', ' ').title():<12} "
-                  f"{comp['distance_km']} km{'':<6} "
-                  f"{comp['duration_minutes']:.0f} mins{'':<6} "
-                  f"{comp['co2_emissions_kg']:<10.1f} "
-                  f"{comp['eco_score']:<10.1f}")
+            icon = strategy_icons.get(strategy, ICONS['route'])
+            lines.append(f"{icon} {strategy.replace('_', ' ').title():<12} "
+                         f"{comp['distance_km']} km{'':<6} "
+                         f"{comp['duration_minutes']:.0f} mins{'':<6} "
+                         f"{comp['co2_emissions_kg']:<10.1f} "
+                         f"{comp['eco_score']:<10.1f}")
     
-    print("-" * 80)
+    lines.append("-" * 80)
     
     # Detailed Route Information
-    print("\n📋 DETAILED ROUTE INFORMATION")
-    print("=" * 50)
+    lines.append(f"\n{ICONS['details']} DETAILED ROUTE INFORMATION")
+    lines.append("=" * 50)
     
     for strategy in strategies:
         if strategy in routes:
             route = routes[strategy]
-            icon = strategy_icons.get(strategy, '📍')
+            icon = strategy_icons.get(strategy, ICONS['route'])
             
-            print(f"\n{icon} {strategy.replace('_', ' ').upper()} ROUTE")
-            print(f"   Distance: {route['total_distance']['text']}")
-            print(f"   Duration: {route['total_duration']['text']}")
-            print(f"   Summary: {route.get('summary', 'N/A')}")
+            lines.append(f"\n{icon} {strategy.replace('_', ' ').upper()} ROUTE")
+            lines.append(f"   Distance: {route['total_distance']['text']}")
+            lines.append(f"   Duration: {route['total_duration']['text']}")
+            lines.append(f"   Summary: {route.get('summary', 'N/A')}")
             
             if route.get('emissions'):
                 emissions = route['emissions']
-                print(f"   CO2 Emissions: {emissions['co2_emissions_kg']} kg")
-                print(f"   Eco Score: {emissions['eco_score']}/10")
+                lines.append(f"   CO2 Emissions: {emissions['co2_emissions_kg']} kg")
+                lines.append(f"   Eco Score: {emissions['eco_score']}/10")
                 
                 if emissions.get('fuel_consumption_liters'):
-                    print(f"   Fuel Consumption: {emissions['fuel_consumption_liters']:.1f} liters")
+                    lines.append(f"   Fuel Consumption: {emissions['fuel_consumption_liters']:.1f} liters")
             
             # Strategy-specific information
             if route.get('strategy_info'):
                 strategy_info = route['strategy_info']
-                print(f"   Strategy Focus: {strategy_info.get('strategy_metadata', {}).get('strategy_focus', 'N/A')}")
+                lines.append(f"   Strategy Focus: {strategy_info.get('strategy_metadata', {}).get('strategy_focus', 'N/A')}")
                 
                 optimization_factors = strategy_info.get('strategy_metadata', {}).get('optimization_factors', [])
                 if optimization_factors:
-                    print(f"   Optimization Factors: {', '.join(optimization_factors)}")
+                    lines.append(f"   Optimization Factors: {', '.join(optimization_factors)}")
     
     # Optimization Suggestions
     suggestions = data.get('optimization_suggestions', [])
     if suggestions:
-        print(f"\n💡 OPTIMIZATION SUGGESTIONS")
-        print("=" * 50)
+        lines.append(f"\n{ICONS['tip']} OPTIMIZATION SUGGESTIONS")
+        lines.append("=" * 50)
         
         for i, suggestion in enumerate(suggestions, 1):
-            impact_icon = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(suggestion.get('impact', 'low'), '🔵')
-            print(f"{i}. {impact_icon} {suggestion['message']}")
+            impact_icon = ICONS.get(suggestion.get('impact', 'low'), ICONS['impact'])
+            lines.append(f"{i}. {impact_icon} {suggestion['message']}")
             
             if suggestion.get('savings_minutes'):
-                print(f"   ⏱️  Time Savings: {suggestion['savings_minutes']} minutes")
+                lines.append(f"   {ICONS['clock']} Time Savings: {suggestion['savings_minutes']} minutes")
             
             if suggestion.get('co2_savings_kg'):
-                print(f"   🌱 CO2 Reduction: {suggestion['co2_savings_kg']:.1f} kg")
+                lines.append(f"   {ICONS['eco']} CO2 Reduction: {suggestion['co2_savings_kg']:.1f} kg")
             
             if suggestion.get('recommended_times'):
-                print(f"   🕐 Best Times: {', '.join(suggestion['recommended_times'])}")
+                lines.append(f"   {ICONS['times']} Best Times: {', '.join(suggestion['recommended_times'])}")
     
-    print("\n" + "=" * 80)
+    lines.append("\n" + "=" * 80)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 async def test_api_health(session: aiohttp.ClientSession):
     """Test API health and connectivity"""
     
-    print("🏥 Testing API Health...")
+    print(f"{ICONS['health']} Testing API Health...")
     
     try:
         async with session.get(f"{API_BASE_URL.replace('/api/v1', '')}/health") as response:
             if response.status == 200:
                 health_data = await response.json()
-                print(f"✅ API Status: {health_data.get('status', 'unknown')}")
-                print(f"📄 API Version: {health_data.get('version', 'N/A')}")
+                print(f"{ICONS['ok']} API Status: {health_data.get('status', 'unknown')}")
+                print(f"{ICONS['version']} API Version: {health_data.get('version', 'N/A')}")
                 return True
             else:
-                print(f"❌ Health Check Failed: {response.status}")
+                print(f"{ICONS['err']} Health Check Failed: {response.status}")
                 return False
                 
     except Exception as e:
-        print(f"❌ Cannot connect to API: {str(e)}")
-        print(f"💡 Make sure the server is running on {API_BASE_URL}")
+        print(f"{ICONS['err']} Cannot connect to API: {str(e)}")
+        print(f"{ICONS['tip']} Make sure the server is running on {API_BASE_URL}")
         return False
 
 
 async def main():
     """Main test function"""
     
-    print("🌐 Google Maps Three-Route Strategy Test")
+    print(f"{ICONS['api']} Google Maps Three-Route Strategy Test")
     print("=" * 60)
     
-    # Create HTTP session
+    # Create HTTP session; the route tests share its pooled keep-alive connections
     timeout = aiohttp.ClientTimeout(total=60)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
+    connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
         
         # Test API connectivity
         if not await test_api_health(session):
-            print("\n💡 Setup Instructions:")
+            print(f"\n{ICONS['tip']} Setup Instructions:")
             print("1. Navigate to google-maps-backend directory")
             print("2. Configure .env file with Google Maps API key")
             print("3. Run: uvicorn app.main:app --reload --port 8001")
             return
         
-        print("\n🧪 Running Route Strategy Tests...")
+        print(f"\n{ICONS['test']} Running Route Strategy Tests...")
         
-        # Test each route configuration
-        for route_config in TEST_ROUTES:
-            await test_three_route_strategies(session, route_config)
-            await asyncio.sleep(1)  # Rate limiting
+        # Test all route configurations concurrently
+        await asyncio.gather(
+            *(test_three_route_strategies(session, route_config) for route_config in TEST_ROUTES),
+            return_exceptions=True
+        )
         
-        print("\n🎉 All tests completed!")
-        print("\n📚 API Documentation available at: http://localhost:8001/docs")
+        print(f"\n{ICONS['done']} All tests completed!")
+        print(f"\n{ICONS['docs']} API Documentation available at: http://localhost:8001/docs")
 
 
 if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        print("\n\n⏹️  Tests interrupted by user")
+        print(f"\n\n{ICONS['stop']} Tests interrupted by user")
     except Exception as e:
-        print(f"\n❌ Test execution failed: {str(e)}")
\ No newline at end of file
+        print(f"\n{ICONS['err']} Test execution failed: {str(e)}")
\ No newline at end of file